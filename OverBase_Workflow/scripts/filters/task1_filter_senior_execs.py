@@ -4,6 +4,8 @@ from pathlib import Path
 import pandas as pd
 import re
 
+from pipeline.artifacts import save_artifact
+
 # Get project root directory and ensure outputs dir exists
 script_dir = Path(__file__).parent
 scripts_dir = script_dir.parent
@@ -89,8 +91,7 @@ def task1_filter_senior_execs(df):
     
     OUTPUT_CSV = OUTPUT_DIR / "senior_execs_only.csv"
     STEP_CSV = OUTPUT_DIR / "step1_senior.csv"
-    df_senior.to_csv(str(OUTPUT_CSV), index=False)
-    df_senior.to_csv(str(STEP_CSV), index=False)
+    OUTPUT_CSV = save_artifact(df_senior, OUTPUT_CSV, aliases=[STEP_CSV])
     log(f"Filtered senior execs: {len(df_senior)} -> saved {OUTPUT_CSV} and {STEP_CSV}")
     
     print("✔ Task 1 completed")
@@ -4,6 +4,8 @@ from pathlib import Path
 import pandas as pd
 import re
 
+from pipeline.artifacts import save_artifact
+
 # Get project root directory and ensure outputs dir exists
 script_dir = Path(__file__).parent
 scripts_dir = script_dir.parent
@@ -80,8 +82,7 @@ def task2_remove_duplicates(df):
     
     OUTPUT_CSV = OUTPUT_DIR / "senior_execs_no_duplicates.csv"
     STEP_CSV = OUTPUT_DIR / "step2_dedup.csv"
-    df_unique.to_csv(str(OUTPUT_CSV), index=False)
-    df_unique.to_csv(str(STEP_CSV), index=False)
+    OUTPUT_CSV = save_artifact(df_unique, OUTPUT_CSV, aliases=[STEP_CSV])
     
     print("✔ Task 2 completed")
     removed = len(df) - len(df_unique)
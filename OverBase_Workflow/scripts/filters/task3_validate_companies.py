@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
+import os
+import threading
 import pandas as pd
 import re
-import requests
 import time
 
+from pipeline.dns_cache import DNS
+from pipeline.domain_cache import DomainCache
+from pipeline.domain_map import DomainMap
+from pipeline.journal import RowJournal
+from pipeline.net import BREAKER, HostPacer, NetStats, check_url, host_of, pooled_session
+from pipeline.artifacts import save_artifact
+
 # Get project root directory and ensure outputs dir exists
 script_dir = Path(__file__).parent
 scripts_dir = script_dir.parent
@@ -22,300 +31,255 @@ def log(message: str):
     with open(LOG_FILE, "a") as f:
         f.write(f"[task3_validate_companies] {message}\n")
 
-def task3_validate_companies(df):
-    """Task 3: Validate companies and find websites"""
-    print("\n" + "=" * 70)
-    print("▶ Task 3: Validate Companies")
-    print("=" * 70)
-    
-    REQUEST_TIMEOUT = 10
-    REQUEST_DELAY = 1
-    USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    
-    COMPANY_DOMAIN_MAP = {
-        # Merged: existing entries plus user-provided authoritative mappings
-        'inseego': 'inseego.com',
-        'infineon': 'infineon.com',
-        'aws': 'aws.amazon.com',
-        'world surf league': 'worldsurfleague.com',
-        'allcloud': 'allcloud.io',
-        'honeycomb.io': 'honeycomb.io',
-        'spacelift': 'spacelift.io',
-        'fabrix.ai': 'fabrix.ai',
-        'vultr': 'vultr.com',
-        'ge aerospace': 'geaerospace.com',
-        'auditboard': 'auditboard.com',
-        'uipath': 'uipath.com',
-        'salt security': 'salt.security',
-        'ebay': 'ebay.com',
-        'crowdstrike': 'crowdstrike.com',
-        'tensor': 'tensorsecurity.com',
-        'ddn': 'ddn.com',
-        'redline advisors': 'redlineadvisors.com',
-        'dynatrace': 'dynatrace.com',
-        'ledger': 'ledger.com',
-        'google cloud': 'cloud.google.com',
-        'heroku': 'heroku.com',
-        'triptych info': 'triptychinfo.com',
-        'spectra logic': 'spectralogic.com',
-        'infinidat': 'infinidat.com',
-        'index engines': 'indexengines.com',
-        'thecube research': 'thecuberesearch.com',
-        'kiteworks': 'kiteworks.com',
-        'equinix': 'equinix.com',
-        'couchbase': 'couchbase.com',
-        'broadforward': 'broadforward.com',
-        'cato networks': 'catonetworks.com',
-        'stackpane': 'stackpane.com',
-        'neo4j': 'neo4j.com',
-        'arrcus': 'arrcus.com',
-        'adobe enterprise': 'adobe.com',
-        'amd': 'amd.com',
-        'denexus': 'denexus.io',
-        'applied intuition': 'appliedintuition.com',
-        'scaleflux': 'scaleflux.com',
-        'nutanix': 'nutanix.com',
-        'cerebras': 'cerebras.net',
-        'transcarent': 'transcarent.com',
-        'airmdr': 'airmdr.com',
-        'at-bay': 'at-bay.com',
-        'typeface': 'typeface.ai',
-        'arm': 'arm.com',
-        'early growth advisory': 'earlygrowthadvisory.com',
-        'together ai': 'together.ai',
-        'groq': 'groq.com',
-        'ingram micro cloud': 'ingrammicrocloud.com',
-        'deloitte': 'deloitte.com',
-        'logicmonitor': 'logicmonitor.com',
-        'escala 24x7': 'escala24x7.com',
-        'commercetools': 'commercetools.com',
-        'prophix': 'prophix.com',
-        'netapp': 'netapp.com',
-        'san francisco 49ers': '49ers.com',
-        'boomi': 'boomi.com',
-        'sas institute': 'sas.com',
-        'ericsson': 'ericsson.com',
-        'teradata': 'teradata.com',
-        'newtonx': 'newtonx.com',
-        'aruba': 'arubanetworks.com',
-        'cobalt iron': 'cobaltiron.com',
-        'ibm': 'ibm.com',
-        'cloudian': 'cloudian.com',
-        'forrester research': 'forrester.com',
-        'nvidia': 'nvidia.com',
-        'idc': 'idc.com',
-        'snowflake': 'snowflake.com',
-        'qlik': 'qlik.com',
-        'chronosphere': 'chronosphere.io',
-        'juniper networks': 'juniper.net',
-        'dartmouth college': 'dartmouth.edu',
-        'intel': 'intel.com',
-        'hpe': 'hpe.com',
-        'impetus technologies': 'impetus.com',
-        'zillow': 'zillow.com',
-        'informatica': 'informatica.com',
-        'cribl': 'cribl.io',
-        'mongodb': 'mongodb.com',
-        'mitel': 'mitel.com',
-        'sdvi corporation': 'sdvi.com',
-        'lacework': 'lacework.com',
-        'messagebird': 'messagebird.com',
-        'datastax': 'datastax.com',
-        'releasehub': 'releasehub.com',
-        'sisense': 'sisense.com',
-        'influxdata': 'influxdata.com',
-        'commvault': 'commvault.com',
-        'syncreon': 'syncreon.com',
-        'veeam': 'veeam.com',
-        'explorium': 'explorium.ai',
-        'mitchell international': 'mitchell.com',
-        'kyndryl': 'kyndryl.com',
-        'fortinet': 'fortinet.com',
-        'agero': 'agero.com',
-        'acoustic': 'acoustic.com',
-        'citrix': 'citrix.com',
-        'actifio': 'actifio.com',
-        'cockroach labs': 'cockroachlabs.com',
-        'automation anywhere': 'automationanywhere.com',
-        'kenna security': 'kennasecurity.com',
-        'cohesity': 'cohesity.com',
-        'coupa': 'coupa.com',
-        'uniphore': 'uniphore.com',
-        'vlocity': 'vlocity.com',
-        'splunk': 'splunk.com',
-        'acronis': 'acronis.com',
-        'smartsheet': 'smartsheet.com',
-        'tintri by ddn': 'tintri.com',
-        'veritas': 'veritas.com',
-        'us signal': 'ussignal.com',
-        'sequoia capital': 'sequoiacap.com',
-        'tempered networks': 'temperednetworks.com',
-        'five9': 'five9.com',
-        'keysight': 'keysight.com',
-        'tripactions': 'tripactions.com',
-        'sciencelogic': 'sciencelogic.com',
-        'sap': 'sap.com',
-        'alteryx': 'alteryx.com',
-        'zerto': 'zerto.com',
-        'mirantis': 'mirantis.com',
-        'wandisco': 'wandisco.com',
-        'tableau': 'tableau.com',
-        'rackspace': 'rackspace.com',
-        'ge': 'ge.com',
-        'servicenow': 'servicenow.com',
-        'service now': 'servicenow.com',
-        'emc': 'delltechnologies.com',
-        'csc': 'dxctechnology.com',
-        'hcl': 'hcltech.com',
-        'ifs': 'ifs.com',
-        'techdivision': 'techdivision.com',
-        'gabor shoes': 'gabor.com',
-        'new relic': 'newrelic.com',
-        'openlink': 'openlinksw.com',
-        'softwareone': 'softwareone.com',
-        'cyxtera': 'cyxtera.com',
-        'druva': 'druva.com',
-        'robin.io': 'robin.io',
-        'panviva': 'panviva.com',
-        'mesosphere': 'd2iq.com',
-        'qad': 'qad.com',
-        'turbonomic': 'turbonomic.com',
-        'igel': 'igel.com',
-        'locus robotics': 'locusrobotics.com',
-        'marketo': 'marketo.com',
-        'zuora': 'zuora.com',
-        'attunity': 'attunity.com',
-        'verizon': 'verizon.com',
-        'qubole': 'qubole.com',
-        'sonatype': 'sonatype.com',
-        'oracle': 'oracle.com',
-        'time warner': 'warnermedia.com',
-        'octane ai': 'octaneai.com',
-        'redis labs': 'redis.com',
-        'avanade': 'avanade.com',
-        'ixia': 'ixiacom.com',
-        'continuum analytics': 'continuum.io',
-        'igneous systems': 'igneous.io',
-        'riverbed': 'riverbed.com',
-        'noobaa': 'noobaa.io',
-        'predix': 'predix.io',
-        'talend': 'talend.com',
-        'basho': 'basho.com',
-        'the clorox company': 'thecloroxcompany.com',
-        'cafex': 'cafex.com',
-        'local motors': 'localmotors.com',
-        'pentaho': 'pentaho.com',
-        'atscale': 'atscale.com',
-        'tegile': 'tegile.com',
-        # Existing entries kept for completeness
-        'vmware': 'vmware.com',
-        'salesforce': 'salesforce.com',
-        'microsoft': 'microsoft.com',
-        'adobe': 'adobe.com',
-        'palo alto networks': 'paloaltonetworks.com',
-        'dell technologies': 'dell.com',
-        'dell': 'dell.com',
-        'twilio': 'twilio.com',
-        'zscaler': 'zscaler.com',
-        'mcafee': 'mcafee.com',
-    }
-    
-    def clean_company_name(company):
-        """Clean and normalize company name"""
-        if pd.isna(company) or company == "":
-            return ""
-        company = str(company).strip()
-        parts = [p.strip() for p in re.split(r'[—\-–]', company) if p and p.strip()]
-        if parts:
-            company = parts[-1]
-        else:
-            company = company
-        company = re.sub(r'\([^)]*\)', '', company).strip()
-        company = ' '.join(company.split())
-        return company
-    
-    def find_company_domain(company_name):
-        """Try to find company domain through known mappings"""
-        company_lower = company_name.lower()
-        for key, domain in COMPANY_DOMAIN_MAP.items():
-            if key in company_lower:
-                return domain
-        return None
-    
-    def search_company_website(company_name):
-        """Search for company website"""
-        domain = find_company_domain(company_name)
-        if domain:
-            return f"https://{domain}"
-        return None
-    
-    def validate_company_website(url):
-        """Validate that a company website exists and is accessible"""
-        try:
-            response = requests.get(
-                url,
-                timeout=REQUEST_TIMEOUT,
-                headers={'User-Agent': USER_AGENT},
-                allow_redirects=True
-            )
-            if response.status_code == 200:
-                return True, response.url
-            return False, None
-        except Exception:
-            return False, None
-    
-    def validate_executive(row):
-        """Validate executive and get company website"""
-        company = clean_company_name(row['Company'])
-        
-        if not company or company.lower() in ['', '(company not stated)', '–']:
+
+REQUEST_TIMEOUT = 10
+REQUEST_DELAY = 1          # minimum seconds between requests to the same host
+WORKERS = int(os.getenv("OVERBASE_TASK3_WORKERS", "8"))
+PACER = HostPacer(REQUEST_DELAY)
+VALIDATION_CACHE = DomainCache()   # outputs/cache/domains.sqlite, shared across runs
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+# Keep-alive connections shared by the worker and probe threads
+SESSION = pooled_session(WORKERS * 4, USER_AGENT)
+
+# Candidate probing: 'sequential' tries the mapped domain, then the learned
+# website, then www.<slug>.com, one after another. 'hedged' probes a ranked
+# candidate set concurrently (see probe_company) so a company costs about one
+# timeout at worst instead of one per candidate
+DOMAIN_PROBE = os.getenv("OVERBASE_DOMAIN_PROBE", "sequential").lower()
+if DOMAIN_PROBE not in ("sequential", "hedged"):
+    raise ValueError(f"OVERBASE_DOMAIN_PROBE must be 'sequential' or 'hedged', got '{DOMAIN_PROBE}'")
+HEDGE_DELAY = float(os.getenv("OVERBASE_PROBE_HEDGE_SECONDS", "1"))
+SLUG_TLDS = ('com', 'io', 'ai', 'net')
+_probe_pool = None
+_probe_pool_lock = threading.Lock()
+
+# Company → domain dataset (data/company_domains.json), indexed on whole words
+# and reloaded when the file changes; slug discoveries go to
+# outputs/cache/learned_domains.json
+DOMAIN_MAP = DomainMap()
+
+
+def clean_company_name(company):
+    """Clean and normalize company name"""
+    if pd.isna(company) or company == "":
+        return ""
+    company = str(company).strip()
+    parts = [p.strip() for p in re.split(r'[—\-–]', company) if p and p.strip()]
+    if parts:
+        company = parts[-1]
+    else:
+        company = company
+    company = re.sub(r'\([^)]*\)', '', company).strip()
+    company = ' '.join(company.split())
+    return company
+
+
+def find_company_domain(company_name):
+    """Try to find company domain through known mappings (longest whole-word key)"""
+    return DOMAIN_MAP.find(company_name)
+
+
+def search_company_website(company_name):
+    """Search for company website"""
+    domain = find_company_domain(company_name)
+    if domain:
+        return f"https://{domain}"
+    return None
+
+
+def validate_company_website(url, stats=None):
+    """Validate that a company website exists and is accessible"""
+    cached = VALIDATION_CACHE.get(url)
+    if cached is not None:
+        if stats is not None:
+            stats.cache_hit()
+        return cached
+
+    # Hosts that do not exist fail without an HTTP attempt. Not cached across
+    # runs: an offline or broken resolver reports every host as missing
+    if not DNS.resolves(url):
+        if stats is not None:
+            stats.skip("dns")
+        return (False, None)
+
+    # Hosts that keep failing to connect fail fast; not cached, the host may come back
+    if not BREAKER.allow(url, stats):
+        return (False, None)
+
+    # Liveness only: HEAD, or a streamed GET closed after the headers
+    waited = PACER.wait(url)
+    started = time.perf_counter()
+    status, final_url, transferred = check_url(SESSION, url, REQUEST_TIMEOUT, breaker=BREAKER)
+    result = (True, final_url) if status == 200 else (False, None)
+    if stats is not None:
+        stats.request(time.perf_counter() - started, waited, transferred)
+    # Only definitive answers are kept across runs: a timeout, connection
+    # error or server error may be gone on the next run
+    if _definitive(status):
+        VALIDATION_CACHE.put(url, result[0], result[1], status)
+    return result
+
+
+def _definitive(status) -> bool:
+    """True for HTTP statuses worth caching: 200 and client errors other than 408/429."""
+    return status == 200 or (status is not None and 400 <= status < 500 and status not in (408, 429))
+
+
+def validate_executive(row, stats=None):
+    """Validate executive and get company website"""
+    return resolve_company(clean_company_name(row['Company']), stats)
+
+
+def resolve_company(company, stats=None):
+    """Find and validate the website of one cleaned company name"""
+    if not company or company.lower() in ['', '(company not stated)', '–']:
+        return {
+            'Company': company,
+            'Company Website': '',
+            'Source': 'No company information available',
+            'Domain Notes': 'no_company_info',
+            'Confidence': 'low'
+        }
+
+    if DOMAIN_PROBE == "hedged":
+        return probe_company(company, stats)
+
+    website = search_company_website(company)
+
+    if website:
+        is_valid, final_url = validate_company_website(website, stats)
+        if is_valid:
             return {
                 'Company': company,
-                'Company Website': '',
-                'Source': 'No company information available',
-                'Domain Notes': 'no_company_info',
-                'Confidence': 'low'
+                'Company Website': final_url,
+                'Source': final_url,
+                'Domain Notes': 'mapped_known_domain',
+                'Confidence': 'high'
             }
-        
-        website = search_company_website(company)
-        
-        if website:
-            is_valid, final_url = validate_company_website(website)
-            if is_valid:
-                return {
-                    'Company': company,
-                    'Company Website': final_url,
-                    'Source': final_url,
-                    'Domain Notes': 'mapped_known_domain',
-                    'Confidence': 'high'
-                }
-        
-        domain = find_company_domain(company)
-        if domain:
-            website = f"https://{domain}"
-            is_valid, final_url = validate_company_website(website)
-            if is_valid:
-                return {
-                    'Company': company,
-                    'Company Website': final_url,
-                    'Source': final_url,
-                    'Domain Notes': 'verified_from_mapping',
-                    'Confidence': 'high'
-                }
-        
-        company_clean = re.sub(r'[^a-z0-9]', '', company.lower())
-        if company_clean:
-            likely_domain = f"https://www.{company_clean}.com"
-            is_valid, final_url = validate_company_website(likely_domain)
-            if is_valid:
-                return {
-                    'Company': company,
-                    'Company Website': final_url,
-                    'Source': final_url,
-                    'Domain Notes': 'verified_from_slug',
-                    'Confidence': 'medium'
-                }
-        
+
+    # A website an earlier run found through the slug fallback
+    learned_url, learned_source, trusted = DOMAIN_MAP.learned_url(company)
+    if learned_url:
+        if trusted:
+            if stats is not None:
+                stats.cache_hit()
+            return _slug_result(company, learned_url)
+        is_valid, final_url = validate_company_website(learned_url, stats)
+        if is_valid:
+            DOMAIN_MAP.learn(company, final_url, learned_source)
+            return _slug_result(company, final_url)
+        DOMAIN_MAP.forget(company)
+
+    company_clean = re.sub(r'[^a-z0-9]', '', company.lower())
+    if company_clean:
+        likely_domain = f"https://www.{company_clean}.com"
+        is_valid, final_url = validate_company_website(likely_domain, stats)
+        if is_valid:
+            redirected = host_of(final_url) != host_of(likely_domain)
+            DOMAIN_MAP.learn(company, final_url, "redirect" if redirected else "slug")
+            return _slug_result(company, final_url)
+
+    return {
+        'Company': company,
+        'Company Website': '',
+        'Source': 'Company website not found - manual research required',
+        'Domain Notes': 'not_found',
+        'Confidence': 'low'
+    }
+
+
+def probe_candidates(company):
+    """Ranked candidates for a company: [(url, kind), ...], best first.
+
+    kind is 'mapped' (the known domain), 'mapped_alt' (its www/bare twin),
+    'learned' (a website an earlier run found) or 'slug' (www/bare
+    <slug>.com/.io/.ai/.net).
+    """
+    candidates = []
+    domain = find_company_domain(company)
+    if domain:
+        candidates.append((f"https://{domain}", 'mapped'))
+        twin = domain[4:] if domain.startswith('www.') else f"www.{domain}"
+        candidates.append((f"https://{twin}", 'mapped_alt'))
+    learned_url, _, _ = DOMAIN_MAP.learned_url(company)
+    if learned_url:
+        candidates.append((learned_url, 'learned'))
+    slug = re.sub(r'[^a-z0-9]', '', company.lower())
+    if slug:
+        for tld in SLUG_TLDS:
+            candidates.append((f"https://www.{slug}.{tld}", 'slug'))
+            candidates.append((f"https://{slug}.{tld}", 'slug'))
+    seen = set()
+    return [(url, kind) for url, kind in candidates if not (url in seen or seen.add(url))]
+
+
+def planned_urls(company) -> list:
+    """Every URL resolve_company may validate for a company, in the configured probe mode."""
+    if DOMAIN_PROBE == "hedged":
+        return [url for url, _ in probe_candidates(company)]
+    urls = []
+    domain = find_company_domain(company)
+    if domain:
+        urls.append(f"https://{domain}")
+    learned_url, _, _ = DOMAIN_MAP.learned_url(company)
+    if learned_url:
+        urls.append(learned_url)
+    company_clean = re.sub(r'[^a-z0-9]', '', company.lower())
+    if company_clean:
+        urls.append(f"https://www.{company_clean}.com")
+    return urls
+
+
+def _pool():
+    global _probe_pool
+    with _probe_pool_lock:
+        if _probe_pool is None:
+            _probe_pool = ThreadPoolExecutor(max_workers=WORKERS * len(SLUG_TLDS) * 2,
+                                             thread_name_prefix="task3-probe")
+        return _probe_pool
+
+
+def _probe(url, kind, company, stats):
+    if kind == 'learned':
+        _, _, trusted = DOMAIN_MAP.learned_url(company)
+        if trusted:
+            if stats is not None:
+                stats.cache_hit()
+            return True, url
+    return validate_company_website(url, stats)
+
+
+def probe_company(company, stats=None):
+    """Hedged form of resolve_company's website search.
+
+    The best-ranked candidate is probed first. If it has not succeeded within
+    HEDGE_DELAY seconds, the rest of the ranked set is probed concurrently.
+    The best-ranked success wins: lower-ranked answers are only used once
+    every candidate above them has failed. Probes not yet started are then
+    cancelled; requests already in flight are abandoned (their answers still
+    land in the validation cache).
+    """
+    candidates = probe_candidates(company)
+    pool = _pool()
+    futures = [pool.submit(_probe, candidates[0][0], candidates[0][1], company, stats)] if candidates else []
+    if len(candidates) > 1:
+        done, _ = wait(futures, timeout=HEDGE_DELAY)
+        if not (done and futures[0].result()[0]):
+            futures += [pool.submit(_probe, url, kind, company, stats) for url, kind in candidates[1:]]
+
+    winner = None
+    for (url, kind), future in zip(candidates, futures):
+        is_valid, final_url = future.result()
+        if is_valid:
+            winner = url, kind, final_url
+            break
+    for future in futures:
+        future.cancel()
+
+    if winner is None:
+        learned = [f for (_, kind), f in zip(candidates, futures) if kind == 'learned']
+        if learned and learned[0].done() and not learned[0].cancelled():
+            DOMAIN_MAP.forget(company)
         return {
             'Company': company,
             'Company Website': '',
@@ -323,34 +287,170 @@ def task3_validate_companies(df):
             'Domain Notes': 'not_found',
             'Confidence': 'low'
         }
-    
-    print(f"Loaded {len(df)} executives for validation")
-    
-    results = []
-    for idx, row in df.iterrows():
-        print(f"Validating {idx+1}/{len(df)}: {row['Name']} @ {row['Company']}")
-        
-        validation_result = validate_executive(row)
-        
-        row['Company'] = validation_result['Company']
-        row['Company Website'] = validation_result['Company Website']
-        row['Source'] = validation_result['Source']
-        row['Domain Notes'] = validation_result.get('Domain Notes', '')
-        row['Confidence'] = validation_result.get('Confidence', '')
-        
-        results.append(row)
-        time.sleep(REQUEST_DELAY)
-    
-    df_validated = pd.DataFrame(results)
-    
-    # Persist artifacts
+
+    url, kind, final_url = winner
+    if kind in ('mapped', 'mapped_alt'):
+        return {
+            'Company': company,
+            'Company Website': final_url,
+            'Source': final_url,
+            'Domain Notes': 'mapped_known_domain' if kind == 'mapped' else 'verified_from_mapping',
+            'Confidence': 'high'
+        }
+    if kind == 'learned':
+        _, learned_source, trusted = DOMAIN_MAP.learned_url(company)
+        if not trusted:
+            DOMAIN_MAP.learn(company, final_url, learned_source)
+    else:
+        DOMAIN_MAP.learn(company, final_url, "redirect" if host_of(final_url) != host_of(url) else "slug")
+    return _slug_result(company, final_url)
+
+
+def _slug_result(company, final_url):
+    return {
+        'Company': company,
+        'Company Website': final_url,
+        'Source': final_url,
+        'Domain Notes': 'verified_from_slug',
+        'Confidence': 'medium'
+    }
+
+
+VALIDATION_COLUMNS = ['Company Website', 'Source', 'Domain Notes', 'Confidence']
+
+
+class CompanyResolver:
+    """Resolves each distinct company once per run.
+
+    Callers asking for a company that is already being resolved wait for that
+    result instead of repeating the lookups and HTTP validation.
+    """
+
+    def __init__(self, journal=None, stats=None):
+        self.journal = journal
+        self.stats = stats
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, company):
+        with self._lock:
+            future = self._futures.get(company)
+            owner = future is None
+            if owner:
+                future = self._futures[company] = Future()
+        if owner:
+            try:
+                future.set_result(self._resolve(company))
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+        return future.result()
+
+    def _resolve(self, company):
+        print(f"Resolving {company or '(no company)'}")
+        started = time.perf_counter()
+        key = {'Company': company}
+        result = self.journal.lookup(key) if self.journal is not None else None
+        if result is None:
+            result = resolve_company(company, self.stats)
+            if self.journal is not None:
+                self.journal.record(key, result)
+        if self.stats is not None:
+            self.stats.row(time.perf_counter() - started)
+        return result
+
+
+def task3_validate_row(row, resolver, total=None):
+    """Validate one executive row in place and return it (used per row when streaming)"""
+    print(f"Validating {row.name+1}/{total}: {row['Name']} @ {row['Company']}")
+
+    company = clean_company_name(row['Company'])
+    validation_result = resolver.resolve(company)
+
+    row['Company'] = company
+    for col in VALIDATION_COLUMNS:
+        row[col] = validation_result[col]
+    return row
+
+
+def task3_save_validated(df_validated):
+    """Persist the Task 3 artifacts"""
     STEP_CSV = OUTPUT_DIR / "step3_domains.csv"
     OUTPUT_CSV = OUTPUT_DIR / "senior_execs_validated.csv"
-    df_validated.to_csv(str(STEP_CSV), index=False)
-    df_validated.to_csv(str(OUTPUT_CSV), index=False)
+    OUTPUT_CSV = save_artifact(df_validated, OUTPUT_CSV, aliases=[STEP_CSV])
     log(f"Validated companies for {len(df_validated)} rows -> saved {STEP_CSV} and {OUTPUT_CSV}")
-    
+
     print("✔ Task 3 completed")
     print(f"Validated {len(df_validated)} executives with company websites")
     print(f"Saved to: {OUTPUT_CSV}")
     return df_validated
+
+
+def _save_domain_map():
+    learned = DOMAIN_MAP.save()
+    if learned:
+        print(f"ⓘ Domain map: saved {learned} learned website(s) to {DOMAIN_MAP.learned_path.name} "
+              f"(version {DOMAIN_MAP.version})")
+
+
+def _journal() -> RowJournal:
+    # Sequential and hedged probing can pick different websites
+    return RowJournal("task3", sources=[__file__], env=("OVERBASE_DOMAIN_PROBE",))
+
+
+def _task3_banner():
+    print("\n" + "=" * 70)
+    print("▶ Task 3: Validate Companies")
+    print("=" * 70)
+
+
+def task3_validate_companies(df):
+    """Task 3: Validate companies and find websites"""
+    _task3_banner()
+    print(f"Loaded {len(df)} executives for validation")
+
+    # Clean each distinct raw name once, resolve each distinct company once
+    # and broadcast the results back onto the rows
+    raw = df['Company'].astype(object).fillna('')
+    unique_raw = raw.drop_duplicates()
+    cleaned = raw.map(dict(zip(unique_raw, unique_raw.map(clean_company_name))))
+    companies = list(dict.fromkeys(cleaned))
+    print(f"Resolving {len(companies)} distinct companies")
+
+    # Resolve every candidate host up front so dead domains cost no HTTP request
+    DNS.prefetch([url for company in companies if company for url in planned_urls(company)
+                  if VALIDATION_CACHE.get(url) is None], "task3")
+
+    # Companies are resolved on a bounded thread pool; requests to the same
+    # host are still spaced by REQUEST_DELAY. Per-company journal: an
+    # interrupted run resumes after the last finished company
+    stats = NetStats("task3", unit="companies")
+    with _journal() as journal, ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        resolver = CompanyResolver(journal, stats)
+        table = pd.DataFrame(list(pool.map(resolver.resolve, companies)), index=companies)
+        stats.report()
+        _save_domain_map()
+
+        df_validated = df.copy(deep=False)
+        df_validated['Company'] = cleaned
+        for col in VALIDATION_COLUMNS:
+            df_validated[col] = cleaned.map(table[col])
+        return task3_save_validated(df_validated)
+
+
+def task3_row_stream(total):
+    """Per-row form of Task 3 for streaming runs: (row_fn, finish)"""
+    _task3_banner()
+    print(f"Streaming {total} executives for validation")
+    journal = _journal()
+    stats = NetStats("task3", unit="companies")
+    resolver = CompanyResolver(journal, stats)
+
+    def finish(df_validated):
+        stats.report()
+        _save_domain_map()
+        task3_save_validated(df_validated)
+        journal.complete()
+        return df_validated
+
+    return (lambda row: task3_validate_row(row, resolver, total)), finish
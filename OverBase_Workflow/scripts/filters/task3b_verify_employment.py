@@ -5,6 +5,9 @@ import pandas as pd
 import urllib.parse
 from datetime import datetime
 
+from pipeline.schema import enable_copy_on_write
+from pipeline.artifacts import save_artifact
+
 # Project paths
 script_dir = Path(__file__).parent
 scripts_dir = script_dir.parent
@@ -17,6 +20,8 @@ for p in [OUTPUT_DIR, LOGS_DIR, MANUAL_DIR]:
 
 LOG_FILE = LOGS_DIR / "workflow.log"
 
+enable_copy_on_write()
+
 
 def log(message: str):
     with open(LOG_FILE, "a") as f:
@@ -30,6 +35,61 @@ def linkedin_search_url(name: str, company: str) -> str:
     return f"https://www.linkedin.com/search/results/all/?keywords={q}"
 
 
+def _norm_key(s):
+    return '' if pd.isna(s) else str(s).strip().lower()
+
+
+def load_overrides():
+    """Manual overrides indexed by normalized 'name|company', or None if absent."""
+    overrides_path = MANUAL_DIR / 'verification_overrides.csv'
+    if not overrides_path.exists():
+        return None
+    ov = pd.read_csv(overrides_path)
+    ov['_k'] = ov['Name'].map(_norm_key) + '|' + ov['Company'].map(_norm_key)
+    return ov.set_index('_k')
+
+
+def _override_for(ov, k):
+    """Verification Source ('' if blank) when the override marks k verified, else None."""
+    if k not in ov.index:
+        return None
+    ver = ov.loc[k]
+    emp_verified = str(ver.get('Employment Verified', '')).strip().lower()
+    if emp_verified not in ['yes', 'true', 'y', '1']:
+        return None
+    return str(ver.get('Verification Source', '')).strip()
+
+
+def _task3b_banner():
+    print("\n" + "=" * 70)
+    print("▶ Task 3b: Verify Employment")
+    print("=" * 70)
+    log("Starting employment verification step")
+
+
+def _write_template(df_ver):
+    template_path = MANUAL_DIR / 'verification_template.csv'
+    template_cols = ['Name', 'Company', 'LinkedIn Search URL', 'Verification Source', 'Employment Verified', 'Verified At']
+    try:
+        df_ver[template_cols].to_csv(template_path, index=False)
+        log(f"Wrote verification template to {template_path}")
+    except Exception as e:
+        log(f"Failed writing template: {e}")
+
+
+def _save_step(df_ver):
+    # Persist step artifact
+    step_csv = OUTPUT_DIR / 'step3b_verified.csv'
+    try:
+        step_csv = save_artifact(df_ver, step_csv)
+        log(f"Saved {step_csv.name} with {len(df_ver)} rows")
+    except Exception as e:
+        log(f"Failed writing step3b_verified.csv: {e}")
+
+    print(f"✓ Employment verification step prepared for {len(df_ver)} executives.")
+    return df_ver
+
+
 # ============================================================================
 # TASK 3b: VERIFY CURRENT EMPLOYMENT (SEMI-MANUAL)
 # ============================================================================
@@ -46,13 +106,11 @@ def task3b_verify_employment(df: pd.DataFrame) -> pd.DataFrame:
       - Verification Source (URL)
       - Verified At (ISO date)
     """
-    print("\n" + "=" * 70)
-    print("▶ Task 3b: Verify Employment")
-    print("=" * 70)
-    log("Starting employment verification step")
+    _task3b_banner()
 
     # Build base verification columns
-    df_ver = df.copy()
+    # Shallow copy: under copy-on-write columns are shared until modified
+    df_ver = df.copy(deep=False)
     df_ver['LinkedIn Search URL'] = df_ver.apply(
         lambda r: linkedin_search_url(str(r.get('Name', '')), str(r.get('Company', ''))), axis=1
     )
@@ -61,51 +119,59 @@ def task3b_verify_employment(df: pd.DataFrame) -> pd.DataFrame:
     df_ver['Verified At'] = ''
 
     # Write a template for manual verification
-    template_path = MANUAL_DIR / 'verification_template.csv'
-    template_cols = ['Name', 'Company', 'LinkedIn Search URL', 'Verification Source', 'Employment Verified', 'Verified At']
-    try:
-        df_ver[template_cols].to_csv(template_path, index=False)
-        log(f"Wrote verification template to {template_path}")
-    except Exception as e:
-        log(f"Failed writing template: {e}")
+    _write_template(df_ver)
 
     # If overrides exist, merge them
-    overrides_path = MANUAL_DIR / 'verification_overrides.csv'
-    if overrides_path.exists():
-        try:
-            ov = pd.read_csv(overrides_path)
+    try:
+        ov = load_overrides()
+        if ov is not None:
             # Normalize join keys
-            def norm(s):
-                return '' if pd.isna(s) else str(s).strip().lower()
-            df_ver['_k'] = df_ver['Name'].map(norm) + '|' + df_ver['Company'].map(norm)
-            ov['_k'] = ov['Name'].map(norm) + '|' + ov['Company'].map(norm)
-            ov = ov.set_index('_k')
+            df_ver['_k'] = df_ver['Name'].map(_norm_key) + '|' + df_ver['Company'].map(_norm_key)
 
             # Apply overrides
             for idx, row in df_ver.iterrows():
-                k = row['_k']
-                if k in ov.index:
-                    ver = ov.loc[k]
-                    emp_verified = str(ver.get('Employment Verified', '')).strip().lower()
-                    if emp_verified in ['yes', 'true', 'y', '1']:
-                        df_ver.at[idx, 'Employment Verified'] = 'yes'
-                        src = str(ver.get('Verification Source', '')).strip()
-                        if src:
-                            df_ver.at[idx, 'Verification Source'] = src
-                        if not str(df_ver.at[idx, 'Verified At']).strip():
-                            df_ver.at[idx, 'Verified At'] = datetime.utcnow().date().isoformat()
+                src = _override_for(ov, row['_k'])
+                if src is not None:
+                    df_ver.at[idx, 'Employment Verified'] = 'yes'
+                    if src:
+                        df_ver.at[idx, 'Verification Source'] = src
+                    if not str(df_ver.at[idx, 'Verified At']).strip():
+                        df_ver.at[idx, 'Verified At'] = datetime.utcnow().date().isoformat()
             df_ver.drop(columns=['_k'], inplace=True)
-            log(f"Applied overrides from {overrides_path}")
-        except Exception as e:
-            log(f"Failed reading overrides: {e}")
+            log(f"Applied overrides from {MANUAL_DIR / 'verification_overrides.csv'}")
+    except Exception as e:
+        log(f"Failed reading overrides: {e}")
 
-    # Persist step artifact
-    step_csv = OUTPUT_DIR / 'step3b_verified.csv'
+    return _save_step(df_ver)
+
+
+def task3b_row_stream(total):
+    """Per-row form of Task 3b for streaming runs: (row_fn, finish)."""
+    _task3b_banner()
     try:
-        df_ver.to_csv(step_csv, index=False)
-        log(f"Saved step3b_verified.csv with {len(df_ver)} rows")
+        ov = load_overrides()
     except Exception as e:
-        log(f"Failed writing step3b_verified.csv: {e}")
-
-    print(f"✓ Employment verification step prepared for {len(df_ver)} executives.")
-    return df_ver
+        log(f"Failed reading overrides: {e}")
+        ov = None
+
+    def verify_row(row):
+        row['LinkedIn Search URL'] = linkedin_search_url(str(row.get('Name', '')), str(row.get('Company', '')))
+        row['Employment Verified'] = 'no'
+        row['Verification Source'] = ''
+        row['Verified At'] = ''
+        src = _override_for(ov, _norm_key(row['Name']) + '|' + _norm_key(row['Company'])) if ov is not None else None
+        if src is not None:
+            row['Employment Verified'] = 'yes'
+            if src:
+                row['Verification Source'] = src
+            row['Verified At'] = datetime.utcnow().date().isoformat()
+        return row
+
+    def finish(df_ver):
+        # The template lists every row unverified, as in the batch step
+        _write_template(df_ver.assign(**{'Employment Verified': 'no', 'Verification Source': '', 'Verified At': ''}))
+        if ov is not None:
+            log(f"Applied overrides from {MANUAL_DIR / 'verification_overrides.csv'}")
+        return _save_step(df_ver)
+
+    return verify_row, finish
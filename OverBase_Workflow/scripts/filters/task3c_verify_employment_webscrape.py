@@ -1,17 +1,31 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 from datetime import datetime
 import re
 import urllib.parse
 import os
+import gzip
+import threading
+import xml.etree.ElementTree as ET
+from collections import deque
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 from unidecode import unidecode
 
+from filters.task5_quality_check import GOAL_DIRECTED, VerificationGoal
+from pipeline.dns_cache import DNS
+from pipeline.html_page import Page, PageParser, charset_of
+from pipeline.journal import RowJournal
+from pipeline.net import BREAKER, HostLimiter, NetStats, header_bytes, host_of, is_host_failure, read_capped
+from pipeline.people_index import PeopleIndex
+from pipeline.artifacts import save_artifact
+from pipeline.bandit import ArmStats
+from pipeline.schema import enable_copy_on_write
+
 # Project paths
 script_dir = Path(__file__).parent
 scripts_dir = script_dir.parent
@@ -23,6 +37,8 @@ for p in [OUTPUT_DIR, LOGS_DIR]:
 
 LOG_FILE = LOGS_DIR / "workflow.log"
 
+enable_copy_on_write()
+
 # Scrape mode toggle via env: OVERBASE_SCRAPE_MODE=accurate for deeper scan
 SCRAPE_MODE = os.getenv("OVERBASE_SCRAPE_MODE", "normal").lower()
 ACCURATE = SCRAPE_MODE in ("accurate", "max", "deep")
@@ -33,8 +49,35 @@ MAX_MAIN = 12 if ACCURATE else 8
 MAX_TOTAL = 20 if ACCURATE else 12
 SUBLINKS_PER_PAGE = 10 if ACCURATE else 5
 EXTRACT_LINKS_LIMIT = 15 if ACCURATE else 10
+# Pages are read up to OVERBASE_PAGE_MAX_KB (names sit near the top of a page)
+# and only if served as HTML; each is parsed once, off the network threads
+PAGE_BYTE_CAP = int(os.getenv("OVERBASE_PAGE_MAX_KB", "1024")) * 1024
+SITEMAP_BYTE_CAP = 10 * 1024 * 1024
+HTML_TYPES = r"text/html|application/xhtml"
+SKIP_EXTENSIONS = r"\.(pdf|jpe?g|png|gif|webp|svg|mp4|mov|mp3|zip|docx?|xlsx?|pptx?)$"
+PARSER = PageParser()
 VERBOSE_PROGRESS = True
 
+# Rows are crawled concurrently on a global pool; each company site gets at
+# most PER_HOST_REQUESTS requests in flight at a time
+WORKERS = int(os.getenv("OVERBASE_TASK3C_WORKERS", "16"))
+PER_HOST_REQUESTS = 2
+HOST_LIMIT = HostLimiter(PER_HOST_REQUESTS)
+# Crawled pages per site, kept across runs (outputs/cache/people.sqlite)
+PEOPLE = PeopleIndex()
+
+# Discovery: leadership/team pages listed in robots.txt / sitemaps replace the
+# guessed paths on sites that publish them (OVERBASE_SITEMAP_DISCOVERY=0: guess only)
+SITEMAP_DISCOVERY = os.getenv("OVERBASE_SITEMAP_DISCOVERY", "1").lower() in ("1", "true", "yes")
+SITEMAP_MAX_FILES = 4      # sitemap files fetched per domain, index children included
+SKIP_SITEMAPS = r"post|blog|news|product|categor|tag|author|video|image|event|job"
+# Path words of leadership/team pages, best first, and of sections to leave out
+PAGE_WORDS = ["leadership", "leaders", "executives", "executive", "management", "team",
+              "people", "founders", "board", "about", "who", "company"]
+SKIP_WORDS = {"blog", "blogs", "news", "press", "careers", "jobs", "events", "event", "webinar",
+              "webinars", "resources", "customers", "products", "product", "solutions", "docs",
+              "support", "tag", "category"}
+
 
 def log(message: str):
     with open(LOG_FILE, "a") as f:
@@ -50,65 +93,102 @@ def _clean_domain(url: str) -> str:
     return url
 
 
-def _http_get(url: str, timeout=REQUEST_TIMEOUT):
+def _fetch(url: str, timeout=REQUEST_TIMEOUT, stats=None, deadline=None,
+           byte_cap=PAGE_BYTE_CAP, html_only=False):
+    """GET url under the per-host limit: (status, body, Content-Type).
+
+    status is None if no answer came back (host unresolved or failing,
+    connection error, timeout, deadline). The request ends by deadline
+    (time.time()) if given. The body of a 200 is streamed and cut off after
+    byte_cap bytes. With html_only, a response whose Content-Type says it is
+    not HTML (PDF, image, ...) is closed unread.
+    """
     started = time.time()
+    if not DNS.resolves(url):
+        if stats is not None:
+            stats.skip("dns")
+        if VERBOSE_PROGRESS:
+            print(f"    GET {url} -> skipped, host does not resolve", flush=True)
+        return None, b"", ""
+    if not BREAKER.allow(url, stats):
+        if VERBOSE_PROGRESS:
+            print(f"    GET {url} -> skipped, host keeps failing (circuit open)", flush=True)
+        return None, b"", ""
+    if not HOST_LIMIT.acquire(url, None if deadline is None else max(0.0, deadline - time.time())):
+        if VERBOSE_PROGRESS:
+            print(f"    GET {url} -> skipped, row deadline passed waiting for the host", flush=True)
+        return None, b"", ""
+    waited = time.time() - started
+    full_timeout = timeout
+    if deadline is not None:
+        timeout = max(0.1, min(timeout, deadline - time.time()))
+    status, ctype, body, nbytes, not_html = None, "", b"", 0, False
+    failed = False
     try:
-        resp = requests.get(
+        with requests.get(
             url,
             headers={
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             },
             timeout=timeout,
             allow_redirects=True,
-        )
-        if resp.status_code == 200 and resp.content:
-            if VERBOSE_PROGRESS:
-                print(f"    GET {url} -> 200 in {time.time()-started:.1f}s", flush=True)
-            return resp
-    except Exception:
-        pass
-    if VERBOSE_PROGRESS:
-        print(f"    GET {url} -> failed in {time.time()-started:.1f}s", flush=True)
-    return None
+            stream=True,
+        ) as resp:
+            status, ctype = resp.status_code, resp.headers.get("Content-Type", "")
+            nbytes = header_bytes(resp)
+            not_html = html_only and ctype and not re.search(HTML_TYPES, ctype, re.I)
+            if status == 200 and not not_html:
+                body = read_capped(resp, byte_cap, deadline)
+                nbytes += len(body)
+    except Exception as e:
+        status = None
+        # A timeout cut short by the row deadline says nothing about the host
+        failed = is_host_failure(e) and not (isinstance(e, requests.Timeout) and timeout < full_timeout)
+    finally:
+        HOST_LIMIT.release(url)
+    if status is not None or failed:
+        BREAKER.record(url, time.time() - started - waited, failed)
+    if stats is not None:
+        stats.request(time.time() - started - waited, waited, nbytes)
+    if status == 200 and body:
+        if VERBOSE_PROGRESS:
+            print(f"    GET {url} -> 200 in {time.time()-started:.1f}s", flush=True)
+    elif VERBOSE_PROGRESS:
+        why = f"skipped, not HTML ({ctype.split(';')[0]})" if not_html else "failed"
+        print(f"    GET {url} -> {why} in {time.time()-started:.1f}s", flush=True)
+    return status, body, ctype
 
 
-def _extract_links(base_url: str, html: str) -> list:
-    try:
-        soup = BeautifulSoup(html, "lxml")
-    except Exception:
-        return []
+ANCHOR_WORDS = r"about|team|leadership|people|management|company|executive|board"
 
-    links = []
-    for a in soup.find_all("a", href=True):
-        text = (a.get_text() or "").strip().lower()
-        href = a["href"].strip()
-        if not href:
-            continue
-        # Absolute or relative
-        target = urllib.parse.urljoin(base_url, href)
-        # Only keep same-domain links
-        if urllib.parse.urlparse(target).netloc != urllib.parse.urlparse(base_url).netloc:
+
+def _extract_links(page: Page) -> list:
+    """Same-site links whose anchor text looks like a team page: [(url, anchor keyword)]."""
+    links, seen = [], set()
+    for target, text in page.links:
+        # Prefer likely team/leadership pages; documents and media are not
+        keyword = re.search(ANCHOR_WORDS, text)
+        if not keyword or target in seen or re.search(SKIP_EXTENSIONS, target.lower()):
             continue
-        # Prefer likely team/leadership pages
-        if re.search(r"about|team|leadership|people|management|company|executive|board", text):
-            links.append(target)
-    # De-dup while preserving order
-    seen, uniq = set(), []
-    for u in links:
-        if u not in seen:
-            uniq.append(u)
-            seen.add(u)
-    return uniq[:EXTRACT_LINKS_LIMIT]
+        links.append((target, keyword.group(0)))
+        seen.add(target)
+    return links[:EXTRACT_LINKS_LIMIT]
 
 
-def _page_contains_name(html: str, first: str, last: str) -> bool:
-    if not html:
-        return False
-    txt = unidecode(BeautifulSoup(html, "lxml").get_text(" ") or "")
-    txt = re.sub(r"\s+", " ", txt).strip().lower()
+def _path_key(url: str) -> str:
+    """Path pattern of a URL for crawl outcomes: lowercase, numbers as {n} ('/team/{n}')."""
+    path = urllib.parse.urlparse(url).path.lower().rstrip("/") or "/"
+    return re.sub(r"\d+", "{n}", path)
+
+
+def _arms(url: str, anchor: str = None) -> list:
+    return [("path", _path_key(url))] + ([("anchor", anchor)] if anchor else [])
+
+
+def _text_contains_name(txt: str, first: str, last: str) -> bool:
     first = (first or "").lower()
     last = (last or "").lower()
-    if not first and not last:
+    if not txt or (not first and not last):
         return False
     # Full name
     if first and last and f"{first} {last}" in txt:
@@ -122,6 +202,18 @@ def _page_contains_name(html: str, first: str, last: str) -> bool:
     return False
 
 
+def _names_on_page(txt: str, names: dict) -> list:
+    """Keys of every name in names ({key: (first, last)}) that txt contains.
+
+    The page is parsed and normalized once (html_page.parse_page) and every
+    pending exec is checked against that text, instead of re-parsing it per
+    exec.
+    """
+    if not txt:
+        return []
+    return [key for key, (first, last) in names.items() if _text_contains_name(txt, first, last)]
+
+
 def _split_name(name: str):
     if not isinstance(name, str) or not name.strip():
         return "", ""
@@ -137,135 +229,549 @@ def _split_name(name: str):
     return parts[0].lower(), parts[-1].lower()
 
 
-def task3c_verify_employment_webscrape(df: pd.DataFrame) -> pd.DataFrame:
-    print("\n" + "=" * 70)
-    print("▶ Task 3c: Website Scrape Employment Verification")
-    print("=" * 70)
-
-    df_out = df.copy()
-    total = len(df_out)
-
-    # Ensure required columns
-    for col in ["Employment Verified", "Verification Source", "Verified At", "Company Website"]:
-        if col not in df_out.columns:
-            df_out[col] = ""
-
-    start = time.time()
-    verified_count = 0
-
-    for idx, row in df_out.iterrows():
-        row_start = time.time()
-        name = str(row.get("Name", "")).strip()
-        first, last = _split_name(name)
-        base = _clean_domain(str(row.get("Company Website", "")).strip())
-        already = str(row.get("Employment Verified", "")).strip().lower() == "yes"
+def _candidate_urls(base: str) -> list:
+    """A small set of standard leadership/team pages"""
+    candidates = [
+        base,
+        urllib.parse.urljoin(base, "/about"),
+        urllib.parse.urljoin(base, "/about-us"),
+        urllib.parse.urljoin(base, "/company"),
+        urllib.parse.urljoin(base, "/team"),
+        urllib.parse.urljoin(base, "/our-team"),
+        urllib.parse.urljoin(base, "/leadership"),
+        urllib.parse.urljoin(base, "/leadership-team"),
+        urllib.parse.urljoin(base, "/executives"),
+        urllib.parse.urljoin(base, "/management"),
+        urllib.parse.urljoin(base, "/people"),
+    ]
+    if ACCURATE:
+        candidates.extend([
+            urllib.parse.urljoin(base, "/who-we-are"),
+            urllib.parse.urljoin(base, "/about/company"),
+            urllib.parse.urljoin(base, "/about/leadership"),
+            urllib.parse.urljoin(base, "/company/leadership"),
+            urllib.parse.urljoin(base, "/executive-team"),
+            urllib.parse.urljoin(base, "/management-team"),
+        ])
+    # Deduplicate
+    seen, uniq = set(), []
+    for u in candidates:
+        if u not in seen:
+            uniq.append(u)
+            seen.add(u)
+    return uniq
 
-        if VERBOSE_PROGRESS:
-            print(f"3c [{idx+1}/{total}] {name or '(no name)'} | base={base or '-'}", flush=True)
 
-        if not (first or last):
-            if VERBOSE_PROGRESS:
-                print("  - skip: empty name", flush=True)
+def _parse_sitemap(data: bytes):
+    """('index' | 'urlset', [loc, ...]) of a sitemap file (gzip or plain), or (None, []) if it is not one."""
+    if data[:2] == b"\x1f\x8b":
+        try:
+            data = gzip.decompress(data)
+        except Exception:
+            return None, []
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return None, []
+    kind = {"sitemapindex": "index", "urlset": "urlset"}.get(root.tag.rsplit("}", 1)[-1])
+    if kind is None:
+        return None, []
+    locs = []
+    for entry in root:
+        for child in entry:
+            if child.tag.rsplit("}", 1)[-1] == "loc" and child.text:
+                locs.append(child.text.strip())
+    return kind, locs
+
+
+def _page_rank(url: str):
+    """Sort key of a sitemap URL as a leadership page, or None if it does not look like one."""
+    segments = [seg for seg in urllib.parse.urlparse(url).path.lower().split("/") if seg]
+    words = set()
+    for seg in segments:
+        words.update(w for w in re.split(r"[^a-z0-9]+", seg.rsplit(".", 1)[0]) if w)
+    if words & SKIP_WORDS:
+        return None
+    ranks = [PAGE_WORDS.index(w) for w in words if w in PAGE_WORDS]
+    return (min(ranks), len(segments)) if ranks else None
+
+
+def _leadership_pages(base: str, locs: list) -> list:
+    """The sitemap URLs on base's domain that look like leadership/team pages, best first."""
+    ranked, seen = [], set()
+    for order, url in enumerate(locs):
+        rank = _page_rank(url)
+        if rank is None or url in seen or host_of(url) != host_of(base):
             continue
-
-        if already:
-            if VERBOSE_PROGRESS:
-                print("  - skip: already verified", flush=True)
+        seen.add(url)
+        ranked.append((rank, order, url))
+    return [url for _, _, url in sorted(ranked)][:MAX_MAIN - 1]
+
+
+def _answered(status) -> bool:
+    """True if status is a definitive answer (not a failure, timeout or server error)."""
+    return status is not None and status < 500 and status not in (408, 429)
+
+
+def _discover_pages(base: str, stats=None, deadline=None):
+    """Leadership/team pages listed in the site's sitemaps, best first: (pages, complete).
+
+    Sitemaps are taken from robots.txt, else /sitemap.xml; sitemap indexes
+    are followed (sitemaps named like pages first) up to SITEMAP_MAX_FILES
+    files. pages is None if the site publishes no sitemap. complete is False
+    if a file could not be fetched (no answer, server error, row deadline),
+    so the result may be missing pages and should not be cached.
+    """
+    root = urllib.parse.urljoin(base, "/")
+    status, body, _ = _fetch(urllib.parse.urljoin(root, "/robots.txt"), stats=stats, deadline=deadline)
+    complete = _answered(status)
+    sitemaps = []
+    if status == 200:
+        sitemaps = [line.split(":", 1)[1].strip() for line in body.decode("utf-8", "replace").splitlines()
+                    if line.strip().lower().startswith("sitemap:")]
+    queue = deque(sitemaps or [urllib.parse.urljoin(root, "/sitemap.xml")])
+    locs, fetched, any_sitemap = [], 0, False
+    while queue and fetched < SITEMAP_MAX_FILES:
+        if deadline is not None and time.time() > deadline:
+            complete = False
+            break
+        status, body, _ = _fetch(queue.popleft(), stats=stats, deadline=deadline, byte_cap=SITEMAP_BYTE_CAP)
+        fetched += 1
+        complete = complete and _answered(status)
+        if status != 200 or not body:
             continue
+        kind, found = _parse_sitemap(body)
+        if kind == "index":
+            any_sitemap = True
+            # Page sitemaps first; post/blog/product/taxonomy sitemaps list no leadership pages
+            children = [u for u in found if not re.search(SKIP_SITEMAPS, u.lower())]
+            queue.extend(sorted(children, key=lambda u: not re.search(r"page|about|company|team", u.lower())))
+        elif kind == "urlset":
+            any_sitemap = True
+            locs.extend(found)
+    return (_leadership_pages(base, locs) if any_sitemap else None), complete
+
+
+def _crawl_plan(base: str, stats=None, deadline=None) -> list:
+    """Standard pages to crawl: the sitemap's leadership pages then the homepage, else the guessed paths."""
+    if SITEMAP_DISCOVERY:
+        domain = host_of(base)
+        hit, pages = PEOPLE.get_discovery(domain)
+        if not hit:
+            pages, complete = _discover_pages(base, stats, deadline)
+            # Only definitive results are kept: a timeout, server error or the
+            # row deadline may have hidden the sitemap; try again next run
+            if complete:
+                PEOPLE.put_discovery(domain, pages)
+        if pages:
+            return [url for url in pages if url != base] + [base]
+    return _candidate_urls(base)
+
+
+def _skip_reason(row):
+    """Why _scan_row would not crawl for this row, or None."""
+    first, last = _split_name(str(row.get("Name", "")).strip())
+    if not (first or last):
+        return "empty name"
+    if str(row.get("Employment Verified", "")).strip().lower() == "yes":
+        return "already verified"
+    if not _clean_domain(str(row.get("Company Website", "")).strip()):
+        return "no company website"
+    return None
 
-        if not base:
-            if VERBOSE_PROGRESS:
-                print("  - skip: no company website", flush=True)
-            continue
 
-        # Candidates: a small set of standard leadership/team pages
-        candidates = [
-            base,
-            urllib.parse.urljoin(base, "/about"),
-            urllib.parse.urljoin(base, "/about-us"),
-            urllib.parse.urljoin(base, "/company"),
-            urllib.parse.urljoin(base, "/team"),
-            urllib.parse.urljoin(base, "/our-team"),
-            urllib.parse.urljoin(base, "/leadership"),
-            urllib.parse.urljoin(base, "/leadership-team"),
-            urllib.parse.urljoin(base, "/executives"),
-            urllib.parse.urljoin(base, "/management"),
-            urllib.parse.urljoin(base, "/people"),
-        ]
-        if ACCURATE:
-            candidates.extend([
-                urllib.parse.urljoin(base, "/who-we-are"),
-                urllib.parse.urljoin(base, "/about/company"),
-                urllib.parse.urljoin(base, "/about/leadership"),
-                urllib.parse.urljoin(base, "/company/leadership"),
-                urllib.parse.urljoin(base, "/executive-team"),
-                urllib.parse.urljoin(base, "/management-team"),
-            ])
-        # Deduplicate
-        seen, uniq = set(), []
-        for u in candidates:
-            if u not in seen:
-                uniq.append(u)
-                seen.add(u)
-        candidates = uniq
-
-        found = False
-        scanned = 0
-
-        for url in candidates:
-            if time.time() - row_start > PER_ROW_MAX_SECONDS:
-                if VERBOSE_PROGRESS:
-                    print(f"  - time budget reached ({PER_ROW_MAX_SECONDS}s), stopping", flush=True)
-                break
-            if scanned >= MAX_MAIN:
-                break
-            if VERBOSE_PROGRESS:
-                print(f"  - scan {scanned+1}: {url}", flush=True)
-            resp = _http_get(url)
-            scanned += 1
-            if not resp:
-                continue
-            if _page_contains_name(resp.text, first, last):
-                df_out.at[idx, "Employment Verified"] = "yes"
-                df_out.at[idx, "Verification Source"] = url
-                df_out.at[idx, "Verified At"] = datetime.utcnow().date().isoformat()
-                verified_count += 1
-                found = True
-                break
-            # If not found, mine the page for likely links and scan a few
-            for sub_url in _extract_links(url, resp.text)[:SUBLINKS_PER_PAGE]:
-                if time.time() - row_start > PER_ROW_MAX_SECONDS:
+def _would_crawl(row) -> bool:
+    """True if _scan_row would hit the network for this row."""
+    return _skip_reason(row) is None
+
+
+class SiteCrawl:
+    """The crawl of one company site, shared by every exec at that company.
+
+    The crawl order does not depend on who is being looked for: the standard
+    pages (from the sitemap, else guessed; see _crawl_plan) in order, each
+    fetched standard page followed by up to SUBLINKS_PER_PAGE links mined
+    from it, within MAX_MAIN / MAX_TOTAL fetches. An exec's search stops at the first page naming them, so the
+    pages fetched for one exec are a prefix of the pages another exec at the
+    same company needs. Pages are fetched once, kept as normalized text and
+    replayed for later execs.
+
+    With an index, a fresh entry from an earlier run seeds the crawl (its
+    pages and where it stopped), and save() writes the crawl back. A fetch
+    that got no definitive answer (no response, timeout, server error) is
+    not part of the crawl: it is not counted, its URL stays to fetch, and a
+    crawl with no page fetched is not saved, so one network blip does not
+    blank the site for the index TTL.
+
+    With arms (crawl outcomes of earlier runs), the standard pages and each
+    page's mined links are ordered by how often their path pattern and link
+    text led to a verified name, on this domain and overall. Every page
+    fetched is recorded as a try of its arms, and a hit once it names an exec.
+    """
+
+    def __init__(self, base: str, stats=None, index: PeopleIndex = None, arms: ArmStats = None):
+        self.base = base
+        self.stats = stats
+        self.index = index
+        self.arms = arms
+        self.domain = host_of(base)
+        self._fetched = {}      # url -> anchor keyword, for pages this crawl fetched
+        self._credited = set()
+        self._lock_credit = threading.Lock()
+        self.pages = []     # (url, page text or None if not a 200 HTML page), in crawl order
+        self._todo = None   # planned on the first fetch (discovery needs the network)
+        self._retry = []    # (url, main, anchor) whose fetch got no answer, for the next run
+        self._scanned = 0
+        self._crawled = time.time()
+        self._saved = 0
+        self._lock = threading.Lock()
+        entry = index.get(base) if index is not None else None
+        if entry is not None:
+            state, self._crawled = entry
+            self.pages = [tuple(page) for page in state["pages"]]
+            self._todo = deque((tuple(item) + (None,))[:3] for item in state["todo"])
+            self._scanned = state["scanned"]
+            self._saved = len(self.pages)
+            if stats is not None:
+                stats.cache_hit()
+
+    def save(self):
+        """Write the crawl to the index if it fetched anything new and got at least one page."""
+        with self._lock:
+            if self.index is None or len(self.pages) == self._saved:
+                return
+            if not any(txt is not None for _, txt in self.pages):
+                return
+            # Fetches that got no answer are retried first next run
+            todo = self._retry + list(self._todo or ())
+            state = {"pages": self.pages, "todo": todo, "scanned": self._scanned}
+            self.index.put(self.base, state, self._crawled)
+            self._saved = len(self.pages)
+
+    def page(self, i: int, deadline: float):
+        """Page i of the crawl, fetching it if needed; None once the crawl is over or past deadline."""
+        if i < len(self.pages):
+            return self.pages[i]
+        if not self._lock.acquire(timeout=max(0.0, deadline - time.time())):
+            return None
+        try:
+            if self._todo is None:
+                plan = _crawl_plan(self.base, self.stats, deadline)
+                if self.arms is not None:
+                    plan = self.arms.order(plan, _arms, self.domain)
+                self._todo = deque((url, True, None) for url in plan)
+            while i >= len(self.pages):
+                if not self._todo:
+                    return None
+                if time.time() > deadline:
                     if VERBOSE_PROGRESS:
-                        print(f"  - time budget reached ({PER_ROW_MAX_SECONDS}s), stopping", flush=True)
-                    break
-                if scanned >= MAX_TOTAL:
-                    break
+                        print(f"  - {self.base}: time budget reached, stopping", flush=True)
+                    return None
+                url, main, anchor = self._todo[0]
+                if self._scanned >= (MAX_MAIN if main else MAX_TOTAL):
+                    self._todo.clear()
+                    return None
+                if BREAKER.blocked(url, self.stats):
+                    # Site down or tarpitting: stop here for this exec; the rest of
+                    # the crawl stays planned for a later exec or run
+                    if VERBOSE_PROGRESS:
+                        print(f"  - {self.base}: host keeps failing (circuit open), stopping", flush=True)
+                    return None
+                item = self._todo.popleft()
                 if VERBOSE_PROGRESS:
-                    print(f"    - sub-scan {scanned+1}: {sub_url}", flush=True)
-                sub_resp = _http_get(sub_url)
-                scanned += 1
-                if not sub_resp:
+                    print(f"  - {'scan' if main else '  sub-scan'} {self._scanned+1}: {url}", flush=True)
+                status, body, ctype = _fetch(url, stats=self.stats, deadline=deadline, html_only=True)
+                if not _answered(status):
+                    # No definitive answer: not a page of the crawl. Cut off by the
+                    # deadline it stays next in line, else it is retried next run
+                    if time.time() > deadline:
+                        self._todo.appendleft(item)
+                    else:
+                        self._retry.append(item)
                     continue
-                if _page_contains_name(sub_resp.text, first, last):
-                    df_out.at[idx, "Employment Verified"] = "yes"
-                    df_out.at[idx, "Verification Source"] = sub_url
-                    df_out.at[idx, "Verified At"] = datetime.utcnow().date().isoformat()
-                    verified_count += 1
-                    found = True
-                    break
-            if found:
+                page = PARSER.parse(url, body, charset_of(ctype)) if status == 200 and body else None
+                self._scanned += 1
+                self._fetched[url] = anchor
+                if self.arms is not None:
+                    for kind, key in _arms(url, anchor):
+                        self.arms.record(self.domain, kind, key)
+                if page and main:
+                    # Mined links are scanned right after the page they came from
+                    links = _extract_links(page)
+                    if self.arms is not None:
+                        links = self.arms.order(links, lambda link: _arms(*link), self.domain)
+                    links = links[:SUBLINKS_PER_PAGE]
+                    self._todo.extendleft((link, False, keyword) for link, keyword in reversed(links))
+                self.pages.append((url, page.text if page else None))
+            return self.pages[i]
+        finally:
+            self._lock.release()
+
+    def _credit(self, url: str, i: int):
+        """A page this crawl fetched named an exec: a hit for its arms (once)."""
+        with self._lock_credit:
+            if url not in self._fetched or url in self._credited:
+                return
+            self._credited.add(url)
+            first = len(self._credited) == 1
+        if self.arms is not None:
+            for kind, key in _arms(url, self._fetched[url]):
+                self.arms.record(self.domain, kind, key, tries=0, hits=1)
+        if first and self.stats is not None:
+            self.stats.sample("first_hit", i + 1)
+
+    def find(self, names: dict, deadline: float) -> dict:
+        """First page naming each exec in names ({key: (first, last)}): {key: url}."""
+        pending = dict(names)
+        found = {}
+        i = 0
+        while pending:
+            page = self.page(i, deadline)
+            if page is None:
                 break
+            url, txt = page
+            for key in _names_on_page(txt, pending):
+                found[key] = url
+                del pending[key]
+                self._credit(url, i)
+            i += 1
+        return found
+
+
+class SiteCrawls:
+    """SiteCrawl per company website for one stage run."""
+
+    def __init__(self, stats=None, index: PeopleIndex = None, arms: ArmStats = None):
+        self.stats = stats
+        self.index = index
+        self.arms = arms
+        self._crawls = {}
+        self._lock = threading.Lock()
+
+    def get(self, base: str) -> SiteCrawl:
+        with self._lock:
+            if base not in self._crawls:
+                self._crawls[base] = SiteCrawl(base, self.stats, self.index, self.arms)
+            return self._crawls[base]
+
+
+def _scan_row(row, label: str, stats=None, sites: SiteCrawls = None):
+    """Search one row's company site; returns the page URL naming the exec, or None."""
+    row_start = time.time()
+    name = str(row.get("Name", "")).strip()
+    base = _clean_domain(str(row.get("Company Website", "")).strip())
+
+    if VERBOSE_PROGRESS:
+        print(f"3c [{label}] {name or '(no name)'} | base={base or '-'}", flush=True)
 
-        took = time.time() - row_start
+    reason = _skip_reason(row)
+    if reason:
         if VERBOSE_PROGRESS:
-            print(f"  - done: verified={'yes' if found else 'no'}, scanned={scanned}, took={took:.1f}s", flush=True)
+            print(f"  - skip: {reason}", flush=True)
+        return None
+
+    crawl = sites.get(base) if sites is not None else SiteCrawl(base, stats)
+    found = crawl.find({0: _split_name(name)}, row_start + PER_ROW_MAX_SECONDS).get(0)
+    crawl.save()
+
+    took = time.time() - row_start
+    if stats is not None:
+        stats.row(took)
+    if VERBOSE_PROGRESS:
+        print(f"  - done: verified={'yes' if found else 'no'}, took={took:.1f}s", flush=True)
+    return found
+
+
+def _journaled_scan(row, label: str, journal: RowJournal, stats=None, sites: SiteCrawls = None):
+    """_scan_row, replaying the result from the journal if this row already finished."""
+    done = journal.lookup(row)
+    if done is not None:
+        if VERBOSE_PROGRESS:
+            print(f"3c [{label}] {str(row.get('Name', '')).strip() or '(no name)'} | from journal", flush=True)
+        return done["url"]
+    url = _scan_row(row, label, stats, sites)
+    journal.record(row, {"url": url})
+    return url
+
+
+def _scan_site(base: str, rows: list, label: str, journal: RowJournal, stats=None, goal=None,
+               arms: ArmStats = None) -> dict:
+    """Crawl one company site once for all of its rows ([(idx, row)]); returns {idx: url or None}.
+
+    Rows already in the journal are replayed; the rest are matched together
+    against each page as it is fetched, within PER_ROW_MAX_SECONDS per row.
+    """
+    started = time.time()
+    results, names = {}, {}
+    for idx, row in rows:
+        if _goal_skip(goal, idx, row):
+            continue
+        done = journal.lookup(row)
+        if done is not None:
+            results[idx] = done["url"]
+        else:
+            names[idx] = _split_name(str(row.get("Name", "")).strip())
+    if names:
+        if VERBOSE_PROGRESS:
+            who = ", ".join(str(row.get("Name", "")).strip() for idx, row in rows if idx in names)
+            print(f"3c [{label}] {base} | {who}", flush=True)
+        crawl = SiteCrawl(base, stats, PEOPLE, arms)
+        # The per-row budget of every exec looked for here, spent on the shared crawl
+        found = crawl.find(names, started + PER_ROW_MAX_SECONDS * len(names))
+        crawl.save()
+        took = time.time() - started
+        for idx, row in rows:
+            if idx in names:
+                results[idx] = found.get(idx)
+                journal.record(row, {"url": results[idx]})
+                if stats is not None:
+                    stats.row(took)
+        if VERBOSE_PROGRESS:
+            print(f"  - done {base}: verified {len(found)}/{len(names)}, "
+                  f"scanned={len(crawl.pages)}, took={took:.1f}s", flush=True)
+    if goal is not None:
+        for idx, url in results.items():
+            if url:
+                goal.record_verified(idx)
+    return results
+
 
-        # polite delay
-        time.sleep(0.3)
+def _journal() -> RowJournal:
+    return RowJournal("task3c", sources=[__file__],
+                      env=("OVERBASE_SCRAPE_MODE", "OVERBASE_SITEMAP_DISCOVERY", "OVERBASE_PAGE_MAX_KB"))
 
+
+def _task3c_banner():
+    print("\n" + "=" * 70)
+    print("▶ Task 3c: Website Scrape Employment Verification")
+    print("=" * 70)
+
+
+def _save_step(df_out: pd.DataFrame, verified_count: int, goal=None, stats=None) -> pd.DataFrame:
+    if stats is not None:
+        stats.report()
     step_csv = OUTPUT_DIR / "step3c_verified_web.csv"
-    df_out.to_csv(step_csv, index=False)
+    step_csv = save_artifact(df_out, step_csv)
     log(f"Verified via website scraping: +{verified_count} rows; wrote {step_csv}")
+    if goal is not None:
+        log(f"Goal-directed verification: {goal.summary()}")
 
     print(f"✓ Web verification completed. Newly verified: {verified_count}")
+    if stats is not None:
+        # Success metric for page discovery: fewer requests for each row verified
+        per_row = f"{len(stats.requests) / verified_count:.1f}" if verified_count else "-"
+        print(f"ⓘ Requests per verified row: {per_row} ({len(stats.requests)} requests, {verified_count} verified)")
+        log(f"requests per verified row: {per_row}")
+        first_hit = stats.mean("first_hit")
+        if first_hit is not None:
+            # Ordering by past outcomes: a site's first match after fewer pages
+            print(f"ⓘ First match at page {first_hit:.1f} on average ({len(stats.samples['first_hit'])} sites)")
+            log(f"first match at page {first_hit:.1f} on average")
+    if goal is not None:
+        print(f"ⓘ Goal-directed: {goal.summary()}")
     return df_out
+
+
+def _goal_skip(goal, idx, row) -> bool:
+    """Goal-directed mode: skip rows that cannot help fill the final list any more."""
+    if goal is None or goal.worth_verifying(idx):
+        return False
+    if _would_crawl(row):
+        goal.record_avoided()
+    return True
+
+
+def task3c_verify_employment_webscrape(df: pd.DataFrame) -> pd.DataFrame:
+    _task3c_banner()
+
+    # Shallow copy: under copy-on-write columns are shared until modified
+    df_out = df.copy(deep=False)
+    total = len(df_out)
+
+    # Ensure required columns
+    for col in ["Employment Verified", "Verification Source", "Verified At", "Company Website"]:
+        if col not in df_out.columns:
+            df_out[col] = ""
+
+    verified_count = 0
+    stats = NetStats("task3c")
+
+    # Goal-directed: crawl in priority order and stop once the list is secured
+    goal = VerificationGoal(df_out) if GOAL_DIRECTED else None
+    order = goal.order if goal is not None else df_out.index
+
+    # Group the rows to crawl by company site, in crawl order: each site is
+    # crawled once and every pending exec there is matched on each page.
+    # Workers read from a snapshot (shared under copy-on-write) while results
+    # are written back here
+    rows = df_out.copy(deep=False)
+    sites = {}
+    for idx in order:
+        row = rows.loc[idx]
+        if _would_crawl(row):
+            sites.setdefault(_clean_domain(str(row.get("Company Website", "")).strip()), []).append((idx, row))
+    print(f"Crawling {len(sites)} company sites for {sum(map(len, sites.values()))} executives")
+
+    # Resolve every company site up front; rows on dead domains make no requests
+    DNS.prefetch(list(sites), "task3c")
+    # Which page paths and link texts found execs in earlier runs
+    arms = ArmStats(PEOPLE.load_outcomes())
+
+    def verify(item):
+        n, (base, site_rows) = item
+        return _scan_site(base, site_rows, f"{n}/{len(sites)}", journal, stats, goal, arms)
+
+    # Per-row journal: an interrupted crawl resumes after the last finished row
+    with _journal() as journal, ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="task3c") as pool:
+        for results in pool.map(verify, enumerate(sites.items(), 1)):
+            for idx, url in results.items():
+                if url:
+                    df_out.at[idx, "Employment Verified"] = "yes"
+                    df_out.at[idx, "Verification Source"] = url
+                    df_out.at[idx, "Verified At"] = datetime.utcnow().date().isoformat()
+                    verified_count += 1
+
+        PEOPLE.add_outcomes(arms.deltas())
+        return _save_step(df_out, verified_count, goal, stats)
+
+
+def task3c_row_stream(total):
+    """Per-row form of Task 3c for streaming runs: (row_fn, finish).
+
+    Rows arrive in input order, so goal-directed mode here only applies the
+    stop rule. Concurrency comes from the stream's workers for this stage.
+    """
+    _task3c_banner()
+    verified = []
+    goal = VerificationGoal() if GOAL_DIRECTED else None
+    journal = _journal()
+    stats = NetStats("task3c")
+    # Execs at the same company reuse that site's pages as they arrive
+    arms = ArmStats(PEOPLE.load_outcomes())
+    sites = SiteCrawls(stats, PEOPLE, arms)
+
+    def verify_row(row):
+        for col in ["Employment Verified", "Verification Source", "Verified At", "Company Website"]:
+            if col not in row.index:
+                row[col] = ""
+        if goal is not None:
+            goal.note_row(row.name, row)
+            if _goal_skip(goal, row.name, row):
+                return row
+        url = _journaled_scan(row, f"{row.name+1}/{total}", journal, stats, sites)
+        if url:
+            row["Employment Verified"] = "yes"
+            row["Verification Source"] = url
+            row["Verified At"] = datetime.utcnow().date().isoformat()
+            verified.append(row.name)   # list.append is atomic across worker threads
+            if goal is not None:
+                goal.record_verified(row.name)
+        return row
+
+    def finish(df_out):
+        PEOPLE.add_outcomes(arms.deltas())
+        _save_step(df_out, len(verified), goal, stats)
+        journal.complete()
+        return df_out
+
+    return verify_row, finish
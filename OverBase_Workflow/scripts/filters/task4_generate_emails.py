@@ -7,6 +7,8 @@ import tldextract
 from urllib.parse import urlparse
 from unidecode import unidecode
 
+from pipeline.artifacts import save_artifact
+
 # ----------------------------------------------------------------------------
 # Project paths
 # ----------------------------------------------------------------------------
@@ -19,6 +21,11 @@ for p in [OUTPUT_DIR, LOGS_DIR]:
     p.mkdir(parents=True, exist_ok=True)
 
 LOG_FILE = LOGS_DIR / "workflow.log"
+OUTPUT_CSV = OUTPUT_DIR / "senior_execs_with_emails.csv"
+STEP_CSV = OUTPUT_DIR / "step4_emails.csv"
+PATTERN_LOG = OUTPUT_DIR / "email_patterns_used.csv"
+
+EMAIL_COLUMNS = ["Candidate Email 1", "Candidate Email 2", "Email Confidence"]
 
 
 def log(message: str):
@@ -137,10 +144,37 @@ def pick_top_two(candidates, domain):
     )
 
 
+def candidate_emails(name, website, company):
+    """Domain, the two most likely emails, and all candidates tried for one exec."""
+    domain = extract_domain_from_url(website)
+
+    # Safe fallback only for short company names
+    if not domain:
+        company = str(company).lower()
+        company_clean = re.sub(r"[^a-z0-9]", "", company)
+        if 3 <= len(company_clean) <= 15:
+            domain = f"{company_clean}.com"
+
+    first, last = normalize_name(name)
+    candidates = generate_email_candidates(first, last, domain)
+    email1, email2, tried = pick_top_two(candidates, domain or "")
+    return domain, email1, email2, tried
+
+
 # ----------------------------------------------------------------------------
 # TASK 4: Generate Email Addresses
 # ----------------------------------------------------------------------------
 def task4_generate_emails(df: pd.DataFrame) -> pd.DataFrame:
+    df_out = task4_email_columns(df)
+    return task4_save_emails(df_out)
+
+
+def task4_email_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the candidate email columns; only needs Name and the company domain.
+
+    Writes the pattern log but not the per-row CSVs, so it can run on task3's
+    output alongside 3b/3c and be joined back by row (see task4_save_emails).
+    """
     print("\n" + "=" * 70)
     print("▶ Task 4: Generate Email Addresses")
     print("=" * 70)
@@ -149,19 +183,7 @@ def task4_generate_emails(df: pd.DataFrame) -> pd.DataFrame:
 
     for idx, row in df.iterrows():
         name = row.get("Name", "")
-        website = row.get("Company Website", "")
-        domain = extract_domain_from_url(website)
-
-        # Safe fallback only for short company names
-        if not domain:
-            company = str(row.get("Company", "")).lower()
-            company_clean = re.sub(r"[^a-z0-9]", "", company)
-            if 3 <= len(company_clean) <= 15:
-                domain = f"{company_clean}.com"
-
-        first, last = normalize_name(name)
-        candidates = generate_email_candidates(first, last, domain)
-        email1, email2, tried = pick_top_two(candidates, domain or "")
+        domain, email1, email2, tried = candidate_emails(name, row.get("Company Website", ""), row.get("Company", ""))
 
         row["Candidate Email 1"] = email1 or ""
         row["Candidate Email 2"] = email2 or ""
@@ -188,15 +210,14 @@ def task4_generate_emails(df: pd.DataFrame) -> pd.DataFrame:
 
     df_out = pd.DataFrame(results)
 
-    OUTPUT_CSV = OUTPUT_DIR / "senior_execs_with_emails.csv"
-    STEP_CSV = OUTPUT_DIR / "step4_emails.csv"
-    PATTERN_LOG = OUTPUT_DIR / "email_patterns_used.csv"
+    if pattern_log:
+        save_artifact(pd.DataFrame(pattern_log), PATTERN_LOG, deliverable=True)
+    return df_out
 
-    df_out.to_csv(OUTPUT_CSV, index=False)
-    df_out.to_csv(STEP_CSV, index=False)
 
-    if pattern_log:
-        pd.DataFrame(pattern_log).to_csv(PATTERN_LOG, index=False)
+def task4_save_emails(df_out: pd.DataFrame) -> pd.DataFrame:
+    """Write the Task 4 artifacts for a frame that carries the email columns."""
+    save_artifact(df_out, OUTPUT_CSV, aliases=[STEP_CSV])
 
     log(f"Generated emails for {len(df_out)} rows")
     print("✔ Task 4 completed")
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 from pathlib import Path
+import os
+import threading
 import pandas as pd
 import re
 
+from filters.task4_generate_emails import candidate_emails
+from pipeline.artifacts import save_artifact
+from pipeline.schema import enable_copy_on_write
+
 # ----------------------------------------------------------------------------
 # Project paths
 # ----------------------------------------------------------------------------
@@ -17,12 +23,148 @@ for p in [OUTPUT_DIR, LOGS_DIR]:
 
 LOG_FILE = LOGS_DIR / "workflow.log"
 
+enable_copy_on_write()
+
+
+TARGET_COUNT = 50
+TIER_ORDER = {'strict': 0, 'A': 1, 'B': 2, 'C': 3, 'fallback': 4}
+SENIOR_TITLE_PATTERN = (
+    r'Chief|CEO|COO|CMO|CFO|CTO|CRO|CPO|'
+    r'President|SVP|EVP|Managing Director|Founder'
+)
+
+# Goal-directed mode: verify rows in order of their best achievable tier and
+# stop the expensive stages once the final list is secured
+GOAL_DIRECTED = os.getenv("OVERBASE_GOAL_DIRECTED", "0").lower() in ("1", "true", "yes")
+
 
 def log(message: str):
     with open(LOG_FILE, "a") as f:
         f.write(f"[task5_quality_check] {message}\n")
 
 
+def quality_score(df_quality: pd.DataFrame) -> pd.Series:
+    """Offline quality signals used to rank rows within a tier."""
+    return (
+        (df_quality['Source'].str.contains('https', na=False)).astype(int) * 2 +
+        (df_quality['Company Website'].str.contains('https', na=False)).astype(int) * 2 +
+        (df_quality['Title'].str.contains(SENIOR_TITLE_PATTERN, case=False, na=False)).astype(int) +
+        (df_quality['Employment Verified'].str.lower().eq('yes')).astype(int) * 3 +
+        (
+            (df_quality['Candidate Email 1'].fillna('').str.strip() != '') &
+            (df_quality['Candidate Email 2'].fillna('').str.strip() != '')
+        ).astype(int) * 2
+    )
+
+
+def _offline_view(df: pd.DataFrame) -> pd.DataFrame:
+    """String view of the columns the tiers use, deriving emails if Task 4 has not run."""
+    cols = {}
+    for col in ['Source', 'Company Website', 'Title', 'Employment Verified']:
+        cols[col] = df[col].astype('string').fillna('') if col in df.columns else ''
+    if 'Candidate Email 1' in df.columns and 'Candidate Email 2' in df.columns:
+        cols['Candidate Email 1'] = df['Candidate Email 1'].astype('string')
+        cols['Candidate Email 2'] = df['Candidate Email 2'].astype('string')
+    else:
+        emails = [
+            candidate_emails(r.get('Name', ''), r.get('Company Website', ''), r.get('Company', ''))[1:3]
+            for _, r in df.iterrows()
+        ]
+        cols['Candidate Email 1'] = pd.Series([e1 or '' for e1, _ in emails], index=df.index, dtype='string')
+        cols['Candidate Email 2'] = pd.Series([e2 or '' for _, e2 in emails], index=df.index, dtype='string')
+    return pd.DataFrame(cols, index=df.index)
+
+
+def best_achievable_tier(df: pd.DataFrame) -> pd.Series:
+    """Tier each row reaches if website verification succeeds wherever it can.
+
+    3c can only verify rows that have a company website, so only those (and
+    rows already verified) are treated as verifiable. '' means the row can
+    never be selected (no candidate email).
+    """
+    v = _offline_view(df)
+    ev = v['Employment Verified'].str.lower().eq('yes') | (v['Company Website'].str.strip() != '')
+    email1 = v['Candidate Email 1'].fillna('').str.strip() != ''
+    email2 = v['Candidate Email 2'].fillna('').str.strip() != ''
+    website = v['Company Website'].str.strip() != ''
+    tier = pd.Series('', index=df.index, dtype=object)
+    # Same masks as the tiered selection in task5; the first match wins
+    for label, mask in reversed([
+        ('strict', ev & email1 & email2 & website),
+        ('A', ev & (email1 | email2) & website),
+        ('B', ev & (email1 | email2)),
+        ('C', ~ev & email1 & email2 & website),
+        ('fallback', email1 | email2),
+    ]):
+        tier[mask] = label
+    return tier
+
+
+class VerificationGoal:
+    """Goal-directed verification: which rows to crawl first, and when to stop.
+
+    Rows are ranked by best achievable tier, then by the optimistic quality
+    score (as if verified), then by input order. The goal is met once rows
+    verified into the strict/A tiers can fill the target list on their own.
+    Without a frame (streaming runs) rows are registered one at a time via
+    note_row() and only the stop rule applies.
+    """
+
+    def __init__(self, df: pd.DataFrame = None, target: int = TARGET_COUNT):
+        self.target = target
+        self.tier = {}
+        self.order = []
+        self.secured = 0
+        self.avoided = 0
+        self._lock = threading.Lock()
+        if df is None or df.empty:
+            return
+        tier = best_achievable_tier(df)
+        view = _offline_view(df)
+        optimistic = quality_score(view.assign(**{'Employment Verified': 'yes'}))
+        rank = pd.DataFrame({
+            'tier': tier.map(TIER_ORDER).fillna(len(TIER_ORDER)),
+            'score': -optimistic,
+            'order': df['Original Order'] if 'Original Order' in df.columns else range(len(df)),
+        }, index=df.index)
+        self.order = list(rank.sort_values(['tier', 'score', 'order'], kind='stable').index)
+        self.tier = tier.to_dict()
+        verified = view['Employment Verified'].str.lower().eq('yes')
+        self.secured = int((verified & tier.isin(['strict', 'A'])).sum())
+
+    def note_row(self, idx, row: pd.Series):
+        """Register one row (streaming form)."""
+        frame = pd.DataFrame([row], index=[idx])
+        tier = best_achievable_tier(frame)[idx]
+        verified = str(row.get('Employment Verified', '')).strip().lower() == 'yes'
+        with self._lock:
+            self.tier[idx] = tier
+            if verified and tier in ('strict', 'A'):
+                self.secured += 1
+
+    @property
+    def met(self) -> bool:
+        return self.secured >= self.target
+
+    def worth_verifying(self, idx) -> bool:
+        """Only rows that can reach strict/A help, and only until the goal is met."""
+        return not self.met and self.tier.get(idx) in ('strict', 'A')
+
+    def record_verified(self, idx):
+        with self._lock:
+            if self.tier.get(idx) in ('strict', 'A'):
+                self.secured += 1
+
+    def record_avoided(self):
+        with self._lock:
+            self.avoided += 1
+
+    def summary(self) -> str:
+        state = "met" if self.met else "not met"
+        return (f"goal {state}: {self.secured}/{self.target} strict/A rows verified, "
+                f"{self.avoided} crawl(s) avoided")
+
+
 # ----------------------------------------------------------------------------
 # TASK 5: QUALITY CHECK & FINAL OUTPUT
 # ----------------------------------------------------------------------------
@@ -34,7 +176,6 @@ def task5_quality_check(df: pd.DataFrame) -> pd.DataFrame:
     print(f"Loaded {len(df)} executives for quality check")
 
     quality_issues = []
-    TARGET_COUNT = 50
 
     required_columns = [
         'Name', 'Title', 'Company', 'Company Website',
@@ -44,7 +185,8 @@ def task5_quality_check(df: pd.DataFrame) -> pd.DataFrame:
     if missing_columns:
         quality_issues.append(f"Missing columns: {', '.join(missing_columns)}")
 
-    df_quality = df.copy()
+    # Shallow copy: under copy-on-write columns are shared until modified
+    df_quality = df.copy(deep=False)
 
     # Ensure verification columns exist
     for col in [
@@ -58,21 +200,7 @@ def task5_quality_check(df: pd.DataFrame) -> pd.DataFrame:
     # ------------------------------------------------------------------------
     # Quality scoring
     # ------------------------------------------------------------------------
-    senior_title_pattern = (
-        r'Chief|CEO|COO|CMO|CFO|CTO|CRO|CPO|'
-        r'President|SVP|EVP|Managing Director|Founder'
-    )
-
-    df_quality['_quality_score'] = (
-        (df_quality['Source'].str.contains('https', na=False)).astype(int) * 2 +
-        (df_quality['Company Website'].str.contains('https', na=False)).astype(int) * 2 +
-        (df_quality['Title'].str.contains(senior_title_pattern, case=False, na=False)).astype(int) +
-        (df_quality['Employment Verified'].str.lower().eq('yes')).astype(int) * 3 +
-        (
-            (df_quality['Candidate Email 1'].fillna('').str.strip() != '') &
-            (df_quality['Candidate Email 2'].fillna('').str.strip() != '')
-        ).astype(int) * 2
-    )
+    df_quality['_quality_score'] = quality_score(df_quality)
 
     # Normalized helpers
     ev_yes = df_quality['Employment Verified'].fillna('').str.lower().eq('yes')
@@ -113,8 +241,7 @@ def task5_quality_check(df: pd.DataFrame) -> pd.DataFrame:
     df_selected['Quality Tier'] = df_selected.index.map(tier_map)
 
     # Tier ordering (for internal use)
-    tier_order = {'strict': 0, 'A': 1, 'B': 2, 'C': 3, 'fallback': 4}
-    df_selected['_tier_rank'] = df_selected['Quality Tier'].map(tier_order)
+    df_selected['_tier_rank'] = df_selected['Quality Tier'].map(TIER_ORDER)
 
     # ------------------------------------------------------------------------
     # Email format validation
@@ -188,8 +315,7 @@ def task5_quality_check(df: pd.DataFrame) -> pd.DataFrame:
     FINAL_ALIAS = OUTPUT_DIR / "final.csv"
     QUALITY_REPORT = OUTPUT_DIR / "quality_report.txt"
 
-    df_final.to_csv(OUTPUT_CSV, index=False)
-    df_final.to_csv(FINAL_ALIAS, index=False)
+    save_artifact(df_final, OUTPUT_CSV, aliases=[FINAL_ALIAS], deliverable=True)
 
     with open(QUALITY_REPORT, "w") as f:
         f.write("QUALITY CHECK REPORT\n")
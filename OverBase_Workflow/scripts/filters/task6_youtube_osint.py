@@ -1,11 +1,20 @@
 from pathlib import Path
+import sys
 import pandas as pd
 import re
 import json
+import threading
 import time
 from datetime import datetime
 import requests
 
+# scripts/ on the path so this file can also be run directly (see __main__)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from filters.task5_quality_check import GOAL_DIRECTED
+from pipeline.artifacts import artifact_exists, read_artifact, save_artifact
+from pipeline.net import BREAKER, NetStats, header_bytes, is_host_failure
+from pipeline.schema import enable_copy_on_write
+
 script_dir = Path(__file__).parent
 scripts_dir = script_dir.parent
 PROJECT_ROOT = scripts_dir.parent.resolve()
@@ -14,6 +23,8 @@ LOGS_DIR = OUTPUT_DIR / "logs"
 for p in [OUTPUT_DIR, LOGS_DIR]:
     p.mkdir(parents=True, exist_ok=True)
 
+enable_copy_on_write()
+
 REQUEST_TIMEOUT = 5
 VERBOSE = True
 UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
@@ -23,6 +34,9 @@ SENIOR_ALLOW = (
 )
 SENIOR_DROP = ("manager", "director", "analyst", "consultant")
 
+OSINT_TARGET = 15
+OSINT_MIN_CONFIDENCE = 60
+
 
 def _norm_tokens(s: str):
     s = str(s or "").lower()
@@ -36,13 +50,24 @@ def _is_senior_title(title: str) -> bool:
     return any(k in t for k in SENIOR_ALLOW)
 
 
-def _http_get(url: str):
+def _http_get(url: str, stats=None):
+    # Fails fast while the host keeps refusing connections or timing out
+    if not BREAKER.allow(url, stats):
+        return None
+    started = time.perf_counter()
     try:
         resp = requests.get(url, headers={"User-Agent": UA}, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-        if resp.status_code == 200 and resp.text:
-            return resp
-    except Exception:
+    except Exception as e:
+        if is_host_failure(e):
+            BREAKER.record(url, time.perf_counter() - started, True)
+        if stats is not None:
+            stats.request(time.perf_counter() - started)
         return None
+    BREAKER.record(url, time.perf_counter() - started, False)
+    if stats is not None:
+        stats.request(time.perf_counter() - started, nbytes=header_bytes(resp) + len(resp.content))
+    if resp.status_code == 200 and resp.text:
+        return resp
     return None
 
 
@@ -110,8 +135,84 @@ def _score_osint(name: str, title: str, company: str, page_title: str, descripti
     return score, ev
 
 
+OSINT_COLUMNS = ["OSINT Verification Source", "OSINT Evidence", "OSINT Confidence", "OSINT Video Published"]
+
+
+class OsintGoal:
+    """Goal-directed YouTube scoring: stop once the top-15 OSINT list is filled.
+
+    Only rows that can never be website-verified (no company website) count
+    towards the goal, since the scoring may run before 3c has finished; those
+    rows are scored first.
+    """
+
+    def __init__(self, target: int = OSINT_TARGET):
+        self.target = target
+        self.companies = set()
+        self.avoided = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def certain(row) -> bool:
+        site = row.get("Company Website", "")
+        return pd.isna(site) or not str(site).strip()
+
+    @staticmethod
+    def priority(df: pd.DataFrame) -> list:
+        certain = [OsintGoal.certain(row) for _, row in df.iterrows()]
+        return ([idx for idx, c in zip(df.index, certain) if c] +
+                [idx for idx, c in zip(df.index, certain) if not c])
+
+    @property
+    def met(self) -> bool:
+        return len(self.companies) >= self.target
+
+    def skip(self, row) -> bool:
+        """True if the goal is met; counts the fetch that is avoided."""
+        if not self.met:
+            return False
+        if _would_fetch(row):
+            with self._lock:
+                self.avoided += 1
+        return True
+
+    def record(self, row, values: dict):
+        if (self.certain(row) and values.get("OSINT Verification Source") == "YouTube"
+                and values.get("OSINT Confidence", 0) >= OSINT_MIN_CONFIDENCE):
+            with self._lock:
+                self.companies.add(str(row.get("Company", " ")).strip().lower())
+
+    def summary(self) -> str:
+        state = "met" if self.met else "not met"
+        return (f"goal {state}: {len(self.companies)}/{self.target} companies with YouTube evidence, "
+                f"{self.avoided} fetch(es) avoided")
+
+
 def task6_youtube_osint(df: pd.DataFrame) -> pd.DataFrame:
-    df_out = df.copy()
+    df_out = task6_youtube_scores(df)
+    return task6_save_osint(df_out)
+
+
+def mark_website_verified(df_out: pd.DataFrame) -> pd.DataFrame:
+    """Website-verified rows take precedence over any YouTube evidence."""
+    verified = df_out["Employment Verified"].astype(str).str.strip().str.lower() == "yes"
+    if verified.any():
+        df_out.loc[verified, "OSINT Confidence"] = 100
+        df_out.loc[verified, "OSINT Verification Source"] = "Website"
+        df_out.loc[verified, "OSINT Evidence"] = "Already website-verified"
+        df_out.loc[verified, "OSINT Video Published"] = ""
+    return df_out
+
+
+def task6_youtube_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """Score each row's YouTube evidence; only needs Name, Title, Company and the URL.
+
+    Rows already marked website-verified are not fetched. When run before 3c
+    (no verification yet) every senior row is scored and the website result is
+    applied afterwards with mark_website_verified.
+    """
+    # Shallow copy: under copy-on-write columns are shared until modified
+    df_out = df.copy(deep=False)
     if "Youtube URL" not in df_out.columns:
         src = PROJECT_ROOT / "data" / "cmo_videos_names.csv"
         if src.exists():
@@ -128,40 +229,115 @@ def task6_youtube_osint(df: pd.DataFrame) -> pd.DataFrame:
     df_out["OSINT Confidence"] = 0
     df_out["OSINT Video Published"] = ""
     total = len(df_out)
-    for idx, row in df_out.iterrows():
-        name = str(row.get("Name",""))
-        title = str(row.get("Title",""))
-        company = str(row.get("Company",""))
-        verified = str(row.get("Employment Verified",""))
-        yt = str(row.get("Youtube URL",""))
-        if VERBOSE:
-            print(f"OSINT [{idx+1}/{total}] {name or '(no name)'} | verified={verified}")
-        if verified.strip().lower() == "yes":
-            df_out.at[idx, "OSINT Confidence"] = 100
-            df_out.at[idx, "OSINT Verification Source"] = "Website"
-            df_out.at[idx, "OSINT Evidence"] = "Already website-verified"
-            continue
-        if not _is_senior_title(title):
+    goal = OsintGoal() if GOAL_DIRECTED else None
+    stats = NetStats("task6")
+    order = OsintGoal.priority(df_out) if goal is not None else df_out.index
+    for idx in order:
+        row = df_out.loc[idx]
+        if goal is not None and goal.skip(row):
             continue
-        if not yt or not yt.startswith("http"):
-            continue
-        resp = _http_get(yt)
-        if not resp:
-            continue
-        page_title, description, published = _parse_youtube(resp.text)
-        score, ev = _score_osint(name, title, company, page_title or "", description or "")
-        df_out.at[idx, "OSINT Verification Source"] = "YouTube"
-        df_out.at[idx, "OSINT Evidence"] = ev
-        df_out.at[idx, "OSINT Confidence"] = score
-        if published:
-            try:
-                dt = datetime.fromisoformat(published.replace("Z",""))
-                df_out.at[idx, "OSINT Video Published"] = dt.date().isoformat()
-            except Exception:
-                df_out.at[idx, "OSINT Video Published"] = published
-        time.sleep(0.2)
+        values = _score_row(row, f"{idx+1}/{total}", stats)
+        if goal is not None:
+            goal.record(row, values)
+        for col, value in values.items():
+            df_out.at[idx, col] = value
+    stats.report()
+    if goal is not None:
+        _goal_summary(goal)
+    return df_out
+
+
+def _goal_summary(goal):
+    if VERBOSE:
+        print(f"ⓘ OSINT goal-directed: {goal.summary()}")
+    with open(LOGS_DIR / "workflow.log", "a") as f:
+        f.write(f"[task6_youtube_osint] Goal-directed scoring: {goal.summary()}\n")
+
+
+def _would_fetch(row) -> bool:
+    """True if _score_row would fetch the row's video page."""
+    yt = str(row.get("Youtube URL", ""))
+    return (str(row.get("Employment Verified", "")).strip().lower() != "yes"
+            and _is_senior_title(str(row.get("Title", ""))) and yt.startswith("http"))
+
+
+def _score_row(row, label: str, stats=None) -> dict:
+    """OSINT column values for one row (empty to keep the defaults)."""
+    name = str(row.get("Name",""))
+    title = str(row.get("Title",""))
+    company = str(row.get("Company",""))
+    verified = str(row.get("Employment Verified",""))
+    yt = str(row.get("Youtube URL",""))
+    if VERBOSE:
+        print(f"OSINT [{label}] {name or '(no name)'} | verified={verified}")
+    if verified.strip().lower() == "yes":
+        return {
+            "OSINT Confidence": 100,
+            "OSINT Verification Source": "Website",
+            "OSINT Evidence": "Already website-verified",
+        }
+    if not _is_senior_title(title):
+        return {}
+    if not yt or not yt.startswith("http"):
+        return {}
+    started = time.perf_counter()
+    resp = _http_get(yt, stats)
+    if stats is not None:
+        stats.row(time.perf_counter() - started)
+    if not resp:
+        return {}
+    page_title, description, published = _parse_youtube(resp.text)
+    score, ev = _score_osint(name, title, company, page_title or "", description or "")
+    values = {"OSINT Verification Source": "YouTube", "OSINT Evidence": ev, "OSINT Confidence": score}
+    if published:
+        try:
+            dt = datetime.fromisoformat(published.replace("Z",""))
+            values["OSINT Video Published"] = dt.date().isoformat()
+        except Exception:
+            values["OSINT Video Published"] = published
+    time.sleep(0.2)
+    return values
+
+
+def task6_row_stream(total):
+    """Per-row form of the YouTube scoring for streaming runs: (row_fn, finish).
+
+    Rows arrive in input order, so goal-directed mode only applies the stop rule.
+    """
+    if VERBOSE:
+        print("OSINT: starting YouTube confidence scoring")
+    goal = OsintGoal() if GOAL_DIRECTED else None
+    stats = NetStats("task6")
+
+    def score_row(row):
+        if "Employment Verified" not in row.index:
+            row["Employment Verified"] = ""
+        row["OSINT Verification Source"] = ""
+        row["OSINT Evidence"] = ""
+        row["OSINT Confidence"] = 0
+        row["OSINT Video Published"] = ""
+        if goal is not None and goal.skip(row):
+            return row
+        values = _score_row(row, f"{row.name+1}/{total}", stats)
+        if goal is not None:
+            goal.record(row, values)
+        for col, value in values.items():
+            row[col] = value
+        return row
+
+    def finish(df_out):
+        stats.report()
+        if goal is not None:
+            _goal_summary(goal)
+        return df_out
+
+    return score_row, finish
+
+
+def task6_save_osint(df_out: pd.DataFrame) -> pd.DataFrame:
+    """Write the scored list and the top-15 OSINT picks (one per company)."""
     scored_csv = OUTPUT_DIR / "step6_osint_scored.csv"
-    df_out.to_csv(scored_csv, index=False)
+    scored_csv = save_artifact(df_out, scored_csv)
     elig = df_out[(df_out["Employment Verified"].astype(str).str.lower() != "yes") & (df_out["OSINT Confidence"] >= 60) & (df_out["OSINT Verification Source"] == "YouTube")]
     elig = elig.copy()
     def _sort_key(row):
@@ -181,7 +357,7 @@ def task6_youtube_osint(df: pd.DataFrame) -> pd.DataFrame:
             break
     top15 = pd.DataFrame(picks)
     top15_csv = OUTPUT_DIR / "step6_osint_top15.csv"
-    top15.to_csv(top15_csv, index=False)
+    top15_csv = save_artifact(top15, top15_csv)
     if VERBOSE:
         print(f"OSINT: wrote {scored_csv} and {top15_csv}")
     return df_out
@@ -189,8 +365,8 @@ def task6_youtube_osint(df: pd.DataFrame) -> pd.DataFrame:
 
 if __name__ == "__main__":
     path = OUTPUT_DIR / "senior_execs_with_emails.csv"
-    if path.exists():
-        df0 = pd.read_csv(path)
+    if artifact_exists(path):
+        df0 = read_artifact(path)
         task6_youtube_osint(df0)
         print("Done")
     else:
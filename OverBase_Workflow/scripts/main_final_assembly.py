@@ -1,47 +1,25 @@
 #!/usr/bin/env python3
+"""Thin view over the pipeline graph: --only final_assembly
+
+Extra flags (--force, --list, or a different --from/--to/--only) are passed
+through to the runner; see pipeline/stages.py for the stage names.
+"""
 from pathlib import Path
 import sys
-import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent))
-from filters.task4_generate_emails import task4_generate_emails as t4
-
+from pipeline.runner import run_cli
+from pipeline.stages import build_pipeline
 
-def main() -> int:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.resolve()
-    outputs = project_root / "outputs"
+SELECTION = ['--only', 'final_assembly']
 
-    web_verified_csv = outputs / 'senior_execs_web_verified.csv'
-    osint_top15_csv = outputs / 'step6_osint_top15.csv'
 
-    if not web_verified_csv.exists() or not osint_top15_csv.exists():
-        print(f"❌ Missing inputs: ensure both {web_verified_csv.name} and {osint_top15_csv.name} exist.")
-        print("Run web verification (main_task3b3c_web_verify.py) and OSINT (main_task6_osint_youtube.py) first.")
+def main(argv=None) -> int:
+    try:
+        run_cli(build_pipeline(), [], SELECTION + list(sys.argv[1:] if argv is None else argv))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         return 1
-
-    df_web = pd.read_csv(web_verified_csv)
-    df_osint = pd.read_csv(osint_top15_csv)
-
-    # Combine, prioritize web-verified, and select top 50 unique execs
-    df_web['VerificationSource'] = 'Website'
-    df_osint['VerificationSource'] = 'OSINT'
-
-    df_combined = pd.concat([df_web, df_osint], ignore_index=True)
-    df_combined.drop_duplicates(subset=['Name', 'Company'], keep='first', inplace=True)
-    df_top50 = df_combined.head(50).copy()
-
-    print(f"✓ Assembled a top {len(df_top50)} list from web-verified and OSINT sources.")
-
-    # Generate emails for the final list
-    df_final = t4(df_top50)
-
-    # Save the final deliverable with a clear name
-    final_csv = outputs / 'final_top50_execs_with_emails.csv'
-    df_final.to_csv(final_csv, index=False)
-
-    print(f"\n✓ Final deliverable created: {final_csv}")
-    print("This file contains the top 50 senior executives with 2 likely email addresses.")
     return 0
 
 
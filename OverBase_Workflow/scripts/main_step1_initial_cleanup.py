@@ -1,33 +1,26 @@
 #!/usr/bin/env python3
+"""Thin view over the pipeline graph: --only load
+
+Extra flags (--force, --list, or a different --from/--to/--only) are passed
+through to the runner; see pipeline/stages.py for the stage names.
+"""
 from pathlib import Path
 import sys
-import pandas as pd
 
-# Ensure imports from scripts package
 sys.path.insert(0, str(Path(__file__).parent))
-from initial_cleanup.initial_cleanup import load_and_clean_data
+from pipeline.runner import run_cli
+from pipeline.stages import build_pipeline
 
+SELECTION = ['--only', 'load']
 
-def main() -> int:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.resolve()
-    data_csv = project_root / "data" / "cmo_videos_names.csv"
-    outputs = project_root / "outputs"
-    outputs.mkdir(parents=True, exist_ok=True)
 
-    if not data_csv.exists():
-        print(f"❌ Missing input: {data_csv}")
+def main(argv=None) -> int:
+    try:
+        run_cli(build_pipeline(), [], SELECTION + list(sys.argv[1:] if argv is None else argv))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         return 1
-
-    df = load_and_clean_data(data_csv)
-
-    # Preserve original input order for downstream steps
-    if 'Original Order' not in df.columns:
-        df.insert(0, 'Original Order', range(len(df)))
-
-    out_csv = outputs / "final_cleaned_data.csv"
-    df.to_csv(out_csv, index=False)
-    print(f"✓ Wrote {out_csv} with {len(df)} rows")
+    print("✓ Step 1 completed (outputs/final_cleaned_data.csv)")
     return 0
 
 
@@ -1,26 +1,28 @@
 #!/usr/bin/env python3
+"""Thin view over the pipeline graph: --from task1 --to task2
+
+Extra flags (--force, --list, or a different --from/--to/--only) are passed
+through to the runner; see pipeline/stages.py for the stage names.
+"""
 from pathlib import Path
 import sys
-import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent))
-from filters.task1_filter_senior_execs import task1_filter_senior_execs as t1
-from filters.task2_remove_duplicates import task2_remove_duplicates as t2
+from pipeline.runner import run_cli
+from pipeline.stages import build_pipeline
+
+SELECTION = ['--from', 'task1', '--to', 'task2']
 
 
-def main() -> int:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.resolve()
-    input_csv = project_root / 'outputs' / 'final_cleaned_data.csv'
-    if not input_csv.exists():
-        print(f"❌ Missing input: {input_csv}. Run step 1 first.")
+def main(argv=None) -> int:
+    try:
+        run_cli(build_pipeline(), [], SELECTION + list(sys.argv[1:] if argv is None else argv))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         return 1
-    df = pd.read_csv(input_csv)
-    df = t1(df)  # writes outputs/senior_execs_only.csv
-    df = t2(df)  # writes outputs/senior_execs_no_duplicates.csv
     print('✓ Task 1+2 completed (outputs/senior_execs_no_duplicates.csv)')
     return 0
 
 
-if __name__ == '__main__':
+if __name__ == "__main__":
     raise SystemExit(main())
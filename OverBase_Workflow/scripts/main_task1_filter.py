@@ -1,22 +1,28 @@
 #!/usr/bin/env python3
+"""Thin view over the pipeline graph: --only task1
+
+Extra flags (--force, --list, or a different --from/--to/--only) are passed
+through to the runner; see pipeline/stages.py for the stage names.
+"""
 from pathlib import Path
 import sys
-import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent))
-from filters.task1_filter_senior_execs import task1_filter_senior_execs as t1
+from pipeline.runner import run_cli
+from pipeline.stages import build_pipeline
+
+SELECTION = ['--only', 'task1']
 
-def main() -> int:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.resolve()
-    inputs = project_root / "outputs" / "final_cleaned_data.csv"
-    if not inputs.exists():
-        print(f"❌ Missing input: {inputs}. Run step 1 first.")
+
+def main(argv=None) -> int:
+    try:
+        run_cli(build_pipeline(), [], SELECTION + list(sys.argv[1:] if argv is None else argv))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         return 1
-    df = pd.read_csv(inputs)
-    t1(df)  # writes outputs/senior_execs_only.csv
     print("✓ Task 1 completed (outputs/senior_execs_only.csv)")
     return 0
 
+
 if __name__ == "__main__":
     raise SystemExit(main())
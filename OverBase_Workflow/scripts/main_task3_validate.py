@@ -1,22 +1,28 @@
 #!/usr/bin/env python3
+"""Thin view over the pipeline graph: --only task3
+
+Extra flags (--force, --list, or a different --from/--to/--only) are passed
+through to the runner; see pipeline/stages.py for the stage names.
+"""
 from pathlib import Path
 import sys
-import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent))
-from filters.task3_validate_companies import task3_validate_companies as t3
+from pipeline.runner import run_cli
+from pipeline.stages import build_pipeline
+
+SELECTION = ['--only', 'task3']
 
-def main() -> int:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.resolve()
-    inputs = project_root / "outputs" / "senior_execs_no_duplicates.csv"
-    if not inputs.exists():
-        print(f"❌ Missing input: {inputs}. Run task 2 first.")
+
+def main(argv=None) -> int:
+    try:
+        run_cli(build_pipeline(), [], SELECTION + list(sys.argv[1:] if argv is None else argv))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         return 1
-    df = pd.read_csv(inputs)
-    t3(df)  # writes outputs/step3_domains.csv and outputs/senior_execs_validated.csv
     print("✓ Task 3 completed (outputs/step3_domains.csv, outputs/senior_execs_validated.csv)")
     return 0
 
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,52 +1,25 @@
 #!/usr/bin/env python3
+"""Thin view over the pipeline graph: --from task3b --to osint_separate
+
+Extra flags (--force, --list, or a different --from/--to/--only) are passed
+through to the runner; see pipeline/stages.py for the stage names.
+"""
 from pathlib import Path
 import sys
-import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent))
-from filters.task3b_verify_employment import task3b_verify_employment as t3b
-from filters.task3c_verify_employment_webscrape import task3c_verify_employment_webscrape as t3c
-from filters.task4_generate_emails import task4_generate_emails as t4
-from filters.task6_youtube_osint import task6_youtube_osint as t6
-
-
-def main() -> int:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.resolve()
-    outputs = project_root / "outputs"
-    inputs = outputs / "senior_execs_validated.csv"
-    if not inputs.exists():
-        print(f"❌ Missing input: {inputs}. Run task 3 first.")
-        return 1
-
-    # 3B
-    df = pd.read_csv(inputs)
-    df = t3b(df)
+from pipeline.runner import run_cli
+from pipeline.stages import build_pipeline
 
-    # 3C (web scrape; honors OVERBASE_SCRAPE_MODE)
-    df = t3c(df)
+SELECTION = ['--from', 'task3b', '--to', 'osint_separate']
 
-    # Task 4 (emails)
-    df = t4(df)
 
-    # YouTube OSINT scoring
-    t6(df)
-
-    # Separate outputs (no combine)
-    df_emails = pd.read_csv(outputs / 'senior_execs_with_emails.csv')
-
-    web = df_emails[df_emails['Employment Verified'].astype(str).str.lower()=='yes'].copy()
-    if not web.empty:
-        web['Web Confidence'] = '100%'
-    web_out = outputs / 'final_web_verified.csv'
-    web.to_csv(web_out, index=False)
-
-    os_top15_src = outputs / 'step6_osint_top15.csv'
-    os_top15 = pd.read_csv(os_top15_src) if os_top15_src.exists() else pd.DataFrame()
-    os_out = outputs / 'final_osint_top15.csv'
-    os_top15.to_csv(os_out, index=False)
-
-    print(f"✓ Wrote {web_out} ({len(web)} rows) and {os_out} ({len(os_top15)} rows)")
+def main(argv=None) -> int:
+    try:
+        run_cli(build_pipeline(), [], SELECTION + list(sys.argv[1:] if argv is None else argv))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
     return 0
 
 
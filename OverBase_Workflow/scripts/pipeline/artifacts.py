@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Pipeline artifacts - write each stage output once, in the background.
+
+save_artifact() snapshots the frame (a shallow copy: stages run under
+copy-on-write, so later edits do not reach it) and hands it to a single
+writer thread, so the next stage starts while the file is written. The
+file is written once to a temporary name and moved into place. Legacy
+duplicate names (step1_senior.csv next to senior_execs_only.csv, ...) are
+hardlinks to it, or copies where the filesystem cannot link.
+
+OVERBASE_ARTIFACT_FORMAT selects the format of the intermediate artifacts:
+csv (default), csv.gz or parquet (needs pyarrow; falls back to csv). The
+deliverables (final_*.csv, the email pattern log) are always plain CSV.
+Artifact paths are given with their .csv name; artifact_path() maps them to
+the file actually written, and read_artifact() waits for a pending write
+before loading it. Pending writes are flushed at the end of a run and at
+exit.
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from pipeline.schema import log
+
+FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+ARTIFACT_FORMAT = os.getenv("OVERBASE_ARTIFACT_FORMAT", "csv").lower()
+if ARTIFACT_FORMAT not in FORMATS:
+    raise ValueError(f"OVERBASE_ARTIFACT_FORMAT must be one of {', '.join(FORMATS)}, got '{ARTIFACT_FORMAT}'")
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+if ARTIFACT_FORMAT == "parquet" and not _parquet_available():
+    print("⚠ OVERBASE_ARTIFACT_FORMAT=parquet needs pyarrow; writing csv instead")
+    ARTIFACT_FORMAT = "csv"
+
+
+def _stem(path: Path):
+    name = Path(path).name
+    for suffix in sorted(FORMATS.values(), key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+def artifact_path(path, fmt: str = None) -> Path:
+    """The file an artifact named like path is written to in format fmt (other files as is)."""
+    path = Path(path)
+    stem = _stem(path)
+    return path if stem is None else path.with_name(stem + FORMATS[fmt or ARTIFACT_FORMAT])
+
+
+class ArtifactWriter:
+    """Single background thread writing queued frames in submission order."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._errors = []
+        self._thread = None
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, df: pd.DataFrame, target: Path, aliases: list, fmt: str):
+        with self._cond:
+            for p in [target] + aliases:
+                self._pending[p] = self._pending.get(p, 0) + 1
+            self._start()
+        self._queue.put((df, target, aliases, fmt))
+
+    def pending(self, path: Path) -> bool:
+        with self._cond:
+            return self._pending.get(Path(path), 0) > 0
+
+    def _run(self):
+        while True:
+            df, target, aliases, fmt = self._queue.get()
+            try:
+                _write(df, target, aliases, fmt)
+            except Exception as e:
+                self._errors.append((target, e))
+            finally:
+                with self._cond:
+                    for p in [target] + aliases:
+                        self._pending[p] -= 1
+                        if not self._pending[p]:
+                            del self._pending[p]
+                    self._cond.notify_all()
+                self._queue.task_done()
+
+    def wait(self, path: Path = None):
+        """Block until path (or every queued artifact) is on disk."""
+        with self._cond:
+            self._cond.wait_for(lambda: not (self._pending.get(Path(path), 0) if path else self._pending))
+        self._raise()
+
+    def _raise(self):
+        if self._errors:
+            target, exc = self._errors.pop(0)
+            raise RuntimeError(f"Writing artifact {target} failed: {exc}") from exc
+
+
+_writer = ArtifactWriter()
+
+
+def _write(df: pd.DataFrame, target: Path, aliases: list, fmt: str):
+    started = time.time()
+    tmp = target.with_name(f".{target.name}.tmp")
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    elif fmt == "csv.gz":
+        df.to_csv(tmp, index=False, compression="gzip")
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, target)
+    for alias in aliases:
+        if alias.exists() or alias.is_symlink():
+            alias.unlink()
+        try:
+            os.link(target, alias)
+        except OSError:
+            shutil.copyfile(target, alias)
+    # A format switch must not leave a stale copy in the old format behind
+    for path in [target] + aliases:
+        for other in FORMATS:
+            stale = artifact_path(path, other)
+            if stale != path and stale.exists():
+                stale.unlink()
+    names = ", ".join(p.name for p in aliases)
+    log(f"artifact {target.name} ({fmt}) written in {time.time()-started:.2f}s"
+        + (f"; linked {names}" if names else ""))
+
+
+def save_artifact(df: pd.DataFrame, path, aliases=(), deliverable: bool = False) -> Path:
+    """Queue df to be written once to path (+ legacy alias names); returns the target file.
+
+    Deliverables are always plain CSV; other artifacts use OVERBASE_ARTIFACT_FORMAT.
+    """
+    fmt = "csv" if deliverable else ARTIFACT_FORMAT
+    target = artifact_path(path, fmt)
+    alias_paths = [artifact_path(a, fmt) for a in aliases]
+    target.parent.mkdir(parents=True, exist_ok=True)
+    _writer.submit(df.copy(deep=False), target, alias_paths, fmt)
+    return target
+
+
+def _existing(path) -> Path:
+    """The configured-format file for path, else any other format present."""
+    for fmt in [ARTIFACT_FORMAT] + [f for f in FORMATS if f != ARTIFACT_FORMAT]:
+        candidate = artifact_path(path, fmt)
+        if _writer.pending(candidate) or candidate.exists():
+            return candidate
+    return None
+
+
+def artifact_exists(path) -> bool:
+    """True if the artifact is on disk or queued to be written."""
+    return _existing(path) is not None
+
+
+def read_artifact(path) -> pd.DataFrame:
+    """Load an artifact in whichever format it was written, waiting for a pending write."""
+    found = _existing(path)
+    if found is None:
+        raise FileNotFoundError(f"No artifact for {path}")
+    _writer.wait(found)
+    if found.suffix == ".parquet":
+        return pd.read_parquet(found)
+    return pd.read_csv(found)
+
+
+def flush_artifacts():
+    """Wait for every queued artifact to be written (raises if a write failed)."""
+    _writer.wait()
+
+
+atexit.register(flush_artifacts)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pipeline bandit - order crawl candidates by how often similar ones paid off.
+
+An arm is a (kind, key) pair such as ('path', '/leadership') or
+('anchor', 'team'), with tries and hits counted per domain and globally
+(scope '*'). order() ranks candidates by a UCB1 score: the arm's hit rate
+on the domain, estimated with its overall hit rate as the prior (worth
+DOMAIN_PRIOR tries), plus an exploration bonus that shrinks as the arm is
+tried. Arms that paid off come first, while rarely tried ones still get
+probed.
+Candidates with equal scores keep their given order, so without history the
+static order is kept.
+
+Scores come from the counts the arms were loaded with. Outcomes recorded
+during a run are collected separately (deltas()) and only affect the next
+run, so a run's ordering does not depend on which worker finished first.
+"""
+
+import math
+import threading
+
+GLOBAL = "*"
+PRIOR_HITS = 1.0       # prior hit rate of an unseen arm: PRIOR_HITS / PRIOR_TRIES
+PRIOR_TRIES = 10.0
+DOMAIN_PRIOR = 2.0     # tries on a domain that outweigh the arm's overall hit rate
+EXPLORE = 0.05         # weight of the UCB exploration bonus
+
+
+class ArmStats:
+    """Tries/hits per (scope, kind, key); thread-safe."""
+
+    def __init__(self, counts: dict = None):
+        self._counts = dict(counts or {})    # (scope, kind, key) -> (tries, hits), as loaded
+        self._totals = {}     # kind -> tries of all arms of that kind, overall
+        for (scope, kind, _), (tries, _) in self._counts.items():
+            if scope == GLOBAL:
+                self._totals[kind] = self._totals.get(kind, 0) + tries
+        self._delta = {}
+        self._lock = threading.Lock()
+
+    def record(self, scope: str, kind: str, key: str, tries: int = 1, hits: int = 0):
+        """Count tries and/or hits of an arm in scope (and globally)."""
+        with self._lock:
+            for s in (scope, GLOBAL):
+                t, h = self._delta.get((s, kind, key), (0, 0))
+                self._delta[(s, kind, key)] = (t + tries, h + hits)
+
+    def deltas(self) -> dict:
+        """Outcomes recorded since loading: {(scope, kind, key): (tries, hits)}."""
+        with self._lock:
+            return dict(self._delta)
+
+    def score(self, scope: str, kind: str, key: str) -> float:
+        g_tries, g_hits = self._counts.get((GLOBAL, kind, key), (0, 0))
+        d_tries, d_hits = self._counts.get((scope, kind, key), (0, 0)) if scope != GLOBAL else (0, 0)
+        overall = (g_hits + PRIOR_HITS) / (g_tries + PRIOR_TRIES)
+        rate = (d_hits + DOMAIN_PRIOR * overall) / (d_tries + DOMAIN_PRIOR)
+        total = self._totals.get(kind, 0)
+        return rate + EXPLORE * math.sqrt(math.log(total + 1) / (g_tries + 1))
+
+    def order(self, items: list, arms, scope: str) -> list:
+        """items sorted best first; arms(item) gives its [(kind, key), ...] (score averaged)."""
+        if not self._counts:
+            return list(items)
+
+        def item_score(item):
+            keys = arms(item)
+            return sum(self.score(scope, kind, key) for kind, key in keys) / len(keys) if keys else 0.0
+
+        scored = [(-item_score(item), n, item) for n, item in enumerate(items)]
+        return [item for _, _, item in sorted(scored, key=lambda t: (t[0], t[1]))]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Pipeline DNS cache - bulk hostname pre-resolution before HTTP validation.
+
+A network stage hands every URL it may request to prefetch(), which resolves
+their hostnames concurrently on an asyncio loop and keeps the answers in an
+in-process cache. resolves(url) then answers from the cache (resolving on
+demand for hosts it has not seen), and the stage drops candidates whose host
+does not exist (NXDOMAIN / no address) without making an HTTP request. Hosts
+that could not be checked (temporary failures, timeouts) count as
+resolvable, so the HTTP request still decides for them.
+
+The resolver is pluggable: any callable host -> True (resolves), False (does
+not exist) or None (unknown), plain or async. The default calls
+getaddrinfo. OVERBASE_DNS_PREFETCH=0 turns the check off;
+OVERBASE_DNS_CONCURRENCY (default 64) bounds the lookups in flight.
+"""
+
+import asyncio
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline.schema import log
+
+DNS_PREFETCH = os.getenv("OVERBASE_DNS_PREFETCH", "1").lower() in ("1", "true", "yes")
+DNS_CONCURRENCY = int(os.getenv("OVERBASE_DNS_CONCURRENCY", "64"))
+DNS_TIMEOUT = 5.0     # seconds per lookup before it counts as unknown
+DNS_TTL = 300.0       # seconds an answer is reused within a run
+
+# getaddrinfo errors meaning the name does not exist (EAI_NODATA is not on every platform)
+_MISSING = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+
+
+def hostname(url: str) -> str:
+    """Hostname of a URL (or of a bare host name), lowercase."""
+    url = str(url).strip()
+    if "//" not in url:
+        url = "//" + url
+    return (urllib.parse.urlparse(url).hostname or "").lower()
+
+
+def system_resolver(host: str):
+    """getaddrinfo: True if host has an address, False if it does not exist, None if unknown."""
+    try:
+        return bool(socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM))
+    except socket.gaierror as e:
+        return False if e.errno in _MISSING else None
+    except (OSError, UnicodeError):
+        return None
+
+
+class DnsCache:
+    """Thread-safe host → resolvable cache filled in bulk by prefetch()."""
+
+    def __init__(self, resolver=system_resolver, concurrency: int = DNS_CONCURRENCY,
+                 timeout: float = DNS_TIMEOUT, ttl: float = DNS_TTL, enabled: bool = DNS_PREFETCH):
+        self.resolver = resolver
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.enabled = enabled
+        self._answers = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, host: str):
+        """(hit, answer) for host."""
+        with self._lock:
+            entry = self._answers.get(host)
+        if entry is None or time.monotonic() - entry[1] >= self.ttl:
+            return False, None
+        return True, entry[0]
+
+    def _store(self, host: str, answer):
+        with self._lock:
+            self._answers[host] = (answer, time.monotonic())
+
+    async def _resolve_all(self, hosts: list) -> dict:
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self.concurrency)
+        is_async = asyncio.iscoroutinefunction(self.resolver)
+
+        async def one(host):
+            async with limit:
+                lookup = (self.resolver(host) if is_async
+                          else loop.run_in_executor(None, self.resolver, host))
+                try:
+                    return host, await asyncio.wait_for(lookup, self.timeout)
+                except Exception:
+                    return host, None
+
+        if not is_async:
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency,
+                                                         thread_name_prefix="dns"))
+        return dict(await asyncio.gather(*(one(h) for h in hosts)))
+
+    def prefetch(self, urls, label: str = "") -> dict:
+        """Resolve the hosts of urls concurrently; returns counts of up/missing/unknown hosts."""
+        hosts = sorted({h for h in map(hostname, urls) if h} if self.enabled else ())
+        hosts = [h for h in hosts if not self._cached(h)[0]]
+        counts = {"up": 0, "missing": 0, "unknown": 0}
+        if not hosts:
+            return counts
+        started = time.perf_counter()
+        answers = asyncio.run(self._resolve_all(hosts))
+        for host, answer in answers.items():
+            self._store(host, answer)
+            counts["up" if answer else "unknown" if answer is None else "missing"] += 1
+        took = time.perf_counter() - started
+        msg = (f"resolved {len(hosts)} hosts in {took:.1f}s: {counts['up']} up, "
+               f"{counts['missing']} missing, {counts['unknown']} unknown")
+        print(f"ⓘ DNS{f' [{label}]' if label else ''}: {msg}")
+        log(f"dns {label}: {msg}")
+        return counts
+
+    def resolves(self, url: str) -> bool:
+        """False only if url's host is known not to exist."""
+        if not self.enabled:
+            return True
+        host = hostname(url)
+        if not host:
+            return True
+        hit, answer = self._cached(host)
+        if not hit:
+            try:
+                if asyncio.iscoroutinefunction(self.resolver):
+                    answer = asyncio.run(asyncio.wait_for(self.resolver(host), self.timeout))
+                else:
+                    answer = self.resolver(host)
+            except Exception:
+                answer = None
+            self._store(host, answer)
+        return answer is not False
+
+
+# One cache per process, shared by the network stages
+DNS = DnsCache()
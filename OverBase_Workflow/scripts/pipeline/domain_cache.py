@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Pipeline domain cache - persistent website-validation results shared across runs.
+
+Task 3 asks the cache before validating a candidate URL. Each entry is keyed
+by the candidate URL and holds whether it answered 200, the final URL after
+redirects, the HTTP status and when it was checked. Only definitive answers
+are stored (200 or a client error); timeouts, connection errors and server
+errors are retried on the next run. Positive answers are reused for OVERBASE_DOMAIN_TTL_DAYS (default 7)
+and negative ones for OVERBASE_DOMAIN_NEG_TTL_HOURS (default 24). Set
+OVERBASE_DOMAIN_CACHE=0 to always go to the network.
+
+Usage:
+    python scripts/pipeline/domain_cache.py inspect [--url TEXT] [--limit N]
+    python scripts/pipeline/domain_cache.py purge --expired | --negative | --url TEXT | --all
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# scripts/ on the path so this file can also be run directly (see __main__)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pipeline.schema import OUTPUT_DIR, log
+
+DOMAIN_CACHE_PATH = OUTPUT_DIR / "cache" / "domains.sqlite"
+DOMAIN_CACHE = os.getenv("OVERBASE_DOMAIN_CACHE", "1").lower() in ("1", "true", "yes")
+POSITIVE_TTL = float(os.getenv("OVERBASE_DOMAIN_TTL_DAYS", "7")) * 86400
+NEGATIVE_TTL = float(os.getenv("OVERBASE_DOMAIN_NEG_TTL_HOURS", "24")) * 3600
+
+
+class DomainCache:
+    """SQLite table of URL validation results; safe to share between threads."""
+
+    def __init__(self, path: Path = DOMAIN_CACHE_PATH, positive_ttl: float = POSITIVE_TTL,
+                 negative_ttl: float = NEGATIVE_TTL, enabled: bool = DOMAIN_CACHE):
+        self.path = Path(path)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS urls ("
+                " url TEXT PRIMARY KEY, ok INTEGER NOT NULL, final_url TEXT,"
+                " status INTEGER, checked REAL NOT NULL)"
+            )
+        return self._conn
+
+    def _fresh(self, ok: int, checked: float, now: float) -> bool:
+        return now - checked < (self.positive_ttl if ok else self.negative_ttl)
+
+    def get(self, url: str):
+        """(ok, final_url) for a fresh entry, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT ok, final_url, checked FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or not self._fresh(row[0], row[2], time.time()):
+            return None
+        return bool(row[0]), row[1]
+
+    def put(self, url: str, ok: bool, final_url, status):
+        if not self.enabled:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO urls (url, ok, final_url, status, checked) VALUES (?, ?, ?, ?, ?)",
+                (url, int(ok), final_url, status, time.time()),
+            )
+            db.commit()
+
+    def entries(self, url_filter: str = None) -> list:
+        query = "SELECT url, ok, final_url, status, checked FROM urls"
+        args = ()
+        if url_filter:
+            query += " WHERE url LIKE ?"
+            args = (f"%{url_filter}%",)
+        with self._lock:
+            return self._db().execute(query + " ORDER BY checked DESC", args).fetchall()
+
+    def purge(self, expired=False, negative=False, url_filter=None, everything=False) -> int:
+        """Delete entries; returns how many were removed."""
+        with self._lock:
+            db = self._db()
+            if everything:
+                cur = db.execute("DELETE FROM urls")
+            elif url_filter:
+                cur = db.execute("DELETE FROM urls WHERE url LIKE ?", (f"%{url_filter}%",))
+            elif negative:
+                cur = db.execute("DELETE FROM urls WHERE ok = 0")
+            elif expired:
+                now = time.time()
+                cur = db.execute(
+                    "DELETE FROM urls WHERE (ok = 1 AND ? - checked >= ?) OR (ok = 0 AND ? - checked >= ?)",
+                    (now, self.positive_ttl, now, self.negative_ttl),
+                )
+            else:
+                return 0
+            db.commit()
+            return cur.rowcount
+
+
+def _inspect(cache: DomainCache, args):
+    rows = cache.entries(args.url)
+    now = time.time()
+    fresh = sum(cache._fresh(ok, checked, now) for _, ok, _, _, checked in rows)
+    positive = sum(ok for _, ok, _, _, _ in rows)
+    print(f"{cache.path}: {len(rows)} entries ({positive} valid, {len(rows) - positive} invalid, "
+          f"{fresh} fresh, {len(rows) - fresh} expired)")
+    for url, ok, final_url, status, checked in rows[:args.limit]:
+        state = "fresh" if cache._fresh(ok, checked, now) else "expired"
+        when = datetime.fromtimestamp(checked).strftime("%Y-%m-%d %H:%M")
+        result = f"ok → {final_url}" if ok else f"failed (status {status or '-'})"
+        print(f"  {url}  {result}  [{when}, {state}]")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or purge the Task 3 domain-validation cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_inspect = sub.add_parser("inspect", help="list cached URLs")
+    p_inspect.add_argument("--url", help="only URLs containing this text")
+    p_inspect.add_argument("--limit", type=int, default=50, help="entries to list (default 50)")
+    p_purge = sub.add_parser("purge", help="delete cached URLs")
+    group = p_purge.add_mutually_exclusive_group(required=True)
+    group.add_argument("--expired", action="store_true", help="entries past their TTL")
+    group.add_argument("--negative", action="store_true", help="all failed validations")
+    group.add_argument("--url", help="URLs containing this text")
+    group.add_argument("--all", action="store_true", help="everything")
+    args = parser.parse_args(argv)
+
+    cache = DomainCache(enabled=True)
+    if args.command == "inspect":
+        _inspect(cache, args)
+    else:
+        removed = cache.purge(args.expired, args.negative, args.url, args.all)
+        print(f"Removed {removed} entries from {cache.path}")
+        log(f"domain cache: purged {removed} entries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
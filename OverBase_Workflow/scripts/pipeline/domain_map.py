@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Pipeline domain map - the company → domain dataset used by Task 3.
+
+Two files make up the dataset:
+
+  data/company_domains.json (tracked, edited by hand)
+      curated: company key → domain, matched on whole words (longest key wins)
+  outputs/cache/learned_domains.json (written by runs, untracked)
+      learned: normalized company name → the website a previous run confirmed
+      through the www.<slug>.com fallback. Each entry stores the final URL
+      after redirects, how it was found and when it was last confirmed. The
+      file also holds a version number that save() bumps.
+
+Runs never write the curated file, so it can be a Task 3 stage-cache input
+without each run invalidating its own cache. Learned entries left in the
+curated file by older versions are read as a starting point. Both files are
+loaded once (the curated keys into a PhraseMatcher index) and reloaded when
+they change on disk, so edits apply to a running pipeline. A learned entry
+confirmed within OVERBASE_DOMAIN_TTL_DAYS is used without probing the network
+again.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pipeline.domain_cache import POSITIVE_TTL
+from pipeline.matcher import PhraseMatcher, tokens
+from pipeline.schema import OUTPUT_DIR, PROJECT_ROOT, log
+
+DOMAIN_MAP_FILE = PROJECT_ROOT / "data" / "company_domains.json"
+LEARNED_FILE = OUTPUT_DIR / "cache" / "learned_domains.json"
+RELOAD_CHECK_SECONDS = 1.0
+
+
+def normalize_company(company) -> str:
+    """Key of a company in the learned section."""
+    return " ".join(tokens(company))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+class DomainMap:
+    """Indexed view of the domain dataset; thread-safe, reloads on change."""
+
+    def __init__(self, path: Path = DOMAIN_MAP_FILE, learned_path: Path = LEARNED_FILE,
+                 trust_seconds: float = POSITIVE_TTL):
+        self.path = Path(path)
+        self.learned_path = Path(learned_path)
+        self.trust_seconds = trust_seconds
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._mtime = None
+        self._checked = 0.0
+        self._load()
+
+    def _mtimes(self):
+        return tuple(p.stat().st_mtime if p.exists() else None for p in (self.path, self.learned_path))
+
+    def _learned_doc(self, curated_doc: dict) -> dict:
+        if self.learned_path.exists():
+            return json.loads(self.learned_path.read_text())
+        return {"learned": curated_doc.get("learned", {})}
+
+    def _load(self):
+        doc = json.loads(self.path.read_text()) if self.path.exists() else {}
+        learned_doc = self._learned_doc(doc)
+        self.version = learned_doc.get("version", 0)
+        self.curated = doc.get("curated", {})
+        self.learned = learned_doc.get("learned", {})
+        self.matcher = PhraseMatcher(self.curated)
+        self._mtime = self._mtimes()
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked < RELOAD_CHECK_SECONDS:
+            return
+        self._checked = now
+        mtime = self._mtimes()
+        if mtime != self._mtime:
+            self._load()
+            log(f"domain map: reloaded {self.path.name} (version {self.version})")
+
+    def find(self, company):
+        """Curated domain for a company name (longest whole-word key), or None."""
+        with self._lock:
+            self._maybe_reload()
+            return self.matcher.longest(company)
+
+    def learned_url(self, company):
+        """(url, source, trusted) of a learned entry; trusted entries need no probe."""
+        key = normalize_company(company)
+        with self._lock:
+            self._maybe_reload()
+            entry = self._pending[key] if key in self._pending else self.learned.get(key)
+        if not entry:
+            return None, None, False
+        confirmed = datetime.fromisoformat(entry["confirmed"]).timestamp()
+        return entry["url"], entry.get("source", "slug"), time.time() - confirmed < self.trust_seconds
+
+    def learn(self, company, url: str, source: str = "slug"):
+        """Record a confirmed website for a company (written by save())."""
+        key = normalize_company(company)
+        if not key or not url:
+            return
+        with self._lock:
+            self._pending[key] = {"url": url, "source": source, "confirmed": _now()}
+
+    def forget(self, company):
+        """Drop a learned entry that no longer validates."""
+        key = normalize_company(company)
+        with self._lock:
+            if key in self.learned or key in self._pending:
+                self._pending[key] = None
+
+    def save(self) -> int:
+        """Merge pending discoveries into the learned file; returns how many entries changed."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            # Merge with the file as it is now, in case another run saved meanwhile
+            curated_doc = json.loads(self.path.read_text()) if self.path.exists() else {}
+            doc = self._learned_doc(curated_doc)
+            learned = doc.setdefault("learned", {})
+            for key, entry in self._pending.items():
+                if entry is None:
+                    learned.pop(key, None)
+                else:
+                    learned[key] = entry
+            changed = len(self._pending)
+            doc["version"] = doc.get("version", 0) + 1
+            doc["updated"] = _now()[:10]
+            self.learned_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.learned_path.with_name(f".{self.learned_path.name}.tmp")
+            tmp.write_text(json.dumps(doc, indent=2) + "\n")
+            os.replace(tmp, self.learned_path)
+            self._pending = {}
+            self._load()
+        log(f"domain map: saved {changed} learned entr{'y' if changed == 1 else 'ies'} "
+            f"to {self.learned_path.name} (version {self.version})")
+        return changed
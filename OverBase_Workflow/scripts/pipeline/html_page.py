@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pipeline HTML page - parse a fetched page once into its text and links.
+
+parse_page() builds one lxml tree from the raw body and walks it once. It
+collects the visible text (script, style and template contents and comments
+left out, as BeautifulSoup's get_text does), transliterated,
+whitespace-collapsed and lowercased. In the same walk it collects the page's
+same-site links with their anchor text. The body is decoded from the
+charset in the Content-Type header, else as UTF-8, else lxml reads the
+page's own <meta charset>, so no charset guessing runs over the body.
+
+PageParser runs parse_page in a pool of OVERBASE_PARSE_WORKERS processes
+(default: up to 4), so parsing large pages does not hold up the threads
+doing network I/O. OVERBASE_PARSE_WORKERS=0 parses in the calling thread.
+"""
+
+import codecs
+import multiprocessing
+import os
+import re
+import threading
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+import lxml.html
+from unidecode import unidecode
+
+from pipeline.schema import log
+
+PARSE_WORKERS = int(os.getenv("OVERBASE_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+HIDDEN_TAGS = {"script", "style", "template"}
+
+
+@dataclass
+class Page:
+    """A parsed page: normalized visible text and same-site links [(url, anchor text)]."""
+    text: str = ""
+    links: list = field(default_factory=list)
+
+
+def charset_of(content_type: str):
+    """charset= of a Content-Type header value, or None."""
+    match = re.search(r"charset=[\"']?([\w.:-]+)", content_type or "", re.I)
+    return match.group(1) if match else None
+
+
+def _decode(body: bytes, charset: str = None):
+    """body as str, or None to let lxml detect the encoding from the page."""
+    if charset:
+        try:
+            return body.decode(charset, "replace")
+        except LookupError:
+            pass
+    try:
+        # Not final: a body cut off at the byte cap may end inside a character
+        return codecs.getincrementaldecoder("utf-8")().decode(body, final=False)
+    except UnicodeDecodeError:
+        return None
+
+
+def _strings(el, out: list, tail: bool = True):
+    """Append the text of el and its descendants, in document order, to out."""
+    if isinstance(el.tag, str) and el.tag.lower() not in HIDDEN_TAGS:
+        if el.text:
+            out.append(el.text)
+        for child in el:
+            _strings(child, out)
+    if tail and el.tail:
+        out.append(el.tail)
+
+
+def _normalize(parts: list) -> str:
+    return re.sub(r"\s+", " ", unidecode(" ".join(parts))).strip().lower()
+
+
+def parse_page(url: str, body: bytes, charset: str = None) -> Page:
+    """Visible text and same-site links of the page at url, in one parse."""
+    if not body:
+        return Page()
+    html = _decode(body, charset)
+    try:
+        try:
+            root = lxml.html.document_fromstring(html if html is not None else body)
+        except ValueError:
+            # str input with an XML encoding declaration: let lxml decode the bytes
+            root = lxml.html.document_fromstring(body)
+    except Exception:
+        return Page()
+
+    parts = []
+    _strings(root, parts, tail=False)
+
+    netloc = urllib.parse.urlparse(url).netloc
+    links = []
+    for a in root.iter("a"):
+        href = (a.get("href") or "").strip()
+        if not href:
+            continue
+        target = urllib.parse.urljoin(url, href)
+        if urllib.parse.urlparse(target).netloc != netloc:
+            continue
+        anchor = []
+        _strings(a, anchor, tail=False)
+        links.append((target, "".join(anchor).strip().lower()))
+    return Page(_normalize(parts), links)
+
+
+class PageParser:
+    """parse_page on a lazily started process pool; thread-safe."""
+
+    def __init__(self, workers: int = PARSE_WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None and self.workers > 0:
+                # spawn: forking a process that runs network threads is unsafe
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def parse(self, url: str, body: bytes, charset: str = None) -> Page:
+        pool = self._executor()
+        if pool is not None:
+            try:
+                return pool.submit(parse_page, url, body, charset).result()
+            except BrokenProcessPool:
+                log("html page: parse pool stopped, parsing in-process from now on")
+                with self._lock:
+                    self.workers, self._pool = 0, None
+        return parse_page(url, body, charset)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Pipeline journal - crash-safe per-row checkpoints for the long network stages.
+
+A stage appends one JSON line per finished row to
+outputs/cache/journal/<stage>.jsonl. Each line stores a digest of the row's
+input values and the stage's result for that row. Lines are flushed as they
+are written and fsynced in batches (every OVERBASE_JOURNAL_FSYNC_ROWS rows or
+OVERBASE_JOURNAL_FSYNC_SECONDS seconds), so a crash or Ctrl-C loses at most
+the row in flight.
+
+When the stage is rerun, rows whose input digest is in the journal are
+replayed instead of re-fetched, so the run resumes at the first unfinished row.
+The journal header records a hash of the stage's source files and
+environment, and a journal written by different code or settings is
+discarded. The journal is deleted once the stage has saved its outputs.
+OVERBASE_JOURNAL=0 turns journalling off.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from pipeline.schema import OUTPUT_DIR, log
+
+JOURNAL_DIR = OUTPUT_DIR / "cache" / "journal"
+JOURNAL = os.getenv("OVERBASE_JOURNAL", "1").lower() in ("1", "true", "yes")
+FSYNC_ROWS = int(os.getenv("OVERBASE_JOURNAL_FSYNC_ROWS", "8"))
+FSYNC_SECONDS = float(os.getenv("OVERBASE_JOURNAL_FSYNC_SECONDS", "2"))
+
+
+def row_digest(row) -> str:
+    """Hash of a row's input values (column names included)."""
+    items = [[str(c), str(v)] for c, v in row.items()]
+    return hashlib.sha256(json.dumps(items).encode()).hexdigest()[:20]
+
+
+def _version(sources, env) -> str:
+    h = hashlib.sha256()
+    for path in sources:
+        h.update(Path(path).read_bytes())
+    for var in env:
+        h.update(f"{var}={os.getenv(var, '')}".encode())
+    return h.hexdigest()[:16]
+
+
+class RowJournal:
+    """Append-only JSONL journal of per-row results for one stage.
+
+    lookup(row) returns the journalled result for a row, or None;
+    record(row, result) appends one. Use as a context manager (or call
+    complete()/close() yourself): a clean exit deletes the journal, while an
+    exception keeps it for the next run.
+    """
+
+    def __init__(self, stage: str, sources=(), env=(), directory: Path = JOURNAL_DIR):
+        self.stage = stage
+        self.path = Path(directory) / f"{stage}.jsonl"
+        self.version = _version(sources, env)
+        self.done = {}
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._synced_at = time.monotonic()
+        self._file = None
+        if not JOURNAL:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._replay()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self.path.stat().st_size == 0:
+            self._write({"stage": stage, "version": self.version, "started": time.time()})
+            self._sync()
+
+    def _replay(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if header.get("version") != self.version:
+            # Written by other code or settings: start over
+            self.path.unlink()
+            if lines:
+                log(f"journal {self.stage}: discarded stale journal {self.path}")
+            return
+        valid = 1
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break   # torn last line from a crash
+            self.done[entry["k"]] = entry["v"]
+            valid += 1
+        if valid < len(lines):
+            # Drop the torn tail so new entries start on a clean line
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines[:valid]) + "\n")
+        if self.done:
+            print(f"ⓘ Journal {self.stage}: resuming with {len(self.done)} finished row(s) from {self.path}")
+            log(f"journal {self.stage}: resuming with {len(self.done)} finished row(s) from {self.path}")
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def lookup(self, row) -> Optional[dict]:
+        if not self.done:
+            return None
+        result = self.done.get(row_digest(row))
+        if result is not None:
+            with self._lock:
+                self.replayed += 1
+        return result
+
+    def record(self, row, result: dict):
+        if self._file is None:
+            return
+        entry = {"k": row_digest(row), "v": result}
+        with self._lock:
+            self._write(entry)
+            self._pending += 1
+            if self._pending >= FSYNC_ROWS or time.monotonic() - self._synced_at >= FSYNC_SECONDS:
+                self._sync()
+
+    def close(self):
+        """Sync and keep the journal (the stage did not finish)."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def complete(self):
+        """The stage saved its outputs: the journal is no longer needed."""
+        self.close()
+        if JOURNAL and self.path.exists():
+            self.path.unlink()
+        if self.replayed:
+            log(f"journal {self.stage}: replayed {self.replayed} row(s)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.complete()
+        else:
+            self.close()
+        return False
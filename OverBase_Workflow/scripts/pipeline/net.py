@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Pipeline networking helpers shared by the network-bound stages.
+
+  - HostPacer spaces requests to the same host by a minimum interval, so
+    concurrent workers stay polite per site without a global sleep
+  - HostLimiter caps how many requests to the same host are in flight
+  - CircuitBreaker fails fast on hosts that keep refusing connections or
+    timing out; BREAKER is the one instance shared by every stage
+  - pooled_session / check_url: a shared connection-pooled Session and a
+    liveness check (HEAD, then a streamed GET cut off at a byte cap)
+  - read_capped reads a streamed body up to a byte cap and a deadline
+  - NetStats collects request and row latencies, bytes transferred, cache
+    hits and requests skipped without touching the network (with the seconds
+    that reclaimed), and reports throughput
+"""
+
+import os
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pipeline.schema import log
+
+LIVENESS_BYTE_CAP = 16 * 1024   # body bytes a streamed GET may read before it is closed
+# Consecutive connect/timeout failures that open a host's circuit, and how
+# long it stays open before one request may probe the host again
+BREAKER_FAILURES = int(os.getenv("OVERBASE_BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.getenv("OVERBASE_BREAKER_COOLDOWN_SECONDS", "120"))
+
+
+def host_of(url: str) -> str:
+    """Host of a URL without a leading www. ('' if it has none)."""
+    host = urllib.parse.urlparse(str(url)).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostPacer:
+    """Per-host pacing: wait(url) returns once min_interval has passed since
+    the previous request slot handed out for that host.
+
+    Slots are reserved under a lock and the sleep happens outside it, so
+    workers hitting different hosts never wait on each other.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """Block until url's host may be requested; returns the seconds waited."""
+        if self.min_interval <= 0:
+            return 0.0
+        host = host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class HostLimiter:
+    """Per-host concurrency cap: at most `limit` holders of slot(url) per host."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str, timeout: float = None) -> bool:
+        """Take a slot for url's host; False if none freed up within timeout."""
+        host = host_of(url)
+        with self._lock:
+            sem = self._slots.setdefault(host, threading.BoundedSemaphore(self.limit))
+        return sem.acquire(timeout=timeout) if timeout is not None else sem.acquire()
+
+    def release(self, url: str):
+        with self._lock:
+            sem = self._slots[host_of(url)]
+        sem.release()
+
+
+def is_host_failure(exc) -> bool:
+    """True for errors meaning the host is down or not answering (not HTTP error statuses)."""
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker; thread-safe, shared across rows and stages.
+
+    record() counts consecutive connect/timeout failures per host. After
+    `failures` of them the host's circuit opens and allow() refuses requests
+    to it for `cooldown` seconds. After that one request is let through as a
+    probe (others keep waiting another cooldown). A success closes the
+    circuit; a failure keeps it open. A refused request is counted in the
+    stage's NetStats as skipped ('breaker'), with the seconds it would likely
+    have taken: the average duration of the host's failed requests. clock
+    is the time source (seconds, monotonic).
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN,
+                 clock=time.monotonic):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.clock = clock
+        self._hosts = {}    # host -> {"failures", "opened", "failed", "failed_seconds"}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> dict:
+        return self._hosts.setdefault(host, {"failures": 0, "opened": None, "failed": 0, "failed_seconds": 0.0})
+
+    def _refuse(self, state: dict, stats) -> bool:
+        """True (counted in stats) if state's circuit is open and cooling down; call under the lock."""
+        if state["opened"] is None or self.clock() - state["opened"] >= self.cooldown:
+            return False
+        if stats is not None:
+            stats.skip("breaker", state["failed_seconds"] / max(1, state["failed"]))
+        return True
+
+    def blocked(self, url: str, stats=None) -> bool:
+        """True while url's host is open; counted in stats as a skipped request."""
+        if self.failures <= 0:
+            return False
+        with self._lock:
+            return self._refuse(self._state(host_of(url)), stats)
+
+    def allow(self, url: str, stats=None) -> bool:
+        """Whether a request to url may go out now; a refusal is counted in stats."""
+        if self.failures <= 0:
+            return True
+        with self._lock:
+            state = self._state(host_of(url))
+            if self._refuse(state, stats):
+                return False
+            if state["opened"] is not None:
+                # Cooldown over: this request probes the host, the rest wait another cooldown
+                state["opened"] = self.clock()
+            return True
+
+    def record(self, url: str, seconds: float, failed: bool):
+        """Outcome of a request to url that took seconds; failed = connect error or timeout."""
+        if self.failures <= 0:
+            return
+        host = host_of(url)
+        message = None
+        with self._lock:
+            state = self._state(host)
+            if not failed:
+                if state["opened"] is not None:
+                    message = f"{host} answered again, circuit closed"
+                state["failures"], state["opened"] = 0, None
+            else:
+                state["failures"] += 1
+                state["failed"] += 1
+                state["failed_seconds"] += seconds
+                if state["failures"] >= self.failures:
+                    state["opened"] = self.clock()
+                    message = (f"{host} failed {state['failures']} times in a row, "
+                               f"open for {self.cooldown:.0f}s")
+        if message:
+            log(f"circuit breaker: {message}")
+
+
+def pooled_session(pool_size: int, user_agent: str = None) -> requests.Session:
+    """Session keeping up to pool_size connections per host alive, for sharing across threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+
+def header_bytes(resp) -> int:
+    """Approximate size of the status lines and headers of resp and its redirects."""
+    return sum(
+        len(r.reason or "") + 15 + sum(len(k) + len(v) + 4 for k, v in r.headers.items())
+        for r in list(resp.history) + [resp]
+    )
+
+
+def check_url(session: requests.Session, url: str, timeout: float, byte_cap: int = LIVENESS_BYTE_CAP,
+              breaker: CircuitBreaker = None):
+    """Liveness check without downloading the page: (status, final_url, bytes transferred).
+
+    Tries HEAD first. Servers that refuse or mishandle HEAD (any non-200
+    answer such as 405/501, or a reset or dropped HEAD connection) get a
+    streamed GET that is closed once the headers are in and at most byte_cap
+    body bytes were read. A HEAD timeout (connect or read) ends the check at
+    once: the host is not answering, or is tarpitting, and a GET would only
+    wait out the timeout a second time. status is None if the request
+    failed. The outcome is recorded with breaker if given.
+    """
+    transferred = 0
+    started = time.perf_counter()
+    try:
+        resp = session.head(url, timeout=timeout, allow_redirects=True)
+        transferred += header_bytes(resp)
+        if breaker is not None:
+            breaker.record(url, time.perf_counter() - started, False)
+        if resp.status_code == 200:
+            return 200, resp.url, transferred
+    except requests.Timeout:
+        if breaker is not None:
+            breaker.record(url, time.perf_counter() - started, True)
+        return None, None, transferred
+    except Exception:
+        pass
+    started = time.perf_counter()
+    try:
+        with session.get(url, timeout=timeout, allow_redirects=True, stream=True) as resp:
+            transferred += header_bytes(resp)
+            if breaker is not None:
+                breaker.record(url, time.perf_counter() - started, False)
+            # Small bodies are drained so the connection can go back to the pool
+            length = resp.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) <= byte_cap:
+                for chunk in resp.iter_content(8192):
+                    transferred += len(chunk)
+            return resp.status_code, resp.url, transferred
+    except Exception as e:
+        if breaker is not None and is_host_failure(e):
+            breaker.record(url, time.perf_counter() - started, True)
+        return None, None, transferred
+
+
+def read_capped(resp, byte_cap: int, deadline: float = None) -> bytes:
+    """Body of a streamed response, cut off after byte_cap bytes or at deadline (time.time())."""
+    chunks, size = [], 0
+    for chunk in resp.iter_content(16384):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= byte_cap or (deadline is not None and time.time() > deadline):
+            break
+    return b"".join(chunks)[:byte_cap]
+
+
+def _size(nbytes: int) -> str:
+    if nbytes < 1024:
+        return f"{nbytes} B"
+    if nbytes < 1024 * 1024:
+        return f"{nbytes / 1024:.1f} KB"
+    return f"{nbytes / (1024 * 1024):.1f} MB"
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class NetStats:
+    """Thread-safe latency samples for one stage: requests and whole work items
+    (rows, or whatever unit the stage processes)."""
+
+    def __init__(self, name: str, unit: str = "rows"):
+        self.name = name
+        self.unit = unit
+        self.requests = []
+        self.rows = []
+        self.waited = 0.0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.skipped = {}
+        self.reclaimed = 0.0
+        self.samples = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def request(self, seconds: float, waited: float = 0.0, nbytes: int = 0):
+        with self._lock:
+            self.requests.append(seconds)
+            self.waited += waited
+            self.bytes += nbytes
+
+    def cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def skip(self, reason: str, seconds: float = 0.0):
+        """A request not made because its outcome was already known (e.g. reason 'dns').
+
+        seconds: how long the request would likely have taken, if known.
+        """
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+            self.reclaimed += seconds
+
+    def sample(self, name: str, value: float):
+        """A stage-specific measurement (e.g. 'first_hit'); see mean()."""
+        with self._lock:
+            self.samples.setdefault(name, []).append(value)
+
+    def mean(self, name: str):
+        values = self.samples.get(name)
+        return sum(values) / len(values) if values else None
+
+    def row(self, seconds: float):
+        with self._lock:
+            self.rows.append(seconds)
+
+    def summary(self) -> str:
+        wall = time.perf_counter() - self.started
+        rate = len(self.rows) / wall if wall > 0 else 0.0
+        return (
+            f"{len(self.rows)} {self.unit} in {wall:.1f}s ({rate:.1f} {self.unit}/s), "
+            f"{len(self.requests)} requests"
+            + (f" + {self.cache_hits} cache hits" if self.cache_hits else "")
+            + (f", {sum(self.skipped.values())} skipped ("
+               + ", ".join(f"{k} {v}" for k, v in sorted(self.skipped.items())) + ")" if self.skipped else "")
+            + (f", ~{self.reclaimed:.1f}s reclaimed" if self.reclaimed else "")
+            + " " +
+            f"(p50 {_percentile(self.requests, 0.5):.2f}s, p95 {_percentile(self.requests, 0.95):.2f}s), "
+            f"{_size(self.bytes)} transferred, "
+            f"{self.unit} latency p50 {_percentile(self.rows, 0.5):.2f}s, p95 {_percentile(self.rows, 0.95):.2f}s, "
+            f"host pacing waited {self.waited:.1f}s"
+        )
+
+    def report(self):
+        msg = self.summary()
+        print(f"ⓘ Throughput [{self.name}]: {msg}")
+        log(f"throughput {self.name}: {msg}")
+
+
+# One breaker per process: a host failing in one stage fails fast in the next
+BREAKER = CircuitBreaker()
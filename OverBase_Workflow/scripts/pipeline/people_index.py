@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Pipeline people index - what Task 3c learned about each company site, kept across runs.
+
+For every company site it crawls, Task 3c stores the pages it fetched, in
+crawl order, as ASCII-folded, whitespace-collapsed, lowercased text with
+their source URL. It also stores where the crawl stopped (the pages still to
+fetch) and when the site was first crawled. The next run matches new execs
+against the stored text without a request, and only fetches further pages
+for execs the stored pages do not name. The leadership/team pages listed in
+each domain's robots.txt and sitemaps are cached alongside, per domain, as
+are the crawl outcomes (which page paths and link texts led to a verified
+name, per domain and overall) that order later crawls (pipeline/bandit.py). A
+site is recrawled (and rediscovered) from scratch once its entry is older
+than OVERBASE_PEOPLE_TTL_DAYS (default 30). Set OVERBASE_PEOPLE_INDEX=0 to
+always crawl.
+
+Usage:
+    python scripts/pipeline/people_index.py inspect [--site TEXT] [--limit N]
+    python scripts/pipeline/people_index.py purge --expired | --site TEXT | --all
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+# scripts/ on the path so this file can also be run directly (see __main__)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pipeline.net import host_of
+from pipeline.schema import OUTPUT_DIR, log
+
+PEOPLE_INDEX_PATH = OUTPUT_DIR / "cache" / "people.sqlite"
+PEOPLE_INDEX = os.getenv("OVERBASE_PEOPLE_INDEX", "1").lower() in ("1", "true", "yes")
+PEOPLE_TTL = float(os.getenv("OVERBASE_PEOPLE_TTL_DAYS", "30")) * 86400
+
+
+class PeopleIndex:
+    """SQLite table of crawled site state keyed by base URL; safe to share between threads.
+
+    A state is a dict: pages ([url, text or None] in crawl order), todo
+    ([url, is_standard_page] still to fetch) and scanned (fetches so far).
+    """
+
+    def __init__(self, path: Path = PEOPLE_INDEX_PATH, ttl: float = PEOPLE_TTL, enabled: bool = PEOPLE_INDEX):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sites ("
+                " base TEXT PRIMARY KEY, domain TEXT NOT NULL, pages INTEGER NOT NULL,"
+                " state BLOB NOT NULL, crawled REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS discovery ("
+                " domain TEXT PRIMARY KEY, pages TEXT, checked REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS outcomes ("
+                " scope TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL,"
+                " tries INTEGER NOT NULL, hits INTEGER NOT NULL, PRIMARY KEY (scope, kind, key))"
+            )
+        return self._conn
+
+    def get(self, base: str):
+        """(state, crawled) for a fresh entry, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT state, crawled FROM sites WHERE base = ?", (base,)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def put(self, base: str, state: dict, crawled: float):
+        if not self.enabled:
+            return
+        blob = zlib.compress(json.dumps(state).encode(), 6)
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO sites (base, domain, pages, state, crawled, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (base, host_of(base), len(state["pages"]), blob, crawled, time.time()),
+            )
+            db.commit()
+
+    def get_discovery(self, domain: str):
+        """(hit, pages) for a fresh discovery result; pages is None if the domain has no sitemap."""
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT pages, checked FROM discovery WHERE domain = ?", (domain,)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return False, None
+        return True, None if row[0] is None else json.loads(row[0])
+
+    def put_discovery(self, domain: str, pages):
+        if not self.enabled:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO discovery (domain, pages, checked) VALUES (?, ?, ?)",
+                (domain, None if pages is None else json.dumps(pages), time.time()),
+            )
+            db.commit()
+
+    def load_outcomes(self) -> dict:
+        """{(scope, kind, key): (tries, hits)} of every recorded crawl outcome."""
+        if not self.enabled:
+            return {}
+        with self._lock:
+            rows = self._db().execute("SELECT scope, kind, key, tries, hits FROM outcomes").fetchall()
+        return {(scope, kind, key): (tries, hits) for scope, kind, key, tries, hits in rows}
+
+    def add_outcomes(self, deltas: dict):
+        """Add tries/hits ({(scope, kind, key): (tries, hits)}) to the stored counts."""
+        if not self.enabled or not deltas:
+            return
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT INTO outcomes (scope, kind, key, tries, hits) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (scope, kind, key) DO UPDATE SET"
+                " tries = tries + excluded.tries, hits = hits + excluded.hits",
+                [(scope, kind, key, tries, hits) for (scope, kind, key), (tries, hits) in deltas.items()],
+            )
+            db.commit()
+
+    def entries(self, site_filter: str = None) -> list:
+        query = "SELECT base, pages, length(state), crawled, updated FROM sites"
+        args = ()
+        if site_filter:
+            query += " WHERE base LIKE ?"
+            args = (f"%{site_filter}%",)
+        with self._lock:
+            return self._db().execute(query + " ORDER BY updated DESC", args).fetchall()
+
+    def purge(self, expired=False, site_filter=None, everything=False) -> int:
+        """Delete entries; returns how many were removed."""
+        with self._lock:
+            db = self._db()
+            if everything:
+                cur = db.execute("DELETE FROM sites")
+                db.execute("DELETE FROM discovery")
+                db.execute("DELETE FROM outcomes")
+            elif site_filter:
+                cur = db.execute("DELETE FROM sites WHERE base LIKE ?", (f"%{site_filter}%",))
+                db.execute("DELETE FROM discovery WHERE domain LIKE ?", (f"%{site_filter}%",))
+            elif expired:
+                now = time.time()
+                cur = db.execute("DELETE FROM sites WHERE ? - crawled >= ?", (now, self.ttl))
+                db.execute("DELETE FROM discovery WHERE ? - checked >= ?", (now, self.ttl))
+            else:
+                return 0
+            db.commit()
+            return cur.rowcount
+
+
+def _inspect(index: PeopleIndex, args):
+    rows = index.entries(args.site)
+    now = time.time()
+    fresh = sum(now - crawled < index.ttl for _, _, _, crawled, _ in rows)
+    print(f"{index.path}: {len(rows)} sites ({fresh} fresh, {len(rows) - fresh} stale)")
+    for base, pages, size, crawled, updated in rows[:args.limit]:
+        state = "fresh" if now - crawled < index.ttl else "stale"
+        when = datetime.fromtimestamp(crawled).strftime("%Y-%m-%d %H:%M")
+        print(f"  {base}  {pages} pages, {size / 1024:.1f} KB  [crawled {when}, {state}]")
+    best = sorted(((hits / tries, tries, kind, key) for (scope, kind, key), (tries, hits)
+                   in index.load_outcomes().items() if scope == "*" and tries), reverse=True)
+    if best:
+        print("Crawl outcomes (all sites, best hit rate first):")
+        for rate, tries, kind, key in best[:args.limit]:
+            print(f"  {kind} {key!r}  {rate:.0%} of {tries} pages")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or purge the Task 3c people index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_inspect = sub.add_parser("inspect", help="list indexed sites")
+    p_inspect.add_argument("--site", help="only sites containing this text")
+    p_inspect.add_argument("--limit", type=int, default=50, help="entries to list (default 50)")
+    p_purge = sub.add_parser("purge", help="delete indexed sites")
+    group = p_purge.add_mutually_exclusive_group(required=True)
+    group.add_argument("--expired", action="store_true", help="sites past their TTL")
+    group.add_argument("--site", help="sites containing this text")
+    group.add_argument("--all", action="store_true", help="everything")
+    args = parser.parse_args(argv)
+
+    index = PeopleIndex(enabled=True)
+    if args.command == "inspect":
+        _inspect(index, args)
+    else:
+        removed = index.purge(args.expired, args.site, args.all)
+        print(f"Removed {removed} sites from {index.path}")
+        log(f"people index: purged {removed} sites")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Pipeline runner - declarative stage graph with content-addressed memoization.
+
+Each Stage declares the stages it reads from and the files it writes. A stage's
+cache key hashes its code (the source file of its function and of every
+first-party module under scripts/ that file uses, transitively), the
+fingerprints of its input frames, and any environment variables or extra
+files it depends on. When the key matches a stored output and the declared files still exist,
+the stage is skipped and its output is loaded from outputs/cache/stages/.
+
+Stages whose inputs are ready run concurrently on a thread pool (--jobs), so
+independent network-bound branches overlap; branches that each add columns
+to the same rows are merged back with join_columns on the row key.
+
+Selection (see add_selection_args):
+  --to X        run X and everything upstream of it
+  --from X      take everything upstream of X as given (loaded from the stage
+                cache or CSV artifacts) and run the rest of the selection
+  --only A,B    run just these stages, loading their inputs the same way
+  --force       ignore the stage cache for the selected stages
+  --jobs N      stages to run at once (default OVERBASE_JOBS or 4; 1 = serial)
+  --stream      chains of single-input stages that declare a per-row form run
+                as one streamed unit (see pipeline/stream.py): each row moves
+                to the next stage as soon as it is done (or OVERBASE_STREAM=1)
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from pipeline.artifacts import artifact_exists, flush_artifacts, read_artifact
+from pipeline.schema import OUTPUT_DIR, apply_schema, log, run_stage
+from pipeline.stream import STREAM_WORKERS, RowNode, stream_rows
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+STAGE_CACHE_DIR = OUTPUT_DIR / "cache" / "stages"
+KEEP_VERSIONS = 3
+ROW_KEY = "Original Order"
+JOBS = int(os.getenv("OVERBASE_JOBS", "4"))
+STREAM = os.getenv("OVERBASE_STREAM", "0").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class Stage:
+    """One node of the pipeline graph."""
+    name: str
+    fn: Callable
+    # Upstream stage names, in the order fn receives their frames. A tuple
+    # entry lists alternatives: the first is used for planning, and the first
+    # one with an available output is used when loading unplanned inputs.
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)      # files written (legacy CSVs etc.)
+    env: tuple = ()                                   # env vars that change behaviour
+    files: list = field(default_factory=list)         # extra input files (hashed if present)
+    memoize: bool = True
+    reader: Optional[Callable] = None                 # loads output when not run/cached
+    stream: Optional[Callable] = None                 # (total) -> (row_fn, finish), see --stream
+    workers: Optional[int] = None                     # streamed worker threads (default OVERBASE_STREAM_WORKERS)
+    description: str = ""
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame: values, index, column names and dtypes."""
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+def join_columns(base: pd.DataFrame, branch: pd.DataFrame, columns: list, key: str = ROW_KEY) -> pd.DataFrame:
+    """Add a branch's output columns to base, matching rows on key.
+
+    Rows and index follow base; base rows the branch did not produce get NaN.
+    """
+    missing = [c for c in [key] + list(columns) if c not in branch.columns]
+    if missing:
+        raise KeyError(f"Branch output lacks column(s): {', '.join(missing)}")
+    if branch[key].duplicated().any():
+        raise ValueError(f"Branch output has duplicate '{key}' values")
+    # Columns present in both are replaced by the branch's values
+    out = base.drop(columns=[c for c in columns if c in base.columns])
+    return out.join(branch.set_index(key)[list(columns)], on=key)
+
+
+def _file_hash(path: Path) -> str:
+    if not Path(path).exists():
+        return "missing"
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _source_file(module):
+    """Source path of a first-party module (under scripts/), else None."""
+    path = getattr(module, "__file__", None)
+    if not path or not path.endswith(".py"):
+        return None
+    path = Path(path).resolve()
+    return path if SCRIPTS_DIR in path.parents else None
+
+
+def _code_files(fn) -> list:
+    """Source files a stage function depends on: its module plus every
+    first-party module reachable through the names each module imports."""
+    pending = [sys.modules.get(fn.__module__) or inspect.getmodule(fn)]
+    files, seen = set(), set()
+    while pending:
+        module = pending.pop()
+        if module is None or id(module) in seen:
+            continue
+        seen.add(id(module))
+        path = _source_file(module)
+        if path is None:
+            continue
+        files.add(path)
+        for value in vars(module).values():
+            if inspect.ismodule(value):
+                pending.append(value)
+            else:
+                owner = getattr(value, "__module__", None) or type(value).__module__
+                pending.append(sys.modules.get(owner) if isinstance(owner, str) else None)
+    return sorted(files)
+
+
+def _first(entry):
+    return entry[0] if isinstance(entry, tuple) else entry
+
+
+class Pipeline:
+    def __init__(self, stages: list, cache_dir: Path = STAGE_CACHE_DIR):
+        self.stages = {s.name: s for s in stages}
+        self.order = [s.name for s in stages]   # declared in topological order
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._frames = {}
+        self._fingerprints = {}
+        for s in stages:
+            for entry in s.inputs:
+                for dep in (entry if isinstance(entry, tuple) else (entry,)):
+                    if dep not in self.stages or self.order.index(dep) >= self.order.index(s.name):
+                        raise ValueError(f"Stage {s.name}: input {dep} must be declared before it")
+
+    # ------------------------------------------------------------------
+    # Graph helpers
+    # ------------------------------------------------------------------
+    def ancestors(self, name: str) -> set:
+        seen, todo = set(), [name]
+        while todo:
+            for entry in self.stages[todo.pop()].inputs:
+                dep = _first(entry)
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+        return seen
+
+    def descendants(self, name: str) -> set:
+        return {n for n in self.order if name in self.ancestors(n)}
+
+    def plan(self, targets, start=None, only=None) -> list:
+        if only:
+            unknown = [n for n in only if n not in self.stages]
+            if unknown:
+                raise KeyError(f"Unknown stage(s): {', '.join(unknown)}")
+            return [n for n in self.order if n in only]
+        for n in list(targets) + ([start] if start else []):
+            if n not in self.stages:
+                raise KeyError(f"Unknown stage: {n}")
+        wanted = set(targets)
+        for t in targets:
+            wanted |= self.ancestors(t)
+        if start:
+            wanted -= self.ancestors(start)
+        return [n for n in self.order if n in wanted]
+
+    # ------------------------------------------------------------------
+    # Stage cache
+    # ------------------------------------------------------------------
+    def _manifest_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def _manifest(self, name: str) -> dict:
+        try:
+            return json.loads(self._manifest_path(name).read_text())
+        except (OSError, ValueError):
+            return {"latest": None, "entries": {}}
+
+    def _key(self, stage: Stage, input_fps: list) -> str:
+        h = hashlib.sha256()
+        h.update(stage.name.encode())
+        for path in _code_files(stage.fn):
+            h.update(f"{path.relative_to(SCRIPTS_DIR)}:{_file_hash(path)}".encode())
+        for var in stage.env:
+            h.update(f"{var}={os.getenv(var, '')}".encode())
+        for path in stage.files:
+            h.update(_file_hash(path).encode())
+        for fp in input_fps:
+            h.update(fp.encode())
+        return h.hexdigest()[:16]
+
+    def _save(self, name: str, key: str, df: pd.DataFrame, fingerprint: str):
+        path = self.cache_dir / f"{name}-{key}.arrow"
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            feather.write_feather(
+                pa.Table.from_pandas(df, preserve_index=True), str(path), compression="uncompressed"
+            )
+        except Exception:
+            # No pyarrow, or columns Arrow cannot represent (legacy object frames)
+            path = path.with_suffix(".pkl")
+            df.to_pickle(path)
+
+        manifest = self._manifest(name)
+        manifest["entries"][key] = {"file": path.name, "fingerprint": fingerprint, "saved": time.time()}
+        manifest["latest"] = key
+        # Keep a few versions so reverting a code change is still a cache hit
+        stale = sorted(manifest["entries"], key=lambda k: manifest["entries"][k]["saved"])[:-KEEP_VERSIONS]
+        for k in stale:
+            (self.cache_dir / manifest["entries"].pop(k)["file"]).unlink(missing_ok=True)
+        self._manifest_path(name).write_text(json.dumps(manifest, indent=2))
+
+    def _load(self, name: str, key: str) -> Optional[pd.DataFrame]:
+        entry = self._manifest(name)["entries"].get(key)
+        if not entry:
+            return None
+        path = self.cache_dir / entry["file"]
+        if not path.exists():
+            return None
+        if path.suffix == ".pkl":
+            return pd.read_pickle(path)
+        import pyarrow.feather as feather
+        return feather.read_table(str(path), memory_map=True).to_pandas()
+
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+    def _available(self, name: str) -> bool:
+        if name in self._frames:
+            return True
+        stage = self.stages[name]
+        latest = self._manifest(name).get("latest")
+        if stage.memoize and latest:
+            return True
+        if stage.reader is not None:
+            return True
+        return bool(stage.outputs) and artifact_exists(stage.outputs[0])
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """Output of a stage from this run, the stage cache, or its artifact."""
+        if name not in self._frames:
+            stage = self.stages[name]
+            manifest = self._manifest(name)
+            df = self._load(name, manifest["latest"]) if stage.memoize and manifest.get("latest") else None
+            if df is not None:
+                self._fingerprints[name] = manifest["entries"][manifest["latest"]]["fingerprint"]
+            else:
+                if stage.reader is not None:
+                    df = stage.reader()
+                elif stage.outputs and artifact_exists(stage.outputs[0]):
+                    df = read_artifact(stage.outputs[0])
+                if df is None:
+                    first = Path(stage.outputs[0]).name if stage.outputs else name
+                    raise FileNotFoundError(f"Missing input: {first}. Run stage '{name}' first.")
+                df = apply_schema(df)
+            self._frames[name] = df
+        return self._frames[name]
+
+    def fingerprint(self, name: str) -> str:
+        if name not in self._fingerprints:
+            self._fingerprints[name] = frame_fingerprint(self.frame(name))
+        return self._fingerprints[name]
+
+    def _resolve_inputs(self, stage: Stage, planned: set) -> list:
+        names = []
+        for entry in stage.inputs:
+            if not isinstance(entry, tuple):
+                names.append(entry)
+                continue
+            planned_alts = [n for n in entry if n in planned or n in self._frames]
+            available = planned_alts or [n for n in entry if self._available(n)]
+            names.append(available[0] if available else entry[0])
+        return names
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def run(self, targets, start=None, only=None, force=False, jobs=JOBS, stream=STREAM) -> Optional[pd.DataFrame]:
+        plan = self.plan(targets, start=start, only=only)
+        planned = set(plan)
+        print(f"Pipeline plan: {' → '.join(plan)}")
+        log(f"Plan: {', '.join(plan)} (force={force}, jobs={jobs}, stream={stream})")
+        started = time.time()
+        units = self._units(plan, planned, stream)
+        if jobs <= 1 or len(units) <= 1:
+            self._run_serial(units, planned, force)
+        else:
+            self._run_concurrent(units, planned, force, jobs)
+        # Artifacts are written in the background; they are all on disk once run() returns
+        flush_artifacts()
+        if plan:
+            print(f"ⓘ Pipeline finished {len(plan)} stage(s) in {time.time() - started:.1f}s (jobs={jobs})")
+        return self._frames[plan[-1]] if plan else None
+
+    def _units(self, plan: list, planned: set, stream: bool) -> list:
+        """Group the plan into units of work: single stages, or chains of
+        single-input row stages that are streamed together."""
+        if not stream:
+            return [[n] for n in plan]
+        group_of, units = {}, []
+        for name in plan:
+            stage = self.stages[name]
+            dep = self._resolve_inputs(stage, planned)[0] if len(stage.inputs) == 1 else None
+            if stage.stream is not None and dep is not None:
+                if dep in group_of:
+                    group_of[dep].append(name)
+                    group_of[name] = group_of[dep]
+                    continue
+                group_of[name] = [name]
+            units.append(group_of.get(name, [name]))
+        return units
+
+    def _waits_on(self, unit: list, planned: set) -> set:
+        deps = {d for n in unit for d in self._resolve_inputs(self.stages[n], planned)}
+        return {d for d in deps if d in planned} - set(unit)
+
+    def _run_unit(self, unit: list, planned: set, force: bool):
+        if len(unit) == 1:
+            self._run_one(self.stages[unit[0]], planned, force)
+        else:
+            self._run_stream(unit, planned, force)
+
+    def _run_serial(self, units: list, planned: set, force: bool):
+        waits_on = [self._waits_on(u, planned) for u in units]
+        pending, done = list(range(len(units))), set()
+        while pending:
+            i = next(i for i in pending if waits_on[i] <= done)
+            pending.remove(i)
+            self._run_unit(units[i], planned, force)
+            done.update(units[i])
+
+    def _run_concurrent(self, units: list, planned: set, force: bool, jobs: int):
+        """Start each unit as soon as its planned inputs are done."""
+        waits_on = [self._waits_on(u, planned) for u in units]
+        pending, done, running = list(range(len(units))), set(), {}
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="stage") as pool:
+            while pending or running:
+                for i in [i for i in pending if waits_on[i] <= done]:
+                    pending.remove(i)
+                    running[pool.submit(self._run_unit, units[i], planned, force)] = i
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    i = running.pop(fut)
+                    fut.result()   # re-raise; the pool waits for stages already running
+                    done.update(units[i])
+
+    def _cache_lookup(self, stage: Stage, deps: list, force: bool):
+        """Cache key for a memoized stage, and its cached output (None on a miss)."""
+        key = self._key(stage, [self.fingerprint(d) for d in deps])
+        outputs_present = all(artifact_exists(p) for p in stage.outputs)
+        cached = None if force or not outputs_present else self._load(stage.name, key)
+        if cached is not None:
+            entry = self._manifest(stage.name)["entries"][key]
+            self._frames[stage.name] = cached
+            self._fingerprints[stage.name] = entry["fingerprint"]
+            print(f"⏭ Stage {stage.name}: inputs and code unchanged (key {key}) - loaded cached output")
+            log(f"{stage.name}: cache hit {key}")
+        return key, cached
+
+    def _finish(self, stage: Stage, key: Optional[str], out: pd.DataFrame) -> pd.DataFrame:
+        self._frames[stage.name] = out
+        self._fingerprints[stage.name] = frame_fingerprint(out)
+        if stage.memoize:
+            self._save(stage.name, key, out, self._fingerprints[stage.name])
+            log(f"{stage.name}: ran and cached {key}")
+        return out
+
+    def _run_one(self, stage: Stage, planned: set, force: bool) -> pd.DataFrame:
+        deps = self._resolve_inputs(stage, planned)
+        key = None
+        if stage.memoize:
+            key, cached = self._cache_lookup(stage, deps, force)
+            if cached is not None:
+                return cached
+
+        frames = [self.frame(d).copy(deep=False) for d in deps]
+        if frames:
+            out = run_stage(stage.name, stage.fn, frames[0], *frames[1:])
+        else:
+            out = apply_schema(stage.fn())
+        return self._finish(stage, key, out)
+
+    def _run_stream(self, unit: list, planned: set, force: bool):
+        """Run a chain of row stages with each row flowing on as soon as it is ready."""
+        dep = {n: self._resolve_inputs(self.stages[n], planned)[0] for n in unit}
+        todo = list(unit)
+        # Stages fed by an available frame may still be cache hits
+        changed = True
+        while changed:
+            changed = False
+            for name in list(todo):
+                stage = self.stages[name]
+                if dep[name] not in todo and stage.memoize and self._cache_lookup(stage, [dep[name]], force)[1] is not None:
+                    todo.remove(name)
+                    changed = True
+        if not todo:
+            return
+
+        heads = [n for n in todo if dep[n] not in todo]
+        sources = {dep[n]: self.frame(dep[n]).copy(deep=False) for n in heads}
+        total = max(len(df) for df in sources.values())
+        print(f"⇢ Streaming {' + '.join(todo)} row by row ({total} rows)")
+        nodes, finishes = [], {}
+        for name in todo:
+            row_fn, finishes[name] = self.stages[name].stream(total)
+            stage = self.stages[name]
+            nodes.append(RowNode(name, dep[name], row_fn, stage.workers or STREAM_WORKERS))
+        frames = stream_rows(sources, nodes, key=ROW_KEY)
+
+        for name in todo:
+            stage = self.stages[name]
+            out = run_stage(name, finishes[name], frames[name])
+            key = self._key(stage, [self.fingerprint(dep[name])]) if stage.memoize else None
+            self._finish(stage, key, out)
+
+
+def add_selection_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--from", dest="start", help="start at this stage (upstream outputs are loaded)")
+    parser.add_argument("--to", dest="to", help="stop after this stage")
+    parser.add_argument("--only", help="comma-separated stages to run on their own")
+    parser.add_argument("--force", action="store_true", help="ignore cached stage outputs")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="stages to run concurrently (1 = serial)")
+    parser.add_argument("--stream", action="store_true", default=STREAM,
+                        help="stream rows between chained row stages (e.g. task3 → 3b → 3c)")
+    parser.add_argument("--list", action="store_true", help="list stages and exit")
+    return parser
+
+
+def run_cli(pipeline: Pipeline, default_targets: list, argv=None):
+    """Parse selection flags and run; returns the last stage's frame (None for --list)."""
+    parser = add_selection_args(argparse.ArgumentParser(description="OverBase pipeline runner"))
+    args = parser.parse_args(argv)
+    if args.list:
+        for name in pipeline.order:
+            s = pipeline.stages[name]
+            deps = ", ".join("|".join(e) if isinstance(e, tuple) else e for e in s.inputs) or "-"
+            print(f"{name:18} <- {deps:28} {s.description}")
+        return None
+    only = [n.strip() for n in args.only.split(",") if n.strip()] if args.only else None
+    targets = [args.to] if args.to else default_targets
+    return pipeline.run(targets, start=args.start, only=only, force=args.force, jobs=args.jobs,
+                        stream=args.stream)
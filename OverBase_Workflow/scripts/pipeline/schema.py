@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Pipeline schema - compact dtypes carried through every stage.
+
+  - free-text columns use Arrow-backed strings (NaN semantics, like object columns)
+  - heavily repeated columns are categoricals
+  - scores are small integers
+
+Stages run under pandas copy-on-write, so they take shallow copies of their
+input instead of full df.copy() calls. Set OVERBASE_TYPED_SCHEMA=0 to keep the
+legacy object-dtype frames (e.g. to compare the per-stage memory report).
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Project paths
+script_dir = Path(__file__).parent
+scripts_dir = script_dir.parent
+PROJECT_ROOT = scripts_dir.parent.resolve()
+OUTPUT_DIR = PROJECT_ROOT / "outputs"
+LOGS_DIR = OUTPUT_DIR / "logs"
+for p in [OUTPUT_DIR, LOGS_DIR]:
+    p.mkdir(parents=True, exist_ok=True)
+
+LOG_FILE = LOGS_DIR / "workflow.log"
+MEMORY_REPORT = LOGS_DIR / "memory_report.csv"
+
+TYPED_SCHEMA = os.getenv("OVERBASE_TYPED_SCHEMA", "1") != "0"
+
+CATEGORY_COLUMNS = ["Company", "Title", "Domain Notes", "Confidence", "Quality Tier"]
+SMALL_INT_COLUMNS = {"OSINT Confidence": "Int8"}
+
+
+def log(message: str):
+    with open(LOG_FILE, "a") as f:
+        f.write(f"[pipeline] {message}\n")
+
+
+def enable_copy_on_write():
+    """Copy-on-write is the default from pandas 3; opt in on pandas 2.x."""
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+enable_copy_on_write()
+
+
+def _string_dtype():
+    """Arrow-backed string dtype with NaN missing values, or None if unavailable."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)  # pandas >= 2.3
+    except TypeError:
+        try:
+            return pd.StringDtype("pyarrow_numpy")  # pandas 2.1 / 2.2
+        except (TypeError, ValueError):
+            return None
+
+
+STRING_DTYPE = _string_dtype()
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df with the pipeline dtypes; columns already typed are left alone."""
+    if not TYPED_SCHEMA or df is None:
+        return df
+    out = df.copy(deep=False)
+    for col in out.columns:
+        s = out[col]
+        if col in CATEGORY_COLUMNS:
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                out[col] = s.astype("category")
+        elif col in SMALL_INT_COLUMNS:
+            if s.dtype != SMALL_INT_COLUMNS[col]:
+                out[col] = pd.to_numeric(s, errors="coerce").round().astype(SMALL_INT_COLUMNS[col])
+        elif STRING_DTYPE is not None and s.dtype != STRING_DTYPE and (
+            s.dtype == object or isinstance(s.dtype, pd.StringDtype)
+        ):
+            out[col] = s.astype(STRING_DTYPE)
+    return out
+
+
+# ----------------------------------------------------------------------------
+# Memory reporting
+# ----------------------------------------------------------------------------
+def frame_memory_mb(df) -> float:
+    if df is None:
+        return 0.0
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def _proc_status_mb(field: str):
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Linux only: reset VmHWM so the next reading is this stage's own peak."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 1024
+
+
+class _StageWindow:
+    """Stages running in this process: a stage's own peak RSS is only known if it ran alone.
+
+    The peak is reset when a stage starts with no other stage running. A
+    stage that overlaps another (concurrent runner) leaves the peak alone,
+    since a reset is process-wide and would wipe the other stage's peak;
+    neither stage reports one.
+    """
+
+    def __init__(self):
+        self._alone = {}    # stage token -> no other stage ran during it so far
+        self._lock = threading.Lock()
+
+    def enter(self) -> object:
+        token = object()
+        with self._lock:
+            if self._alone:
+                for other in self._alone:
+                    self._alone[other] = False
+                self._alone[token] = False
+            else:
+                _reset_peak_rss()
+                self._alone[token] = True
+        return token
+
+    def exit(self, token) -> bool:
+        """True if the stage ran alone."""
+        with self._lock:
+            return self._alone.pop(token)
+
+
+_STAGES = _StageWindow()
+
+
+def run_stage(name: str, fn, df: pd.DataFrame, *args, **kwargs) -> pd.DataFrame:
+    """Run one stage on a typed frame and report its frame sizes and peak RSS."""
+    df = apply_schema(df)
+    frame_in = frame_memory_mb(df)
+    token = _STAGES.enter()
+    started = time.time()
+    try:
+        out = apply_schema(fn(df, *args, **kwargs))
+    finally:
+        peak = _peak_rss_mb()
+        alone = _STAGES.exit(token)
+    took = time.time() - started
+    frame_out = frame_memory_mb(out)
+
+    schema = "typed" if TYPED_SCHEMA else "object"
+    peak_text = f"peak RSS {peak:.1f} MB" if alone else "peak RSS n/a (ran alongside other stages)"
+    print(
+        f"ⓘ Memory [{name}]: frame {frame_in:.2f} → {frame_out:.2f} MB, "
+        f"{peak_text} (schema={schema}, {took:.1f}s)"
+    )
+    peak_log = f"{peak:.1f}MB" if alone else "n/a"
+    log(f"{name}: schema={schema} frame_in={frame_in:.2f}MB frame_out={frame_out:.2f}MB peak_rss={peak_log}")
+    new_file = not MEMORY_REPORT.exists()
+    with open(MEMORY_REPORT, "a") as f:
+        if new_file:
+            f.write("Stage,Schema,Frame In MB,Frame Out MB,Peak RSS MB,Seconds\n")
+        # Peak RSS is left empty for a stage that overlapped another
+        f.write(f"{name},{schema},{frame_in:.3f},{frame_out:.3f},{f'{peak:.1f}' if alone else ''},{took:.2f}\n")
+    return out
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Pipeline stages - the OverBase stage graph used by main_workflow.py and the
+main_task*.py entry points.
+
+    load → task1 → task2 → task3 ─┬─→ task3b → task3c ─┬─→ task4 → task5
+                                   ├─→ emails ───────────┘     │
+                                   └─→ youtube ──────────────→ task6 → osint_nonverified
+                                                               ├──→ osint_final    (task4 + task6)
+                                                               └──→ osint_separate (task4 + task6)
+    task3c → web_verified ──→ final_assembly (+ task6)
+
+Email generation only needs the domain from task3, and YouTube scoring only
+needs names, titles, task3's normalized company and the video URL, so both
+run alongside the 3b/3c website crawl.
+task4 and task6 join the branch columns back onto the verified rows by
+'Original Order'.
+
+With --stream, task3 → task3b → task3c and youtube run as one row-level
+stream: each exec's 3b/3c/YouTube work starts as soon as task3 has resolved
+that exec's website.
+"""
+
+import glob
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from initial_cleanup.initial_cleanup import load_cleaned_cached, read_cleaned_data
+from filters.task1_filter_senior_execs import task1_filter_senior_execs
+from filters.task2_remove_duplicates import task2_remove_duplicates
+from filters.task3_validate_companies import WORKERS as TASK3_WORKERS, task3_validate_companies, task3_row_stream
+from filters.task3b_verify_employment import task3b_verify_employment, task3b_row_stream, MANUAL_DIR
+from filters.task3c_verify_employment_webscrape import (
+    WORKERS as TASK3C_WORKERS, task3c_verify_employment_webscrape, task3c_row_stream,
+)
+from filters.task4_generate_emails import (
+    EMAIL_COLUMNS, task4_email_columns, task4_generate_emails, task4_save_emails,
+)
+from filters.task5_quality_check import task5_quality_check
+from filters.task6_youtube_osint import (
+    OSINT_COLUMNS, mark_website_verified, task6_row_stream, task6_save_osint, task6_youtube_scores,
+)
+from pipeline.domain_map import DOMAIN_MAP_FILE
+from pipeline.artifacts import artifact_exists, read_artifact, save_artifact
+from pipeline.runner import Pipeline, Stage, join_columns
+from pipeline.schema import PROJECT_ROOT, OUTPUT_DIR
+
+DATA_DIR = PROJECT_ROOT / "data"
+CACHE_DIR = OUTPUT_DIR / "cache"
+RAW_CSV = DATA_DIR / "cmo_videos_names.csv"
+# Goal-directed 3c/YouTube runs rank and stop using the task5 tier rules
+GOAL_ENV = ("OVERBASE_GOAL_DIRECTED",)
+GOAL_FILES = [Path(task5_quality_check.__code__.co_filename)]
+
+# Raw input override (a path or a glob of several exports) and loader workers;
+# more than one worker, or a glob, selects the parallel byte-range loader
+RAW_INPUT = os.getenv("OVERBASE_RAW_INPUT", str(RAW_CSV))
+LOAD_WORKERS = int(os.getenv("OVERBASE_LOAD_WORKERS", "1"))
+
+
+# ============================================================================
+# STEP 0: INITIAL DATA LOADING
+# ============================================================================
+def step0_load_raw_data():
+    """Step 0: Load and clean raw data using initial_cleanup function"""
+    print("\n" + "=" * 70)
+    print("▶ Step 0: Load and Clean Raw Data")
+    print("=" * 70)
+
+    is_glob = any(ch in RAW_INPUT for ch in "*?[")
+    if not (glob.glob(RAW_INPUT) if is_glob else Path(RAW_INPUT).exists()):
+        raise FileNotFoundError(f"Raw data file '{RAW_INPUT}' not found!")
+
+    print(f"Loading data from: {RAW_INPUT}")
+    # Cleaned frame (incl. 'Original Order') is cached by input + cleanup-code hash
+    df, cache_hit = load_cleaned_cached(RAW_INPUT, CACHE_DIR, workers=LOAD_WORKERS)
+    print(f"✓ Loaded {len(df)} rows")
+
+    # Save initial cleaned data (unchanged on a cache hit, so only rewrite if missing)
+    initial_output = OUTPUT_DIR / "final_cleaned_data.csv"
+    if cache_hit and initial_output.exists():
+        print(f"✓ Initial cleaned data up to date: {initial_output}")
+    else:
+        df.to_csv(str(initial_output), index=False)
+        print(f"✓ Saved initial cleaned data to: {initial_output}")
+
+    return df
+
+
+def _read_cleaned():
+    cleaned_csv = OUTPUT_DIR / "final_cleaned_data.csv"
+    if not cleaned_csv.exists():
+        return None
+    return read_cleaned_data(cleaned_csv, RAW_INPUT, CACHE_DIR)
+
+
+# ============================================================================
+# BRANCH JOINS
+# ============================================================================
+def task4_join(df_verified: pd.DataFrame, df_emails: pd.DataFrame) -> pd.DataFrame:
+    """Task 4 output: 3c's verified rows plus the email columns."""
+    return task4_save_emails(join_columns(df_verified, df_emails, EMAIL_COLUMNS))
+
+
+def task6_join(df: pd.DataFrame, df_scores: pd.DataFrame) -> pd.DataFrame:
+    """Task 6 output: YouTube scores on the given rows, website verification first."""
+    if "Employment Verified" not in df.columns:
+        df = df.assign(**{"Employment Verified": ""})
+    df_out = join_columns(df, df_scores, OSINT_COLUMNS)
+    return task6_save_osint(mark_website_verified(df_out))
+
+
+# ============================================================================
+# POST-PROCESSING STAGES (formerly inline in the main_task*.py scripts)
+# ============================================================================
+def web_verified_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    """Persist a consolidated web-verified snapshot after 3b/3c."""
+    web_csv = save_artifact(df, OUTPUT_DIR / 'senior_execs_web_verified.csv')
+    print(f"✓ Wrote {web_csv} with {len(df)} rows")
+    return df
+
+
+def osint_nonverified(sc: pd.DataFrame) -> pd.DataFrame:
+    """Export the OSINT-scored rows that are not website-verified."""
+    out = sc[sc['Employment Verified'].astype(str).str.lower() != 'yes']
+    save_artifact(out, OUTPUT_DIR / 'final_osint_scored_nonverified.csv', deliverable=True)
+    print("✓ OSINT completed: step6_osint_scored.csv, step6_osint_top15.csv")
+    return out
+
+
+def osint_final(df0: pd.DataFrame, sc: pd.DataFrame) -> pd.DataFrame:
+    """Combine website-verified execs with the best 15 OSINT (>=60), unique companies."""
+    ver = df0[df0['Employment Verified'].astype(str).str.lower()=='yes'].copy()
+    ver['Confidence'] = '100%'
+    if 'Verification Source' not in ver.columns:
+        ver['Verification Source'] = ''
+    if 'Evidence' not in ver.columns:
+        ver['Evidence'] = ''
+
+    cand = sc[(sc['Employment Verified'].astype(str).str.lower()!='yes')
+              & (sc['OSINT Confidence'] >= 60)
+              & (sc['OSINT Verification Source']=='YouTube')].copy()
+    cand = cand.sort_values(['OSINT Confidence','OSINT Video Published'], ascending=[False, False])
+
+    seen=set(); picks=[]
+    for _, r in cand.iterrows():
+        comp = str(r.get('Company','')).strip().lower()
+        if comp in seen:
+            continue
+        seen.add(comp); picks.append(r)
+        if len(picks) >= 15:
+            break
+
+    os15 = pd.DataFrame(picks)
+    if not os15.empty:
+        os15['Verification Source'] = 'YouTube'
+        os15['Evidence'] = os15['OSINT Evidence']
+        os15['Confidence'] = os15['OSINT Confidence'].map(lambda x: f"{int(x)}%")
+
+    final = pd.concat([ver, os15], ignore_index=True, sort=False)
+    out_csv = OUTPUT_DIR / 'final_50_with_osint.csv'
+    save_artifact(final, out_csv, deliverable=True)
+    print(f"✓ Wrote {out_csv} with {len(final)} rows")
+    return final
+
+
+def osint_separate(df_emails: pd.DataFrame, _scored: pd.DataFrame) -> pd.DataFrame:
+    """Separate website-verified and OSINT top-15 outputs (no combine)."""
+    web = df_emails[df_emails['Employment Verified'].astype(str).str.lower()=='yes'].copy()
+    if not web.empty:
+        web['Web Confidence'] = '100%'
+    web_out = OUTPUT_DIR / 'final_web_verified.csv'
+    save_artifact(web, web_out, deliverable=True)
+
+    os_top15_src = OUTPUT_DIR / 'step6_osint_top15.csv'
+    os_top15 = read_artifact(os_top15_src) if artifact_exists(os_top15_src) else pd.DataFrame()
+    os_out = OUTPUT_DIR / 'final_osint_top15.csv'
+    save_artifact(os_top15, os_out, deliverable=True)
+
+    print(f"✓ Wrote {web_out} ({len(web)} rows) and {os_out} ({len(os_top15)} rows)")
+    return web
+
+
+def final_assembly(df_web: pd.DataFrame, _scored: pd.DataFrame) -> pd.DataFrame:
+    """Top 50 from web-verified and OSINT sources, with emails generated."""
+    osint_top15_csv = OUTPUT_DIR / 'step6_osint_top15.csv'
+    if not artifact_exists(osint_top15_csv):
+        raise FileNotFoundError(f"Missing input: {osint_top15_csv.name}. Run stage 'task6' first.")
+    df_osint = read_artifact(osint_top15_csv)
+
+    # Combine, prioritize web-verified, and select top 50 unique execs
+    df_web = df_web.copy(deep=False)
+    df_web['VerificationSource'] = 'Website'
+    df_osint['VerificationSource'] = 'OSINT'
+
+    df_combined = pd.concat([df_web, df_osint], ignore_index=True)
+    df_combined.drop_duplicates(subset=['Name', 'Company'], keep='first', inplace=True)
+    df_top50 = df_combined.head(50).copy()
+
+    print(f"✓ Assembled a top {len(df_top50)} list from web-verified and OSINT sources.")
+
+    # Generate emails for the final list
+    df_final = task4_generate_emails(df_top50)
+
+    # Save the final deliverable with a clear name
+    final_csv = OUTPUT_DIR / 'final_top50_execs_with_emails.csv'
+    save_artifact(df_final, final_csv, deliverable=True)
+
+    print(f"\n✓ Final deliverable created: {final_csv}")
+    print("This file contains the top 50 senior executives with 2 likely email addresses.")
+    return df_final
+
+
+# ============================================================================
+# STAGE GRAPH
+# ============================================================================
+def _out(*names):
+    return [OUTPUT_DIR / n for n in names]
+
+
+STAGES = [
+    Stage("load", step0_load_raw_data, outputs=_out("final_cleaned_data.csv"),
+          memoize=False, reader=_read_cleaned, description="load and clean raw data"),
+    Stage("task1", task1_filter_senior_execs, ["load"],
+          _out("senior_execs_only.csv", "step1_senior.csv"), description="filter senior execs"),
+    Stage("task2", task2_remove_duplicates, ["task1"],
+          _out("senior_execs_no_duplicates.csv", "step2_dedup.csv"), description="remove duplicates"),
+    Stage("task3", task3_validate_companies, ["task2"],
+          _out("senior_execs_validated.csv", "step3_domains.csv"), env=("OVERBASE_DOMAIN_PROBE",),
+          # Curated keys only: learned websites live outside the key (domain_map.py)
+          files=[DOMAIN_MAP_FILE], stream=task3_row_stream,
+          workers=TASK3_WORKERS, description="validate company websites"),
+    Stage("task3b", task3b_verify_employment, ["task3"],
+          _out("step3b_verified.csv"), files=[MANUAL_DIR / "verification_overrides.csv"],
+          stream=task3b_row_stream, description="LinkedIn URLs + manual overrides"),
+    Stage("task3c", task3c_verify_employment_webscrape, ["task3b"],
+          _out("step3c_verified_web.csv"),
+          env=("OVERBASE_SCRAPE_MODE", "OVERBASE_SITEMAP_DISCOVERY", "OVERBASE_PAGE_MAX_KB") + GOAL_ENV, files=GOAL_FILES,
+          stream=task3c_row_stream, workers=TASK3C_WORKERS,
+          description="website employment verification"),
+    Stage("emails", task4_email_columns, ["task3"], description="candidate emails (domain only)"),
+    Stage("task4", task4_join, ["task3c", "emails"],
+          _out("senior_execs_with_emails.csv", "step4_emails.csv"), description="join emails onto 3c"),
+    Stage("task5", task5_quality_check, ["task4"],
+          _out("final_executives_list.csv", "final.csv", "quality_report.txt"),
+          description="quality check + final 50"),
+    Stage("web_verified", web_verified_snapshot, ["task3c"],
+          _out("senior_execs_web_verified.csv"), description="web-verified snapshot"),
+    Stage("youtube", task6_youtube_scores, ["task3"], env=GOAL_ENV, files=GOAL_FILES, stream=task6_row_stream,
+          description="YouTube evidence scoring"),
+    # task6 prefers the richest available dataset when run on its own
+    Stage("task6", task6_join, [("task4", "web_verified", "task3"), "youtube"],
+          _out("step6_osint_scored.csv", "step6_osint_top15.csv"), description="join OSINT scores + top 15"),
+    Stage("osint_nonverified", osint_nonverified, ["task6"],
+          _out("final_osint_scored_nonverified.csv"), description="non-verified OSINT export"),
+    Stage("osint_final", osint_final, ["task4", "task6"],
+          _out("final_50_with_osint.csv"), description="35 web-verified + 15 OSINT"),
+    Stage("osint_separate", osint_separate, ["task4", "task6"],
+          _out("final_web_verified.csv", "final_osint_top15.csv"), description="separate web/OSINT outputs"),
+    Stage("final_assembly", final_assembly, ["web_verified", "task6"],
+          _out("final_top50_execs_with_emails.csv"), description="top 50 with emails"),
+]
+
+
+def build_pipeline() -> Pipeline:
+    return Pipeline(STAGES)
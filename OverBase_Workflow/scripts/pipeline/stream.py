@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Pipeline streaming - row-level execution of a chain of per-row stages.
+
+Each node runs its row function on worker threads, taking rows from a bounded
+queue and handing every result to the queues of the nodes downstream of it.
+A full queue blocks the producer (backpressure), so a slow crawl throttles the
+stages feeding it instead of letting them buffer the whole frame, while each
+row still reaches the next stage as soon as it is ready. Every node collects
+its own output rows; the sink re-sorts them by the row key.
+"""
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import pandas as pd
+
+from pipeline.schema import log
+
+QUEUE_SIZE = int(os.getenv("OVERBASE_STREAM_QUEUE", "8"))
+STREAM_WORKERS = int(os.getenv("OVERBASE_STREAM_WORKERS", "1"))
+
+_DONE = object()
+
+
+@dataclass
+class RowNode:
+    """One streamed stage: row_fn(row) -> row, fed by a source frame or another node."""
+    name: str
+    upstream: str
+    row_fn: Callable
+    workers: int = STREAM_WORKERS
+
+
+def stream_rows(sources: dict, nodes: list, key: str, queue_size: int = QUEUE_SIZE) -> dict:
+    """Stream the rows of each source frame through nodes; returns {node name: frame}."""
+    inbox = {n.name: queue.Queue(maxsize=queue_size) for n in nodes}
+    consumers = {}
+    for n in nodes:
+        consumers.setdefault(n.upstream, []).append(n)
+    collected = {n.name: [] for n in nodes}
+    stats = {n.name: {"busy": 0.0, "first": None, "depth": 0} for n in nodes}
+    remaining = {n.name: n.workers for n in nodes}
+    errors = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    def emit(name, row):
+        for c in consumers.get(name, []):
+            # Each consumer gets its own copy: row functions update rows in place
+            inbox[c.name].put(row.copy())
+            depth = inbox[c.name].qsize()
+            if depth > stats[c.name]["depth"]:
+                stats[c.name]["depth"] = depth
+
+    def close(name):
+        for c in consumers.get(name, []):
+            for _ in range(c.workers):
+                inbox[c.name].put(_DONE)
+
+    def feed(name, df):
+        for _, row in df.iterrows():
+            if errors:
+                break
+            emit(name, row)
+        close(name)
+
+    def work(node):
+        while True:
+            row = inbox[node.name].get()
+            if row is _DONE:
+                break
+            if errors:
+                continue   # keep draining so upstream producers never block
+            t0 = time.perf_counter()
+            try:
+                out = node.row_fn(row)
+            except BaseException as e:   # incl. KeyboardInterrupt: fail the stream, don't hang it
+                errors.append((node.name, e))
+                continue
+            with lock:
+                stats[node.name]["busy"] += time.perf_counter() - t0
+                if stats[node.name]["first"] is None:
+                    stats[node.name]["first"] = time.perf_counter() - started
+            collected[node.name].append(out)
+            emit(node.name, out)
+        with lock:
+            remaining[node.name] -= 1
+            last = remaining[node.name] == 0
+        if last:
+            close(node.name)
+
+    threads = [
+        threading.Thread(target=work, args=(n,), name=f"stream-{n.name}-{i}", daemon=True)
+        for n in nodes for i in range(n.workers)
+    ]
+    threads += [
+        threading.Thread(target=feed, args=(name, df), name=f"stream-feed-{name}", daemon=True)
+        for name, df in sources.items()
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        name, exc = errors[0]
+        raise RuntimeError(f"Streamed stage '{name}' failed: {exc}") from exc
+
+    wall = time.perf_counter() - started
+    frames = {}
+    for n in nodes:
+        df = pd.DataFrame(collected[n.name])
+        # Sink: restore input order regardless of which worker finished first
+        frames[n.name] = df.sort_values(key, kind="stable") if key in df.columns else df.sort_index()
+        st = stats[n.name]
+        first = f"{st['first']:.1f}s" if st["first"] is not None else "-"
+        msg = (f"{n.name}: {len(df)} rows, first row out at {first}, busy {st['busy']:.1f}s "
+               f"of {wall:.1f}s, max queue {st['depth']}/{queue_size}")
+        print(f"ⓘ Stream {msg}")
+        log(f"stream {msg}")
+    return frames
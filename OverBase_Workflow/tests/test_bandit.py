@@ -0,0 +1,88 @@
+from pipeline.bandit import GLOBAL, ArmStats
+
+PATHS = ["/about", "/team", "/leadership"]
+
+
+def _path_arms(path):
+    return [("path", path)]
+
+
+def test_no_history_keeps_the_given_order():
+    assert ArmStats().order(PATHS, _path_arms, "acme.com") == PATHS
+
+
+def test_arms_that_paid_off_come_first():
+    arms = ArmStats({
+        (GLOBAL, "path", "/about"): (50, 1),
+        (GLOBAL, "path", "/team"): (50, 10),
+        (GLOBAL, "path", "/leadership"): (50, 30),
+    })
+    assert arms.order(PATHS, _path_arms, "acme.com") == ["/leadership", "/team", "/about"]
+
+
+def test_domain_record_outweighs_the_overall_one():
+    counts = {
+        (GLOBAL, "path", "/team"): (100, 40),
+        (GLOBAL, "path", "/leadership"): (100, 10),
+        ("acme.com", "path", "/team"): (5, 0),
+        ("acme.com", "path", "/leadership"): (5, 5),
+    }
+    arms = ArmStats(counts)
+    assert arms.order(["/team", "/leadership"], _path_arms, "acme.com") == ["/leadership", "/team"]
+    # Other domains only see the overall rates
+    assert arms.order(["/leadership", "/team"], _path_arms, "other.com") == ["/team", "/leadership"]
+
+
+def test_rarely_tried_arm_gets_an_exploration_bonus():
+    arms = ArmStats({
+        (GLOBAL, "path", "/team"): (1000, 100),
+        (GLOBAL, "path", "/people"): (0, 0),
+    })
+    # Same prior hit rate (1 in 10), but /people was never tried
+    assert arms.score("acme.com", "path", "/people") > arms.score("acme.com", "path", "/team")
+    assert arms.order(["/team", "/people"], _path_arms, "acme.com") == ["/people", "/team"]
+
+
+def test_equal_scores_keep_the_given_order():
+    arms = ArmStats({(GLOBAL, "path", "/other"): (10, 1)})
+    assert arms.order(PATHS, _path_arms, "acme.com") == PATHS
+    assert arms.order(PATHS[::-1], _path_arms, "acme.com") == PATHS[::-1]
+
+
+def test_item_score_averages_its_arms():
+    arms = ArmStats({
+        (GLOBAL, "path", "/x"): (100, 50),
+        (GLOBAL, "anchor", "team"): (100, 0),
+        (GLOBAL, "path", "/y"): (100, 30),
+    })
+    links = [("/x", "team"), ("/y", None)]
+
+    def link_arms(link):
+        url, anchor = link
+        return [("path", url)] + ([("anchor", anchor)] if anchor else [])
+
+    # /x alone would win, but its 'team' anchor never paid off
+    assert arms.order(links, link_arms, "acme.com") == [("/y", None), ("/x", "team")]
+
+
+def test_record_counts_per_domain_and_overall():
+    arms = ArmStats()
+    arms.record("acme.com", "path", "/team")
+    arms.record("acme.com", "path", "/team")
+    arms.record("acme.com", "path", "/team", tries=0, hits=1)
+    arms.record("beta.com", "path", "/team")
+    assert arms.deltas() == {
+        ("acme.com", "path", "/team"): (2, 1),
+        ("beta.com", "path", "/team"): (1, 0),
+        (GLOBAL, "path", "/team"): (3, 1),
+    }
+
+
+def test_recorded_outcomes_do_not_change_the_order_within_a_run():
+    arms = ArmStats({(GLOBAL, "path", "/about"): (10, 1)})
+    before = arms.order(PATHS, _path_arms, "acme.com")
+    for _ in range(20):
+        arms.record("acme.com", "path", "/leadership", hits=1)
+    assert arms.order(PATHS, _path_arms, "acme.com") == before
+    # They order the next run, once saved and loaded back
+    assert ArmStats(arms.deltas()).order(PATHS, _path_arms, "acme.com")[0] == "/leadership"
@@ -0,0 +1,115 @@
+import pytest
+
+from pipeline import net
+from pipeline.net import CircuitBreaker, NetStats
+
+URL = "https://www.acme.example/team"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _no_log(monkeypatch):
+    monkeypatch.setattr(net, "log", lambda message: None)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _breaker(clock, failures=3, cooldown=120):
+    return CircuitBreaker(failures, cooldown, clock=clock)
+
+
+def _fail(breaker, times, url=URL, seconds=5.0):
+    for _ in range(times):
+        assert breaker.allow(url)
+        breaker.record(url, seconds, True)
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = _breaker(clock)
+    _fail(breaker, 2)
+    assert breaker.allow(URL)
+    breaker.record(URL, 5.0, True)
+    assert not breaker.allow(URL)
+    assert breaker.blocked(URL)
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = _breaker(clock)
+    _fail(breaker, 2)
+    breaker.record(URL, 0.2, False)
+    _fail(breaker, 2)
+    assert breaker.allow(URL)
+
+
+def test_circuit_is_per_host_without_www(clock):
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+    assert not breaker.allow("https://acme.example/about")
+    assert breaker.allow("https://other.example/")
+
+
+def test_refusals_are_counted_with_the_average_failed_time(clock):
+    breaker = _breaker(clock)
+    breaker.record(URL, 2.0, True)
+    breaker.record(URL, 4.0, True)
+    breaker.record(URL, 6.0, True)
+    stats = NetStats("test")
+    assert not breaker.allow(URL, stats)
+    assert breaker.blocked(URL, stats)
+    assert stats.skipped == {"breaker": 2}
+    assert stats.reclaimed == pytest.approx(8.0)
+
+
+def test_half_opens_for_a_single_probe_after_the_cooldown(clock):
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+    clock.now += 119
+    assert not breaker.allow(URL)
+    clock.now += 1
+    assert not breaker.blocked(URL)
+    assert breaker.allow(URL)          # the probe
+    assert not breaker.allow(URL)      # everyone else waits another cooldown
+    assert breaker.blocked(URL)
+
+
+def test_successful_probe_closes_the_circuit(clock):
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+    clock.now += 120
+    assert breaker.allow(URL)
+    breaker.record(URL, 0.3, False)
+    assert breaker.allow(URL)
+    assert not breaker.blocked(URL)
+    # Closed again: it takes a full run of failures to reopen
+    _fail(breaker, 2)
+    assert breaker.allow(URL)
+
+
+def test_failed_probe_reopens_for_another_cooldown(clock):
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+    clock.now += 120
+    assert breaker.allow(URL)
+    breaker.record(URL, 5.0, True)
+    clock.now += 119
+    assert not breaker.allow(URL)
+    clock.now += 1
+    assert breaker.allow(URL)
+
+
+def test_zero_failures_turns_the_breaker_off(clock):
+    breaker = _breaker(clock, failures=0)
+    for _ in range(10):
+        breaker.record(URL, 5.0, True)
+    assert breaker.allow(URL)
+    assert not breaker.blocked(URL)
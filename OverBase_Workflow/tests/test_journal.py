@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from pipeline import journal
+from pipeline.journal import RowJournal, row_digest
+
+ROWS = [{"Name": f"Exec {n}", "Company": "Acme"} for n in range(3)]
+
+
+@pytest.fixture(autouse=True)
+def _no_log(monkeypatch):
+    monkeypatch.setattr(journal, "log", lambda message: None)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "stage.py"
+    path.write_text("VERSION = 1\n")
+    return path
+
+
+def _open(tmp_path, source, env=()):
+    return RowJournal("stage", sources=[source], env=env, directory=tmp_path / "journal")
+
+
+def _crash(tmp_path, source, rows, env=()):
+    """Record rows, then fail the way a crashed stage would; returns the journal path."""
+    with pytest.raises(KeyboardInterrupt):
+        with _open(tmp_path, source, env) as j:
+            for row in rows:
+                j.record(row, {"url": row["Name"]})
+            raise KeyboardInterrupt
+    return j.path
+
+
+def test_resumes_with_the_rows_finished_before_a_crash(tmp_path, source):
+    path = _crash(tmp_path, source, ROWS[:2])
+    assert path.exists()
+    j = _open(tmp_path, source)
+    assert j.lookup(ROWS[0]) == {"url": "Exec 0"}
+    assert j.lookup(ROWS[1]) == {"url": "Exec 1"}
+    assert j.lookup(ROWS[2]) is None
+    assert j.replayed == 2
+    j.complete()
+    assert not path.exists()
+
+
+def test_truncated_last_line_is_dropped(tmp_path, source):
+    path = _crash(tmp_path, source, ROWS[:2])
+    torn = json.dumps({"k": row_digest(ROWS[2]), "v": {"url": "Exec 2"}})[:25]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(torn)
+
+    j = _open(tmp_path, source)
+    assert set(j.done) == {row_digest(ROWS[0]), row_digest(ROWS[1])}
+    assert j.lookup(ROWS[2]) is None
+    # New entries start on a clean line after the finished ones
+    j.record(ROWS[2], {"url": "Exec 2"})
+    j.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+    assert all(json.loads(line) for line in lines)
+    assert _open(tmp_path, source).lookup(ROWS[2]) == {"url": "Exec 2"}
+
+
+def test_source_change_discards_the_journal(tmp_path, source):
+    _crash(tmp_path, source, ROWS[:2])
+    source.write_text("VERSION = 2\n")
+    j = _open(tmp_path, source)
+    assert j.done == {}
+    assert j.lookup(ROWS[0]) is None
+    header = json.loads(j.path.read_text(encoding="utf-8").splitlines()[0])
+    assert header["version"] == j.version
+
+
+def test_env_change_discards_the_journal(tmp_path, source, monkeypatch):
+    monkeypatch.setenv("OVERBASE_TEST_MODE", "normal")
+    _crash(tmp_path, source, ROWS[:2], env=("OVERBASE_TEST_MODE",))
+    assert len(_open(tmp_path, source, env=("OVERBASE_TEST_MODE",)).done) == 2
+    monkeypatch.setenv("OVERBASE_TEST_MODE", "accurate")
+    assert _open(tmp_path, source, env=("OVERBASE_TEST_MODE",)).done == {}
+
+
+def test_unreadable_header_discards_the_journal(tmp_path, source):
+    path = _crash(tmp_path, source, ROWS[:1])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    path.write_text('{"stage": "sta\n' + "\n".join(lines[1:]) + "\n", encoding="utf-8")
+    assert _open(tmp_path, source).done == {}
@@ -0,0 +1,58 @@
+from pipeline.domain_map import DOMAIN_MAP_FILE, DomainMap
+from pipeline.matcher import PhraseMatcher, _linear_scan, tokens
+
+
+def test_tokens_are_lowercase_alphanumeric():
+    assert tokens("Tintri by DDN, Inc.") == ["tintri", "by", "ddn", "inc"]
+
+
+def test_phrase_matches_whole_words_only():
+    matcher = PhraseMatcher({"ge": "ge.com"})
+    assert matcher.longest("GE Healthcare") == "ge.com"
+    assert matcher.longest("IGEL") is None
+    assert matcher.longest("Gearset") is None
+    assert matcher.longest("Ge-Healthcare") == "ge.com"
+
+
+def test_multi_word_phrase_needs_every_token_in_order():
+    matcher = PhraseMatcher({"amazon web services": "aws.amazon.com"})
+    assert matcher.longest("Amazon Web Services (AWS)") == "aws.amazon.com"
+    assert matcher.longest("Amazon Services") is None
+    assert matcher.longest("Web Services Amazon") is None
+
+
+def test_longest_phrase_wins():
+    matcher = PhraseMatcher({"amazon": "amazon.com", "amazon web services": "aws.amazon.com"})
+    assert matcher.longest("Amazon Web Services") == "aws.amazon.com"
+    assert matcher.longest("Amazon Retail") == "amazon.com"
+
+
+def test_equal_length_tie_goes_to_the_earliest_phrase_in_the_text():
+    matcher = PhraseMatcher({"beta": "beta.com", "acme": "acme.com"})
+    assert matcher.longest("Acme Beta") == "acme.com"
+    assert matcher.longest("Beta Acme") == "beta.com"
+
+
+def test_duplicate_phrase_keeps_its_first_value():
+    matcher = PhraseMatcher([("acme", "acme.com"), ("ACME", "acme.io")])
+    assert matcher.size == 1
+    assert matcher.longest("Acme") == "acme.com"
+
+
+def _curated(tmp_path) -> DomainMap:
+    return DomainMap(DOMAIN_MAP_FILE, tmp_path / "learned_domains.json")
+
+
+def test_igel_no_longer_maps_to_ge(tmp_path):
+    domains = _curated(tmp_path)
+    # The substring scan this replaced hit 'ge' inside 'igel'
+    assert _linear_scan(domains.curated, "IGEL") == "ge.com"
+    assert domains.find("IGEL") == "igel.com"
+    assert domains.find("General Electric") == "ge.com"
+
+
+def test_tintri_by_ddn_prefers_tintri(tmp_path):
+    domains = _curated(tmp_path)
+    assert _linear_scan(domains.curated, "Tintri by DDN") == "ddn.com"
+    assert domains.find("Tintri by DDN") == "tintri.com"
+    assert domains.find("DDN") == "ddn.com"
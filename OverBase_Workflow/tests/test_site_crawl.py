@@ -0,0 +1,64 @@
+
+from filters import task3c_verify_employment_webscrape as task3c
+from pipeline.people_index import PeopleIndex
+
+BASE = "https://acme.example"
+PAGE = b"<html><body><h1>Leadership</h1><p>Jane Doe, CEO</p></body></html>"
+
+
+def _crawl(monkeypatch, tmp_path, fetch):
+    calls = []
+
+    def fake_fetch(url, *args, **kwargs):
+        calls.append(url)
+        return fetch(url)
+
+    monkeypatch.setattr(task3c, "_fetch", fake_fetch)
+    monkeypatch.setattr(task3c, "_crawl_plan", lambda base, stats=None, deadline=None: [base, base + "/team"])
+    monkeypatch.setattr(task3c, "PARSER", task3c.PageParser(workers=0))
+    monkeypatch.setattr(task3c, "VERBOSE_PROGRESS", False)
+    index = PeopleIndex(tmp_path / "people.sqlite", enabled=True)
+    crawl = task3c.SiteCrawl(BASE, index=index)
+    found = crawl.find({0: ("jane", "doe")}, task3c.time.time() + 30)
+    crawl.save()
+    return found, calls, index
+
+
+def _fail(url):
+    return None, b"", ""
+
+
+def test_failed_crawl_is_not_saved(monkeypatch, tmp_path):
+    found, calls, index = _crawl(monkeypatch, tmp_path, _fail)
+    assert found == {}
+    assert calls == [BASE, BASE + "/team"]
+    assert index.get(BASE) is None
+
+
+def test_failed_crawl_is_not_reused(monkeypatch, tmp_path):
+    _crawl(monkeypatch, tmp_path, _fail)
+    found, calls, _ = _crawl(monkeypatch, tmp_path, lambda url: (200, PAGE, "text/html"))
+    assert found == {0: BASE}
+    assert calls == [BASE]
+
+
+def test_failed_fetch_is_retried_next_run(monkeypatch, tmp_path):
+    def team_down(url):
+        return (None, b"", "") if url.endswith("/team") else (404, b"", "text/html")
+
+    _, _, index = _crawl(monkeypatch, tmp_path, team_down)
+    assert index.get(BASE) is None     # a 404 is an answer, but not a page
+
+    def home_up(url):
+        return (200, b"<p>nobody here</p>", "text/html") if url == BASE else (None, b"", "")
+
+    _, calls, index = _crawl(monkeypatch, tmp_path, home_up)
+    state, _ = index.get(BASE)
+    assert calls == [BASE, BASE + "/team"]
+    assert [url for url, _ in state["pages"]] == [BASE]
+    assert state["scanned"] == 1
+    assert [item[0] for item in state["todo"]] == [BASE + "/team"]
+
+    found, calls, _ = _crawl(monkeypatch, tmp_path, lambda url: (200, PAGE, "text/html"))
+    assert found == {0: BASE + "/team"}
+    assert calls == [BASE + "/team"]